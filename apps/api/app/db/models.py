@@ -11,7 +11,9 @@ from sqlalchemy import (
     Date,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -82,6 +84,12 @@ class ExceptionStatusEnum(str, PyEnum):
     wont_fix = "won't_fix"
 
 
+class MergeCandidateStatusEnum(str, PyEnum):
+    pending = "pending"
+    approved = "approved"
+    rejected = "rejected"
+
+
 class EvidenceKindEnum(str, PyEnum):
     csv = "csv"
     screenshot = "screenshot"
@@ -99,6 +107,9 @@ SyncStatus = Enum(SyncStatusEnum, name="sync_status", native_enum=False)
 IngestStatus = Enum(IngestStatusEnum, name="ingest_status", native_enum=False)
 ExceptionStatus = Enum(ExceptionStatusEnum, name="exception_status", native_enum=False)
 EvidenceKind = Enum(EvidenceKindEnum, name="evidence_kind", native_enum=False)
+MergeCandidateStatus = Enum(
+    MergeCandidateStatusEnum, name="merge_candidate_status", native_enum=False
+)
 
 
 class TimestampMixin:
@@ -135,6 +146,8 @@ class School(Base, TimestampMixin):
     nces_id: Mapped[str | None] = mapped_column(String(32), nullable=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     level: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Other spellings extracts use for this school, e.g. "LHS" for "Lincoln High School".
+    aliases: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
 
     district: Mapped["District"] = relationship(back_populates="schools")
     students: Mapped[list["Student"]] = relationship(back_populates="school", cascade="all, delete")
@@ -144,25 +157,61 @@ class Student(Base, TimestampMixin):
     __tablename__ = "student"
     __table_args__ = (
         UniqueConstraint("district_id", "sis_id", name="uq_student_district_sis"),
+        Index("ix_student_district_school", "district_id", "school_id"),
+        Index("ix_student_district_state", "district_id", "state_id"),
     )
 
     id: Mapped[UUID] = mapped_column(GUID(), primary_key=True, default=uuid4, nullable=False)
     district_id: Mapped[UUID] = mapped_column(GUID(), ForeignKey("district.id", ondelete="CASCADE"), nullable=False)
     school_id: Mapped[UUID] = mapped_column(GUID(), ForeignKey("school.id", ondelete="CASCADE"), nullable=False)
     sis_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    state_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
     first_name: Mapped[str] = mapped_column(String(120), nullable=False)
     last_name: Mapped[str] = mapped_column(String(120), nullable=False)
+    birth_date: Mapped[Date | None] = mapped_column(Date, nullable=True)
     grade_level: Mapped[int] = mapped_column(Integer, nullable=False)
     ell_status: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     idea_flag: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     enrollment_status: Mapped[str] = mapped_column(String(32), default="active", nullable=False)
     enrollment_start: Mapped[Date] = mapped_column(Date, nullable=True)
     enrollment_end: Mapped[Date] = mapped_column(Date, nullable=True)
+    source_row_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     district: Mapped["District"] = relationship()
     school: Mapped["School"] = relationship(back_populates="students")
 
 
+class StudentMergeCandidate(Base, TimestampMixin):
+    """A pair of student records the dedupe engine believes are the same person (US-040).
+
+    ``student_id`` is the lower of the two ids, so each pair is stored once.
+    """
+
+    __tablename__ = "student_merge_candidate"
+    __table_args__ = (
+        UniqueConstraint("student_id", "duplicate_student_id", name="uq_student_merge_candidate"),
+        Index("ix_student_merge_candidate_district_status", "district_id", "status"),
+    )
+
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True, default=uuid4, nullable=False)
+    district_id: Mapped[UUID] = mapped_column(GUID(), ForeignKey("district.id", ondelete="CASCADE"), nullable=False)
+    student_id: Mapped[UUID] = mapped_column(
+        GUID(), ForeignKey("student.id", ondelete="CASCADE"), nullable=False
+    )
+    duplicate_student_id: Mapped[UUID] = mapped_column(
+        GUID(), ForeignKey("student.id", ondelete="CASCADE"), nullable=False
+    )
+    match_rule: Mapped[str] = mapped_column(String(16), nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    status: Mapped[MergeCandidateStatusEnum] = mapped_column(
+        MergeCandidateStatus, nullable=False, default=MergeCandidateStatusEnum.pending
+    )
+    details: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+
+    student: Mapped["Student"] = relationship(foreign_keys=[student_id])
+    duplicate_student: Mapped["Student"] = relationship(foreign_keys=[duplicate_student_id])
+
+
 class RuleVersion(Base, TimestampMixin):
     __tablename__ = "rule_version"
 
@@ -176,6 +225,7 @@ class RuleVersion(Base, TimestampMixin):
         RuleSeverity, nullable=False, default=RuleSeverityEnum.error
     )
     applies_to: Mapped[str] = mapped_column(String(64), nullable=False)
+    category: Mapped[str | None] = mapped_column(String(64), nullable=True)
     dsl: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
     remediation: Mapped[str | None] = mapped_column(Text)
     enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -199,11 +249,21 @@ class RuleRun(Base, TimestampMixin):
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     scope: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Set when a deferred run found an equivalent run queued ahead of it and stopped.
+    coalesced_into_id: Mapped[UUID | None] = mapped_column(
+        GUID(), ForeignKey("rule_run.id", ondelete="SET NULL"), nullable=True
+    )
+    compacted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    archive_uri: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    metrics: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
     rule_version: Mapped["RuleVersion"] = relationship(back_populates="rule_runs")
     results: Mapped[list["RuleResult"]] = relationship(
         back_populates="rule_run", cascade="all, delete-orphan"
     )
+    summaries: Mapped[list["RuleResultSummary"]] = relationship(
+        back_populates="rule_run", cascade="all, delete-orphan"
+    )
 
 
 class RuleResult(Base, TimestampMixin):
@@ -213,6 +273,9 @@ class RuleResult(Base, TimestampMixin):
     rule_run_id: Mapped[UUID] = mapped_column(
         GUID(), ForeignKey("rule_run.id", ondelete="CASCADE"), nullable=False
     )
+    rule_version_id: Mapped[UUID | None] = mapped_column(
+        GUID(), ForeignKey("rule_version.id", ondelete="SET NULL"), nullable=True
+    )
     district_id: Mapped[UUID] = mapped_column(
         GUID(), ForeignKey("district.id", ondelete="CASCADE"), nullable=False
     )
@@ -234,6 +297,29 @@ class RuleResult(Base, TimestampMixin):
     school: Mapped["School"] = relationship()
 
 
+class RuleResultSummary(Base, TimestampMixin):
+    __tablename__ = "rule_result_summary"
+
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True, default=uuid4, nullable=False)
+    rule_run_id: Mapped[UUID] = mapped_column(
+        GUID(), ForeignKey("rule_run.id", ondelete="CASCADE"), nullable=False
+    )
+    district_id: Mapped[UUID] = mapped_column(
+        GUID(), ForeignKey("district.id", ondelete="CASCADE"), nullable=False
+    )
+    rule_version_id: Mapped[UUID | None] = mapped_column(
+        GUID(), ForeignKey("rule_version.id", ondelete="SET NULL"), nullable=True
+    )
+    rule_code: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    school_id: Mapped[UUID | None] = mapped_column(
+        GUID(), ForeignKey("school.id", ondelete="SET NULL"), nullable=True
+    )
+    severity: Mapped[RuleSeverityEnum] = mapped_column(RuleSeverity, nullable=False)
+    result_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    rule_run: Mapped["RuleRun"] = relationship(back_populates="summaries")
+
+
 class UserAccount(Base, TimestampMixin):
     __tablename__ = "user_account"
     __table_args__ = (
@@ -310,6 +396,15 @@ class SyncJob(Base, TimestampMixin):
 
 class IngestBatch(Base, TimestampMixin):
     __tablename__ = "ingest_batch"
+    __table_args__ = (
+        Index(
+            "ix_ingest_batch_source_latest",
+            "district_id",
+            "table_name",
+            "source_system_id",
+            "created_at",
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(GUID(), primary_key=True, default=uuid4, nullable=False)
     district_id: Mapped[UUID] = mapped_column(GUID(), ForeignKey("district.id", ondelete="CASCADE"), nullable=False)
@@ -1,6 +1,12 @@
-from collections.abc import Generator
+import heapq
+import time
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from packages.shared.shared.config import get_settings
@@ -18,3 +24,72 @@ def get_session() -> Generator:
         yield session
     finally:
         session.close()
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while collecting, with the slowest few kept for reporting."""
+
+    keep_slowest: int = 3
+    statements: int = 0
+    seconds: float = 0.0
+    _slowest: list[tuple[float, int, str]] = field(default_factory=list, repr=False)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        entry = (seconds, self.statements, statement)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> list[tuple[float, str]]:
+        """Return up to ``keep_slowest`` (seconds, statement) pairs, slowest first."""
+
+        return [(seconds, statement) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_queries(keep_slowest: int = 3) -> Iterator[QueryStats]:
+    """Record statements run in this context on any engine.
+
+    Nested collectors share the outermost ``QueryStats``, so independent middlewares
+    can observe the same request.
+    """
+
+    install_query_hooks()
+    current = _query_stats.get()
+    if current is not None:
+        current.keep_slowest = max(current.keep_slowest, keep_slowest)
+        yield current
+        return
+    stats = QueryStats(keep_slowest=keep_slowest)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def install_query_hooks() -> None:
+    """Attach the statement timing hooks to every engine, once per process."""
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _query_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _query_stats.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routers import admin, auth, connectors, districts, evidence, exceptions, exports, health, imports, readiness, rule_results, rule_runs, rule_versions, schools, students
+from packages.shared.shared.config import get_settings
+
+from .metrics import MetricsMiddleware, TimedJSONResponse
+from .profiling import QueryProfilerMiddleware
+from .routers import admin, auth, connectors, districts, evidence, exceptions, exports, health, imports, metrics, readiness, rule_results, rule_runs, rule_versions, schools, students
 
 
 def create_app() -> FastAPI:
@@ -10,6 +14,7 @@ def create_app() -> FastAPI:
         title="CRDC PreCheck API",
         version="0.1.0",
         description="Tenant-aware API for CRDC data ingestion and validation.",
+        default_response_class=TimedJSONResponse,
     )
     app.add_middleware(
         CORSMiddleware,
@@ -18,6 +23,16 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    settings = get_settings()
+    if settings.sql_profiler_enabled:
+        app.add_middleware(
+            QueryProfilerMiddleware,
+            query_threshold=settings.sql_profiler_query_threshold,
+            slow_statements=settings.sql_profiler_slow_statements,
+        )
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
     app.include_router(health.router)
     app.include_router(connectors.router)
     app.include_router(districts.router)
@@ -0,0 +1,117 @@
+"""Prometheus instrumentation for the API.
+
+``MetricsMiddleware`` times every request and labels it with the matched route
+template, keeping label cardinality bounded. Query counts come from the statement
+hooks in ``db.session``, and ``TimedJSONResponse`` reports the time spent rendering
+response bodies. Per-request counters live in context variables, which endpoint code
+running in Starlette's threadpool shares with the middleware.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from prometheus_client import Counter, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .db.session import collect_queries
+
+REQUEST_LATENCY = Histogram(
+    "crdc_api_request_duration_seconds",
+    "API request latency by route.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "crdc_api_request_db_queries",
+    "Database queries issued per API request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "crdc_api_request_db_seconds",
+    "Time spent executing database queries per API request.",
+    ["method", "route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+RESPONSE_SERIALIZATION = Histogram(
+    "crdc_api_response_serialization_seconds",
+    "Time spent rendering JSON response bodies.",
+    ["route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+REQUEST_ERRORS = Counter(
+    "crdc_api_unhandled_errors_total",
+    "Requests that raised instead of returning a response.",
+    ["method", "route"],
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestStats:
+    serialization_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, query counts and serialization time per route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        with collect_queries() as queries:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except Exception:
+                REQUEST_ERRORS.labels(method, _route(scope)).inc()
+                raise
+            finally:
+                _request_stats.reset(token)
+                route = _route(scope)
+                REQUEST_LATENCY.labels(method, route, str(status_code)).observe(
+                    time.perf_counter() - started
+                )
+                REQUEST_DB_QUERIES.labels(method, route).observe(queries.statements)
+                REQUEST_DB_SECONDS.labels(method, route).observe(queries.seconds)
+                if stats.serialization_seconds:
+                    RESPONSE_SERIALIZATION.labels(route).observe(stats.serialization_seconds)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response that charges its rendering time to the current request."""
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.serialization_seconds += time.perf_counter() - started
+        return body
+
+
+def _route(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
@@ -0,0 +1,95 @@
+"""Opt-in per-request SQL profiling.
+
+``QueryProfilerMiddleware`` reports the statements a request issued, the time spent
+in the database and the total handler time through a ``Server-Timing`` header, e.g.
+``db;dur=12.4;desc="7 queries", app;dur=31.0``, which browser dev tools display
+next to the request. Every request is logged with the same figures as structured
+fields. A request issuing more than ``query_threshold`` statements is logged as a
+warning together with its slowest statements, which is how N+1 loops surface.
+
+The hooks only read a context variable and a clock per statement, so the profiler is
+meant to stay enabled in staging.
+"""
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .db.session import QueryStats, collect_queries
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text included in threshold warnings.
+STATEMENT_PREVIEW_CHARS = 300
+
+
+class QueryProfilerMiddleware:
+    def __init__(
+        self, app: ASGIApp, *, query_threshold: int = 25, slow_statements: int = 3
+    ) -> None:
+        self.app = app
+        self.query_threshold = query_threshold
+        self.slow_statements = slow_statements
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        with collect_queries(self.slow_statements) as queries:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", _server_timing(queries, started))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._report(scope, status_code, queries, time.perf_counter() - started)
+
+    def _report(self, scope: Scope, status_code: int, queries: QueryStats, elapsed: float) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        fields = {
+            "method": scope["method"],
+            "route": route,
+            "status": status_code,
+            "queries": queries.statements,
+            "db_ms": round(queries.seconds * 1000, 2),
+            "total_ms": round(elapsed * 1000, 2),
+        }
+        logger.info(
+            "sql profile %s %s: %d queries, %.1f ms db, %.1f ms total",
+            fields["method"],
+            route,
+            fields["queries"],
+            fields["db_ms"],
+            fields["total_ms"],
+            extra={"sql_profile": fields},
+        )
+        if queries.statements > self.query_threshold:
+            slowest = [
+                {"ms": round(seconds * 1000, 2), "statement": statement[:STATEMENT_PREVIEW_CHARS]}
+                for seconds, statement in queries.slowest()
+            ]
+            logger.warning(
+                "%s %s issued %d queries (threshold %d); possible N+1",
+                fields["method"],
+                route,
+                queries.statements,
+                self.query_threshold,
+                extra={"sql_profile": {**fields, "slowest": slowest}},
+            )
+
+
+def _server_timing(queries: QueryStats, started: float) -> str:
+    db_ms = queries.seconds * 1000
+    app_ms = (time.perf_counter() - started) * 1000
+    return f'db;dur={db_ms:.1f};desc="{queries.statements} queries", app;dur={app_ms:.1f}'
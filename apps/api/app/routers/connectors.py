@@ -7,6 +7,8 @@ from apps.api.app.db.models import UserRoleEnum
 from apps.api.app.db.session import get_session
 from apps.api.app.schemas import SyncTriggerResponse
 from apps.api.app.services.audit import write_audit_log
+from apps.api.app.services.coalescing import running_sync_job, sync_in_progress
+from apps.worker.worker.queues import on_demand_options
 from apps.worker.worker.tasks import sync_powerschool
 
 router = APIRouter(prefix="/connectors", tags=["connectors"])
@@ -18,10 +20,19 @@ def trigger_powerschool_sync(
     user=Depends(require_roles(UserRoleEnum.admin, UserRoleEnum.data_engineer)),
     session: Session = Depends(get_session),
 ) -> SyncTriggerResponse:
-    """Trigger a background sync for the PowerSchool connector."""
+    """Trigger a background sync for the PowerSchool connector.
+
+    While a sync for the district is running, the trigger is coalesced into it.
+    """
+
+    if sync_in_progress(session, district.id):
+        running = running_sync_job(session, district.id)
+        return SyncTriggerResponse(status="coalesced", sync_job_id=running.id if running else None)
 
     try:
-        async_result = sync_powerschool.delay(str(district.id))
+        async_result = sync_powerschool.apply_async(
+            (str(district.id),), **on_demand_options(sync_powerschool.name)
+        )
         task_id = async_result.id
     except Exception:  # pragma: no cover - fallback when broker unavailable
         sync_powerschool(str(district.id))
@@ -10,6 +10,13 @@ from apps.api.app.db.models import IngestBatch, IngestStatusEnum
 from apps.api.app.db.session import get_session
 from apps.api.app.dependencies import get_district
 from apps.api.app.schemas import CsvImportResult, StudentCsvMapping
+from apps.api.app.services.change_detection import (
+    load_row_hashes,
+    row_hash,
+    source_hash,
+    source_unchanged,
+)
+from apps.api.app.services.schools import SchoolResolver
 from apps.api.app.services.students import upsert_student
 
 router = APIRouter(prefix="/import", tags=["import"])
@@ -27,7 +34,8 @@ async def import_students_csv(
     except json.JSONDecodeError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid mapping JSON") from exc
 
-    content = (await file.read()).decode("utf-8-sig")
+    raw = await file.read()
+    content = raw.decode("utf-8-sig")
     reader = csv.DictReader(io.StringIO(content))
     if not reader.fieldnames:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV file has no header row")
@@ -43,21 +51,57 @@ async def import_students_csv(
             detail=f"CSV missing required column(s): {', '.join(missing_columns)}",
         )
 
+    # The mapping is part of the source: the same file mapped differently is a change.
+    digest = source_hash(raw + mapping_model.model_dump_json().encode("utf-8"))
+    skipped = source_unchanged(session, district_id=district.id, table_name="student", digest=digest)
     batch = IngestBatch(
         district_id=district.id,
         table_name="student",
-        status=IngestStatusEnum.pending,
+        status=IngestStatusEnum.success if skipped else IngestStatusEnum.pending,
+        source_hash=digest,
     )
     session.add(batch)
     session.commit()
+    if skipped:
+        return CsvImportResult(
+            rows_processed=0,
+            students_created=0,
+            students_updated=0,
+            errors=[],
+            ingest_batch_id=str(batch.id),
+            skipped=True,
+        )
+
+    rows = list(reader)
+    known_hashes = load_row_hashes(
+        session, district.id, ((row.get(mapping_model.sis_id) or "").strip() for row in rows)
+    )
+
+    # Create the file's new schools up front and commit them, so a row rolled back below
+    # cannot take a school the resolver has already handed out with it.
+    schools = SchoolResolver(session, district.id)
+    schools.prefetch(row.get(mapping_model.school_name) or "" for row in rows)
+    session.commit()
 
-    processed = created = updated = 0
+    processed = created = updated = unchanged = 0
     errors: list[str] = []
 
-    for index, row in enumerate(reader, start=1):
+    for index, row in enumerate(rows, start=1):
         try:
             payload = _build_student_payload(row, mapping_model)
-            _, student_created = upsert_student(session, district_id=district.id, **payload)
+            payload_hash = row_hash(payload)
+            if known_hashes.get(payload["sis_id"]) == payload_hash:
+                processed += 1
+                unchanged += 1
+                continue
+            _, student_created = upsert_student(
+                session,
+                district_id=district.id,
+                source_row_hash=payload_hash,
+                schools=schools,
+                **payload,
+            )
+            known_hashes[payload["sis_id"]] = payload_hash
             processed += 1
             if student_created:
                 created += 1
@@ -70,7 +114,7 @@ async def import_students_csv(
         else:
             session.commit()
 
-    batch.rows_ingested = processed
+    batch.rows_ingested = created + updated
     batch.status = IngestStatusEnum.success if not errors else IngestStatusEnum.failed
     session.commit()
 
@@ -78,6 +122,7 @@ async def import_students_csv(
         rows_processed=processed,
         students_created=created,
         students_updated=updated,
+        students_unchanged=unchanged,
         errors=errors,
         ingest_batch_id=str(batch.id),
     )
@@ -3,7 +3,7 @@ from typing import Dict
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from apps.api.app.dependencies import get_district
@@ -16,47 +16,42 @@ router = APIRouter(prefix="/readiness", tags=["readiness"])
 
 @router.get("", response_model=ReadinessResponse)
 def get_readiness(district=Depends(get_district), session: Session = Depends(get_session)) -> ReadinessResponse:
-    readiness_rows = (
-        session.execute(
-            select(ReadinessScore).where(ReadinessScore.district_id == district.id)
-        )
-        .scalars()
-        .all()
-    )
+    readiness_rows = session.execute(
+        select(ReadinessScore, School.name)
+        .outerjoin(School, ReadinessScore.school_id == School.id)
+        .where(ReadinessScore.district_id == district.id)
+    ).all()
 
     if readiness_rows:
         items = [
             ReadinessDetail(
                 school_id=score.school_id,
-                school_name=session.get(School, score.school_id).name if score.school_id else "District",
+                school_name=school_name if score.school_id else "District",
                 category=score.category,
                 score=score.score,
                 open_errors=0,
                 open_warnings=0,
             )
-            for score in readiness_rows
+            for score, school_name in readiness_rows
         ]
         return ReadinessResponse(items=items)
 
-    results = (
-        session.execute(
-            select(RuleResult, School.name)
-            .outerjoin(School, RuleResult.school_id == School.id)
-            .where(RuleResult.district_id == district.id, RuleResult.status == "open")
-        )
-        .all()
-    )
+    counts_by_school = session.execute(
+        select(RuleResult.school_id, School.name, RuleResult.severity, func.count(RuleResult.id))
+        .outerjoin(School, RuleResult.school_id == School.id)
+        .where(RuleResult.district_id == district.id, RuleResult.status == "open")
+        .group_by(RuleResult.school_id, School.name, RuleResult.severity)
+    ).all()
 
     totals: Dict[UUID | None, dict[str, int]] = defaultdict(lambda: {"errors": 0, "warnings": 0})
     school_names: Dict[UUID | None, str | None] = {}
 
-    for rule_result, school_name in results:
-        school_id = rule_result.school_id
+    for school_id, school_name, severity, count in counts_by_school:
         school_names[school_id] = school_name
-        if rule_result.severity.value == "error":
-            totals[school_id]["errors"] += 1
-        elif rule_result.severity.value == "warning":
-            totals[school_id]["warnings"] += 1
+        if severity.value == "error":
+            totals[school_id]["errors"] += count
+        elif severity.value == "warning":
+            totals[school_id]["warnings"] += count
 
     items: list[ReadinessDetail] = []
     for school_id, counts in totals.items():
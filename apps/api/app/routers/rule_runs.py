@@ -7,7 +7,9 @@ from sqlalchemy.orm import Session
 from apps.api.app.dependencies import get_district
 from apps.api.app.db.models import District, RuleRun, RuleRunStatusEnum, RuleVersion
 from apps.api.app.db.session import get_session
-from apps.api.app.schemas import RuleRunCreate, RuleRunRead
+from apps.api.app.schemas import RuleRunCreate, RuleRunMetricsRead, RuleRunRead
+from apps.api.app.services.coalescing import duplicate_rule_run
+from apps.worker.worker.queues import interactive_options, on_demand_options
 from apps.worker.worker.tasks import process_rule_run
 
 router = APIRouter(prefix="/rules/runs", tags=["rules"])
@@ -41,19 +43,54 @@ def create_rule_run(
     else:
         rule_version = None
 
+    scope = payload.scope.model_dump(mode="json", exclude_none=True) if payload.scope else None
+    duplicate = duplicate_rule_run(
+        session, district.id, rule_version.id if rule_version else None, scope
+    )
+    if duplicate is not None:
+        return duplicate
+
     rule_run = RuleRun(
         district_id=district.id,
         rule_version_id=rule_version.id if rule_version else None,
         initiated_by=payload.initiated_by,
         status=RuleRunStatusEnum.pending,
-        scope=payload.scope,
+        scope=scope,
     )
     session.add(rule_run)
     session.commit()
     session.refresh(rule_run)
 
+    # Scoped runs are small and someone is waiting on them; district-wide runs stay on
+    # the rules queue, ahead of scheduled work.
+    options = (
+        interactive_options() if scope else on_demand_options(process_rule_run.name)
+    )
     try:
-        process_rule_run.delay(str(rule_run.id))
+        process_rule_run.apply_async((str(rule_run.id),), **options)
     except Exception:  # pragma: no cover - fallback for local dev without broker
         process_rule_run(str(rule_run.id))
     return rule_run
+
+
+@router.get("/{rule_run_id}/metrics", response_model=RuleRunMetricsRead)
+def get_rule_run_metrics(
+    rule_run_id: UUID,
+    district: District = Depends(get_district),
+    session: Session = Depends(get_session),
+) -> RuleRunMetricsRead:
+    rule_run = session.get(RuleRun, rule_run_id)
+    if rule_run is None or rule_run.district_id != district.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rule run not found")
+
+    duration = None
+    if rule_run.started_at and rule_run.finished_at:
+        duration = (rule_run.finished_at - rule_run.started_at).total_seconds()
+    return RuleRunMetricsRead(
+        rule_run_id=rule_run.id,
+        status=rule_run.status.value,
+        started_at=rule_run.started_at,
+        finished_at=rule_run.finished_at,
+        duration_seconds=duration,
+        metrics=rule_run.metrics,
+    )
@@ -1,14 +1,32 @@
-from fastapi import APIRouter, Depends, status
+import time
+from pathlib import Path
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from apps.api.app.dependencies import get_district
 from apps.api.app.db.models import District, RuleSeverityEnum, RuleVersion
 from apps.api.app.db.session import get_session
-from apps.api.app.schemas import RuleVersionCreate, RuleVersionRead
+from apps.api.app.schemas import (
+    RulePreviewRequest,
+    RulePreviewResult,
+    RuleVersionCreate,
+    RuleVersionRead,
+)
+from apps.api.app.services.snapshots import StudentSnapshotCache
+from apps.api.app.services.student_columns import STUDENT_COLUMNS
+from packages.rules.rules.dsl import DslError, compile_dsl, validate_dsl
+from packages.shared.shared.config import get_settings
 
 router = APIRouter(prefix="/rules/versions", tags=["rules"])
 
+settings = get_settings()
+snapshot_cache = StudentSnapshotCache(
+    Path(settings.snapshot_dir), max_entries=settings.snapshot_cache_size
+)
+
 
 @router.get("", response_model=list[RuleVersionRead])
 def list_rule_versions(
@@ -28,12 +46,19 @@ def create_rule_version(
     district: District = Depends(get_district),
     session: Session = Depends(get_session),
 ) -> RuleVersion:
+    try:
+        validate_dsl(payload.dsl, fields=STUDENT_COLUMNS)
+    except DslError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid rule DSL: {exc}"
+        ) from exc
     rule_version = RuleVersion(
         district_id=district.id,
         code=payload.code,
         title=payload.title,
         severity=RuleSeverityEnum(payload.severity),
         applies_to=payload.applies_to,
+        category=payload.category,
         dsl=payload.dsl,
         remediation=payload.remediation,
         enabled=payload.enabled,
@@ -42,3 +67,46 @@ def create_rule_version(
     session.commit()
     session.refresh(rule_version)
     return rule_version
+
+
+@router.post("/preview", response_model=RulePreviewResult)
+def preview_rule_version(
+    payload: RulePreviewRequest,
+    district: District = Depends(get_district),
+    session: Session = Depends(get_session),
+) -> RulePreviewResult:
+    """Evaluate a candidate DSL against the cached student snapshot without persisting."""
+
+    started = time.perf_counter()
+    try:
+        validate_dsl(payload.dsl)
+        expr = compile_dsl(payload.dsl)
+    except (DslError, KeyError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid rule DSL: {exc}"
+        ) from exc
+
+    snapshot = snapshot_cache.get(session, district.id)
+    unknown = expr.columns() - snapshot.columns.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s) in rule DSL: {', '.join(sorted(unknown))}",
+        )
+
+    try:
+        validate_dsl(payload.dsl, {name: values.dtype for name, values in snapshot.columns.items()})
+        failing = np.flatnonzero(~expr.mask(snapshot.columns))
+    except (DslError, TypeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid rule DSL: {exc}"
+        ) from exc
+    sample = [snapshot.row(int(index)) for index in failing[: payload.sample_size]]
+
+    return RulePreviewResult(
+        snapshot_key=snapshot.key,
+        rows_evaluated=len(snapshot),
+        violations=int(failing.size),
+        sample=sample,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
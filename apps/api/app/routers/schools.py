@@ -31,6 +31,7 @@ def create_school(
         name=payload.name,
         level=payload.level,
         nces_id=payload.nces_id,
+        aliases=payload.aliases or None,
     )
     session.add(school)
     session.commit()
@@ -2,9 +2,14 @@ from .districts import DistrictCreate, DistrictRead
 from .schools import SchoolCreate, SchoolRead
 from .students import StudentCreate, StudentRead
 from .rules import (
+    RulePreviewRequest,
+    RulePreviewResult,
     RuleResultRead,
     RuleRunCreate,
+    RuleRunMetrics,
+    RuleRunMetricsRead,
     RuleRunRead,
+    RuleRunScope,
     RuleVersionCreate,
     RuleVersionRead,
 )
@@ -30,8 +35,13 @@ __all__ = [
     "StudentRead",
     "RuleVersionCreate",
     "RuleVersionRead",
+    "RulePreviewRequest",
+    "RulePreviewResult",
     "RuleRunCreate",
+    "RuleRunMetrics",
+    "RuleRunMetricsRead",
     "RuleRunRead",
+    "RuleRunScope",
     "RuleResultRead",
     "StudentCsvMapping",
     "CsvImportResult",
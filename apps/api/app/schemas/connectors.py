@@ -1,6 +1,9 @@
+from uuid import UUID
+
 from pydantic import BaseModel
 
 
 class SyncTriggerResponse(BaseModel):
     status: str
     task_id: str | None = None
+    sync_job_id: UUID | None = None
@@ -16,5 +16,9 @@ class CsvImportResult(BaseModel):
     rows_processed: int
     students_created: int
     students_updated: int
+    students_unchanged: int = 0
     errors: list[str]
     ingest_batch_id: str
+    skipped: bool = Field(
+        default=False, description="True when the file matched the last successful import"
+    )
@@ -1,7 +1,9 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from packages.rules.rules.evidence import upgrade_details
 
 from .common import IdentifiedModel
 
@@ -11,6 +13,7 @@ class RuleVersionCreate(BaseModel):
     title: str
     severity: str = "error"
     applies_to: str
+    category: str | None = None
     dsl: dict
     remediation: str | None = None
     enabled: bool = True
@@ -22,15 +25,45 @@ class RuleVersionRead(IdentifiedModel):
     title: str
     severity: str
     applies_to: str
+    category: str | None = None
     dsl: dict
     remediation: str | None
     enabled: bool
 
 
+class RulePreviewRequest(BaseModel):
+    dsl: dict
+    sample_size: int = Field(20, ge=0, le=200)
+
+
+class RulePreviewResult(BaseModel):
+    snapshot_key: str
+    rows_evaluated: int
+    violations: int
+    sample: list[dict]
+    elapsed_ms: float
+
+
+class GradeBand(BaseModel):
+    min: int
+    max: int
+
+
+class RuleRunScope(BaseModel):
+    """Filters narrowing a rule run; unknown keys are kept for callers' bookkeeping."""
+
+    model_config = ConfigDict(extra="allow")
+
+    school_ids: list[UUID] | None = None
+    grade_bands: list[GradeBand] | None = None
+    categories: list[str] | None = None
+    entity_ids: list[UUID] | None = None
+
+
 class RuleRunCreate(BaseModel):
     rule_version_id: UUID | None = None
     initiated_by: str | None = None
-    scope: dict | None = None
+    scope: RuleRunScope | None = None
 
 
 class RuleRunRead(IdentifiedModel):
@@ -41,10 +74,49 @@ class RuleRunRead(IdentifiedModel):
     started_at: datetime | None
     finished_at: datetime | None
     scope: dict | None
+    coalesced_into_id: UUID | None = None
+    compacted_at: datetime | None = None
+
+
+class RuleMetricsRead(BaseModel):
+    code: str
+    rule_version_id: UUID | None = None
+    violations: int
+    write_seconds: float
+
+
+class RuleRunMetrics(BaseModel):
+    rows_scanned: int
+    batches: int
+    violations: int
+    elapsed_seconds: float
+    fetch_seconds: float
+    evaluate_seconds: float
+    write_seconds: float
+    peak_rss_mb: float = Field(
+        ...,
+        description=(
+            "Growth of the worker's high-water RSS during the run, plus that of its "
+            "evaluation processes when rules are evaluated in parallel; 0 when the run "
+            "stayed below an earlier peak."
+        ),
+    )
+    rules: list[RuleMetricsRead]
+    plan: list[dict] = Field(default_factory=list, description="Slowest shared plan nodes.")
+
+
+class RuleRunMetricsRead(BaseModel):
+    rule_run_id: UUID
+    status: str
+    started_at: datetime | None
+    finished_at: datetime | None
+    duration_seconds: float | None
+    metrics: RuleRunMetrics | None
 
 
 class RuleResultRead(IdentifiedModel):
     rule_run_id: UUID
+    rule_version_id: UUID | None = None
     district_id: UUID
     school_id: UUID | None
     entity_type: str
@@ -53,3 +125,8 @@ class RuleResultRead(IdentifiedModel):
     status: str
     message: str
     details: dict | None
+
+    @field_validator("details", mode="before")
+    @classmethod
+    def _upgrade_details(cls, value: dict | None) -> dict | None:
+        return upgrade_details(value)
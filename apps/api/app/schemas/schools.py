@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .common import IdentifiedModel
 
@@ -9,6 +9,7 @@ class SchoolCreate(BaseModel):
     name: str
     level: str | None = None
     nces_id: str | None = None
+    aliases: list[str] = Field(default_factory=list)
 
 
 class SchoolRead(IdentifiedModel):
@@ -16,3 +17,4 @@ class SchoolRead(IdentifiedModel):
     name: str
     level: str | None
     nces_id: str | None
+    aliases: list[str] | None = None
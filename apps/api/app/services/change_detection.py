@@ -0,0 +1,91 @@
+"""Change detection for student ingestion (US-023).
+
+An incoming file is hashed as a whole. When it matches the latest successful batch
+from the same source, the import is skipped. Otherwise each row's normalized payload
+is hashed and compared with ``Student.source_row_hash``, and only new or changed rows
+are written.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db.models import IngestBatch, IngestStatusEnum, Student
+
+# sis_ids per IN (...) lookup; stays well below bind parameter limits.
+HASH_LOOKUP_CHUNK = 500
+
+
+def source_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: Path, chunk_bytes: int = 1024 * 1024) -> str:
+    """``source_hash`` of a file, read in chunks so large extracts stay out of memory."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as stream:
+        while chunk := stream.read(chunk_bytes):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def row_hash(payload: Mapping[str, Any]) -> str:
+    """Hash a normalized student payload independently of key order."""
+
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def source_unchanged(
+    session: Session,
+    *,
+    district_id: UUID,
+    table_name: str,
+    digest: str,
+    source_system_id: UUID | None = None,
+) -> bool:
+    """Return True if the latest successful batch from this source had ``digest``.
+
+    Only the latest batch counts: re-sending an older file after a different one was
+    applied is a real change.
+    """
+
+    latest = session.execute(
+        select(IngestBatch.source_hash)
+        .where(
+            IngestBatch.district_id == district_id,
+            IngestBatch.table_name == table_name,
+            IngestBatch.source_system_id.is_(None)
+            if source_system_id is None
+            else IngestBatch.source_system_id == source_system_id,
+            IngestBatch.status == IngestStatusEnum.success,
+        )
+        .order_by(IngestBatch.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+    return latest == digest
+
+
+def load_row_hashes(
+    session: Session, district_id: UUID, sis_ids: Iterable[str]
+) -> dict[str, str | None]:
+    """Map each known sis_id to its stored row hash; unknown students are absent."""
+
+    unique = list(dict.fromkeys(sis_ids))
+    hashes: dict[str, str | None] = {}
+    for start in range(0, len(unique), HASH_LOOKUP_CHUNK):
+        chunk = unique[start : start + HASH_LOOKUP_CHUNK]
+        rows = session.execute(
+            select(Student.sis_id, Student.source_row_hash).where(
+                Student.district_id == district_id, Student.sis_id.in_(chunk)
+            )
+        )
+        hashes.update((sis_id, digest) for sis_id, digest in rows)
+    return hashes
@@ -0,0 +1,118 @@
+"""Find the in-flight job a duplicate sync or rule-run trigger should attach to (US-014)."""
+
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db.models import (
+    Connector,
+    RuleRun,
+    RuleRunStatusEnum,
+    SyncJob,
+    SyncStatusEnum,
+)
+from apps.api.app.services.locks import district_lock_held
+from packages.shared.shared.config import get_settings
+
+
+def running_sync_job(session: Session, district_id: UUID) -> SyncJob | None:
+    """The district's most recently started sync that has not finished.
+
+    Scheduled jobs waiting in the queue are not counted; they coalesce when they start.
+    """
+
+    return session.execute(
+        select(SyncJob)
+        .join(Connector, SyncJob.connector_id == Connector.id)
+        .where(Connector.district_id == district_id, SyncJob.status == SyncStatusEnum.running)
+        .order_by(SyncJob.started_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def sync_in_progress(session: Session, district_id: UUID) -> bool:
+    return district_lock_held(session.get_bind(), "sync", district_id)
+
+
+def duplicate_rule_run(
+    session: Session,
+    district_id: UUID,
+    rule_version_id: UUID | None,
+    scope: dict[str, Any] | None,
+) -> RuleRun | None:
+    """An unfinished run with the same rule version and scope, if one is still live.
+
+    A running run counts while the district's rule lease is held; a pending one
+    counts for one lease TTL after it was queued, so a lost task cannot absorb
+    triggers forever.
+    """
+
+    candidates = list(
+        session.execute(
+            select(RuleRun)
+            .where(
+                RuleRun.district_id == district_id,
+                _same_version(rule_version_id),
+                RuleRun.status.in_([RuleRunStatusEnum.pending, RuleRunStatusEnum.running]),
+            )
+            .order_by(RuleRun.created_at.desc())
+        ).scalars()
+    )
+    candidates = [run for run in candidates if (run.scope or None) == (scope or None)]
+    if not candidates:
+        return None
+
+    queued_after = datetime.utcnow() - timedelta(
+        seconds=get_settings().district_lock_ttl_seconds
+    )
+    for run in candidates:
+        if run.status == RuleRunStatusEnum.pending and _naive(run.created_at) >= queued_after:
+            return run
+    if district_lock_held(session.get_bind(), "rules", district_id):
+        return next(
+            (run for run in candidates if run.status == RuleRunStatusEnum.running), None
+        )
+    return None
+
+
+def rule_run_queued_ahead(session: Session, rule_run: RuleRun) -> RuleRun | None:
+    """An equivalent pending run queued before ``rule_run`` that is still live.
+
+    A deferred run refreshes ``updated_at`` each time it is re-queued, so a pending
+    run counts for one lease TTL after it was queued or last deferred. Of several
+    equivalent deferred runs, only the first queued finds none ahead of it.
+    """
+
+    live_after = datetime.utcnow() - timedelta(seconds=get_settings().district_lock_ttl_seconds)
+    candidates = session.execute(
+        select(RuleRun)
+        .where(
+            RuleRun.district_id == rule_run.district_id,
+            _same_version(rule_run.rule_version_id),
+            RuleRun.status == RuleRunStatusEnum.pending,
+            RuleRun.id != rule_run.id,
+        )
+        .order_by(RuleRun.created_at, RuleRun.id)
+    ).scalars()
+    position = (_naive(rule_run.created_at), str(rule_run.id))
+    for run in candidates:
+        if (
+            (run.scope or None) == (rule_run.scope or None)
+            and (_naive(run.created_at), str(run.id)) < position
+            and _naive(run.updated_at) >= live_after
+        ):
+            return run
+    return None
+
+
+def _same_version(rule_version_id: UUID | None):
+    if rule_version_id is None:
+        return RuleRun.rule_version_id.is_(None)
+    return RuleRun.rule_version_id == rule_version_id
+
+
+def _naive(value: datetime) -> datetime:
+    return value.replace(tzinfo=None) if value.tzinfo else value
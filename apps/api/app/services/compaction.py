@@ -0,0 +1,164 @@
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db.models import (
+    ExceptionRecord,
+    RuleResult,
+    RuleResultSummary,
+    RuleRun,
+    RuleRunStatusEnum,
+    RuleVersion,
+)
+
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def compact_rule_runs(
+    session: Session,
+    *,
+    older_than: datetime,
+    archive_root: Path,
+    district_id: UUID | None = None,
+) -> dict[str, int]:
+    """Summarize and archive results of superseded rule runs finished before ``older_than``.
+
+    The most recent successful full run of each district, and any run finished after
+    it, is never compacted. Results referenced by an exception record stay in
+    ``rule_result``.
+    """
+
+    stats = {"runs": 0, "archived": 0, "retained": 0}
+    for rule_run in _superseded_runs(session, older_than=older_than, district_id=district_id):
+        archived, retained = _compact_run(session, rule_run, archive_root)
+        stats["runs"] += 1
+        stats["archived"] += archived
+        stats["retained"] += retained
+    return stats
+
+
+def _superseded_runs(
+    session: Session, *, older_than: datetime, district_id: UUID | None
+) -> list[RuleRun]:
+    """Runs finished before the latest successful district-wide, all-rules run.
+
+    Scoped and single-rule-version runs never supersede anything: a one-school run
+    finishing last must not retire the full run that still holds the district's other
+    results. Without a full successful run, only failed runs are compacted.
+    """
+
+    # Runs coalesced into another one evaluated nothing and supersede nothing.
+    full_runs = select(RuleRun.district_id, RuleRun.finished_at, RuleRun.scope).where(
+        RuleRun.status == RuleRunStatusEnum.success,
+        RuleRun.rule_version_id.is_(None),
+        RuleRun.coalesced_into_id.is_(None),
+        RuleRun.finished_at.is_not(None),
+    )
+    query = (
+        select(RuleRun)
+        .where(
+            RuleRun.status.in_([RuleRunStatusEnum.success, RuleRunStatusEnum.failed]),
+            RuleRun.compacted_at.is_(None),
+            RuleRun.finished_at < older_than,
+        )
+        .order_by(RuleRun.finished_at)
+    )
+    if district_id is not None:
+        full_runs = full_runs.where(RuleRun.district_id == district_id)
+        query = query.where(RuleRun.district_id == district_id)
+
+    # Scope is JSON, which not every backend can compare in SQL, so filter it here.
+    latest_full: dict[UUID, datetime] = {}
+    for run_district_id, finished_at, scope in session.execute(full_runs):
+        latest = latest_full.get(run_district_id)
+        if not scope and (latest is None or finished_at > latest):
+            latest_full[run_district_id] = finished_at
+
+    return [
+        rule_run
+        for rule_run in session.execute(query).scalars()
+        if (
+            rule_run.finished_at < latest_full[rule_run.district_id]
+            if rule_run.district_id in latest_full
+            else rule_run.status == RuleRunStatusEnum.failed
+        )
+    ]
+
+
+def _compact_run(session: Session, rule_run: RuleRun, archive_root: Path) -> tuple[int, int]:
+    counts = session.execute(
+        select(
+            RuleResult.rule_version_id,
+            RuleVersion.code,
+            RuleResult.school_id,
+            RuleResult.severity,
+            func.count(RuleResult.id),
+        )
+        .outerjoin(RuleVersion, RuleVersion.id == RuleResult.rule_version_id)
+        .where(RuleResult.rule_run_id == rule_run.id)
+        .group_by(
+            RuleResult.rule_version_id, RuleVersion.code, RuleResult.school_id, RuleResult.severity
+        )
+    ).all()
+    for rule_version_id, rule_code, school_id, severity, count in counts:
+        session.add(
+            RuleResultSummary(
+                rule_run_id=rule_run.id,
+                district_id=rule_run.district_id,
+                rule_version_id=rule_version_id,
+                rule_code=rule_code,
+                school_id=school_id,
+                severity=severity,
+                result_count=count,
+            )
+        )
+
+    referenced = select(ExceptionRecord.rule_result_id)
+    archive_path = archive_root / str(rule_run.district_id) / f"{rule_run.id}.jsonl.gz"
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+
+    archived = 0
+    rows = session.execute(
+        select(RuleResult)
+        .where(RuleResult.rule_run_id == rule_run.id, RuleResult.id.not_in(referenced))
+        .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+    ).scalars()
+    with gzip.open(archive_path, "wt", encoding="utf-8") as handle:
+        for result in rows:
+            handle.write(json.dumps(_serialize_result(result)) + "\n")
+            archived += 1
+
+    session.execute(
+        delete(RuleResult)
+        .where(RuleResult.rule_run_id == rule_run.id, RuleResult.id.not_in(referenced))
+        .execution_options(synchronize_session=False)
+    )
+    retained = sum(count for *_, count in counts) - archived
+
+    rule_run.compacted_at = datetime.utcnow()
+    rule_run.archive_uri = str(archive_path)
+    session.commit()
+    return archived, retained
+
+
+def _serialize_result(result: RuleResult) -> dict[str, Any]:
+    return {
+        "id": str(result.id),
+        "rule_run_id": str(result.rule_run_id),
+        "rule_version_id": str(result.rule_version_id) if result.rule_version_id else None,
+        "district_id": str(result.district_id),
+        "school_id": str(result.school_id) if result.school_id else None,
+        "entity_type": result.entity_type,
+        "entity_id": str(result.entity_id) if result.entity_id else None,
+        "severity": result.severity.value,
+        "status": result.status.value,
+        "message": result.message,
+        "details": result.details,
+        "created_at": result.created_at.isoformat(),
+    }
@@ -0,0 +1,406 @@
+"""Student dedupe: blocking, vectorized pair scoring and merge candidates (US-040).
+
+Matches follow the US-040 precedence: the same SIS id once normalized ("00123" and
+"123"), then the same state id, then a fuzzy match on name and date of birth.
+Comparing every pair of students is O(n²), so ``DedupeEngine`` only compares students
+that share a blocking key:
+
+* ``sis``: the normalized SIS id.
+* ``state``: the normalized state id.
+* ``last_year``: Soundex of the last name plus birth year.
+* ``first_dob``: first initial plus full date of birth, which catches changed or
+  misspelled last names.
+* ``names``: Soundex of the last and first names, for students without a date of birth.
+
+Blocks larger than ``max_block_size`` are skipped and counted, so one very common
+name cannot bring the quadratic cost back. Candidate pairs are scored in bulk with
+numpy. Each name is reduced to a 128-bit set of hashed character bigrams, so the name
+similarity of all pairs (Dice coefficient) is a few vectorized bit operations.
+"""
+
+import logging
+import time
+import unicodedata
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db.models import StudentMergeCandidate
+from apps.api.app.services.student_columns import iter_student_column_batches
+
+logger = logging.getLogger(__name__)
+
+DEDUPE_FIELDS = ("id", "sis_id", "state_id", "first_name", "last_name", "birth_date")
+
+# Weights of the fuzzy score; an exact SIS or state id match scores 1.0.
+LAST_NAME_WEIGHT = 0.4
+FIRST_NAME_WEIGHT = 0.3
+BIRTH_DATE_WEIGHT = 0.3
+
+# Candidate pairs scored per step, bounding the temporaries to a few tens of MB.
+SCORE_CHUNK = 1_000_000
+INSERT_CHUNK = 1000
+
+_SOUNDEX = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+
+
+def normalize_name(value: str) -> str:
+    """Upper-case ASCII letters only: accents, spaces, hyphens and apostrophes dropped."""
+
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed.upper() if "A" <= char <= "Z")
+
+
+def normalize_identifier(value: str) -> str:
+    """Upper-case alphanumerics without leading zeros, so "00-123" matches "123"."""
+
+    return "".join(char for char in value.upper() if char.isalnum()).lstrip("0")
+
+
+def soundex(name: str) -> str:
+    letters = normalize_name(name)
+    if not letters:
+        return ""
+    code, previous = letters[0], _SOUNDEX.get(letters[0], "")
+    for char in letters[1:]:
+        digit = _SOUNDEX.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # H and W do not separate letters with the same code; vowels do.
+        if char not in "HW":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def bigram_signature(name: str) -> tuple[int, int]:
+    """Hash the bigrams of ``^NAME$`` into 128 bits, returned as (low, high) halves."""
+
+    padded = f"^{name}$"
+    bits = 0
+    for first, second in zip(padded, padded[1:], strict=False):
+        bits |= 1 << ((ord(first) * 31 + ord(second)) % 128)
+    return bits & (2**64 - 1), bits >> 64
+
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:  # numpy < 2.0
+    _BYTE_BITS = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+    def _popcount(values: np.ndarray) -> np.ndarray:
+        return _BYTE_BITS[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+@dataclass
+class _NameColumn:
+    """Per-record codes into the unique normalized names, with their bigram signatures."""
+
+    codes: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+    bits: np.ndarray
+    soundex: np.ndarray
+    initial: np.ndarray
+
+    @classmethod
+    def build(cls, values: np.ndarray) -> "_NameColumn":
+        unique, codes = np.unique(values, return_inverse=True)
+        normalized = [normalize_name(str(value)) for value in unique]
+        signatures = [bigram_signature(name) for name in normalized]
+        low = np.array([low for low, _ in signatures], dtype=np.uint64)
+        high = np.array([high for _, high in signatures], dtype=np.uint64)
+        return cls(
+            codes=codes,
+            low=low,
+            high=high,
+            bits=(_popcount(low) + _popcount(high)).astype(np.int64),
+            soundex=np.array([soundex(name) for name in normalized], dtype="<U4")[codes],
+            initial=np.array([name[:1] for name in normalized], dtype="<U1")[codes],
+        )
+
+    def dice(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Bigram Dice similarity of the names of each (left, right) record pair."""
+
+        a, b = self.codes[left], self.codes[right]
+        shared = _popcount(self.low[a] & self.low[b]) + _popcount(self.high[a] & self.high[b])
+        total = self.bits[a] + self.bits[b]
+        return np.divide(
+            2.0 * shared, total, out=np.zeros(len(a)), where=total > 0, dtype=np.float64
+        )
+
+
+@dataclass
+class DedupeResult:
+    left: np.ndarray
+    right: np.ndarray
+    scores: np.ndarray
+    rules: np.ndarray
+    stats: dict[str, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.left)
+
+
+class DedupeEngine:
+    """Find likely duplicate students among column arrays shaped like ``DEDUPE_FIELDS``."""
+
+    def __init__(
+        self,
+        columns: Mapping[str, np.ndarray],
+        *,
+        min_score: float = 0.85,
+        max_block_size: int = 500,
+    ) -> None:
+        self.columns = columns
+        self.size = len(columns["sis_id"])
+        self.min_score = min_score
+        self.max_block_size = max_block_size
+
+    def run(self) -> DedupeResult:
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        self._prepare()
+        timings["prepare_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        keys = self.blocking_keys()
+        left, right, block_stats = self.candidate_pairs(keys)
+        timings["blocking_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matches: list[tuple[np.ndarray, ...]] = []
+        for start in range(0, len(left), SCORE_CHUNK):
+            chunk_left = left[start : start + SCORE_CHUNK]
+            chunk_right = right[start : start + SCORE_CHUNK]
+            scores, rules = self.score(chunk_left, chunk_right)
+            keep = scores >= self.min_score
+            matches.append((chunk_left[keep], chunk_right[keep], scores[keep], rules[keep]))
+        timings["scoring_seconds"] = time.perf_counter() - started
+
+        stats = {
+            "records": self.size,
+            **block_stats,
+            "candidate_pairs": len(left),
+            "naive_pairs": self.size * (self.size - 1) // 2,
+            "matches": sum(len(chunk[0]) for chunk in matches),
+            **{name: round(seconds, 3) for name, seconds in timings.items()},
+        }
+        if not matches:
+            empty = np.empty(0, dtype=np.int64)
+            return DedupeResult(empty, empty, np.empty(0), np.empty(0, dtype="<U8"), stats)
+        arrays = (np.concatenate(parts) for parts in zip(*matches, strict=True))
+        return DedupeResult(*arrays, stats=stats)
+
+    def _prepare(self) -> None:
+        columns = self.columns
+        self.first = _NameColumn.build(columns["first_name"])
+        self.last = _NameColumn.build(columns["last_name"])
+        self.sis = _identifier_codes(columns["sis_id"])
+        self.state = _identifier_codes(columns["state_id"])
+        birth_date = np.asarray(columns["birth_date"], dtype="datetime64[D]")
+        self.has_birth_date = ~np.isnat(birth_date)
+        self.birth_date = birth_date
+        self.birth_year = birth_date.astype("datetime64[Y]").astype(np.int64) + 1970
+        self.birth_month = birth_date.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        self.birth_day = (birth_date - birth_date.astype("datetime64[M]")).astype(np.int64) + 1
+
+    def blocking_keys(self) -> dict[str, np.ndarray]:
+        """Integer block codes per key kind; -1 means the record has no such key."""
+
+        dated = self.has_birth_date
+        year = np.where(dated, self.birth_year, 0).astype(str)
+        date_text = np.where(dated, self.birth_date.astype(str), "")
+        has_last = self.last.soundex != ""
+        has_first = self.first.initial != ""
+        return {
+            "sis": self.sis,
+            "state": self.state,
+            "last_year": _codes(
+                np.char.add(self.last.soundex, year), has_last & dated
+            ),
+            "first_dob": _codes(np.char.add(self.first.initial, date_text), has_first & dated),
+            "names": _codes(
+                np.char.add(self.last.soundex, self.first.soundex),
+                has_last & has_first & ~dated,
+            ),
+        }
+
+    def candidate_pairs(
+        self, keys: Mapping[str, np.ndarray]
+    ) -> tuple[np.ndarray, np.ndarray, dict[str, int]]:
+        """Unique (left, right) record pairs, left < right, sharing at least one block."""
+
+        chunks: list[np.ndarray] = []
+        blocks = oversized = 0
+        for codes in keys.values():
+            records = np.flatnonzero(codes >= 0)
+            if len(records) < 2:
+                continue
+            records = records[np.argsort(codes[records], kind="stable")]
+            sorted_codes = codes[records]
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            sizes = np.diff(np.r_[starts, len(records)])
+            blocks += int((sizes >= 2).sum())
+            oversized += int((sizes > self.max_block_size).sum())
+            for size in np.unique(sizes[(sizes >= 2) & (sizes <= self.max_block_size)]):
+                # Every block of this size at once: one row of record indices per block.
+                members = records[starts[sizes == size][:, None] + np.arange(size)]
+                first, second = np.triu_indices(size, k=1)
+                pair_left, pair_right = members[:, first].ravel(), members[:, second].ravel()
+                chunks.append(
+                    np.minimum(pair_left, pair_right).astype(np.int64) * self.size
+                    + np.maximum(pair_left, pair_right)
+                )
+
+        stats = {"blocks": blocks, "oversized_blocks": oversized}
+        if not chunks:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, stats
+        # Sort and drop repeats rather than np.unique, whose hash path is far slower on
+        # tens of millions of int64 keys.
+        pairs = np.concatenate(chunks)
+        pairs.sort()
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+        return pairs // self.size, pairs % self.size, stats
+
+    def score(self, left: np.ndarray, right: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Score each pair and name the strongest rule it matched."""
+
+        sis_match = (self.sis[left] >= 0) & (self.sis[left] == self.sis[right])
+        both_states = (self.state[left] >= 0) & (self.state[right] >= 0)
+        state_match = both_states & (self.state[left] == self.state[right])
+
+        fuzzy = (
+            LAST_NAME_WEIGHT * self.last.dice(left, right)
+            + FIRST_NAME_WEIGHT * self.first.dice(left, right)
+            + BIRTH_DATE_WEIGHT * self._birth_date_similarity(left, right)
+        )
+        # Two different state ids are authoritative: such students are not the same person.
+        fuzzy[both_states & ~state_match] = 0.0
+
+        scores = np.where(sis_match | state_match, 1.0, fuzzy)
+        rules = np.where(sis_match, "sis_id", np.where(state_match, "state_id", "name_dob"))
+        return scores, rules
+
+    def _birth_date_similarity(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        dated = self.has_birth_date[left] & self.has_birth_date[right]
+        same_year = self.birth_year[left] == self.birth_year[right]
+        month_l, month_r = self.birth_month[left], self.birth_month[right]
+        day_l, day_r = self.birth_day[left], self.birth_day[right]
+        exact = self.birth_date[left] == self.birth_date[right]
+        # 03/04 entered as 04/03.
+        transposed = same_year & (month_l == day_r) & (day_l == month_r)
+        same_month = same_year & (month_l == month_r)
+        similarity = np.select(
+            [exact, transposed, same_month], [1.0, 0.8, 0.4], default=0.0
+        )
+        return np.where(dated, similarity, 0.0)
+
+
+def find_duplicate_students(
+    session: Session,
+    district_id: UUID,
+    *,
+    min_score: float,
+    max_block_size: int,
+    batch_size: int = 5000,
+) -> dict[str, Any]:
+    """Run the engine over a district and record new candidate pairs for review.
+
+    Pairs already in ``student_merge_candidate`` keep their row and review status.
+    """
+
+    batches = list(
+        iter_student_column_batches(session, district_id, DEDUPE_FIELDS, batch_size=batch_size)
+    )
+    if not batches:
+        return {"records": 0, "matches": 0, "candidates_created": 0}
+    columns = {name: np.concatenate([batch[name] for batch in batches]) for name in DEDUPE_FIELDS}
+    result = DedupeEngine(columns, min_score=min_score, max_block_size=max_block_size).run()
+
+    existing = set(
+        session.execute(
+            select(
+                StudentMergeCandidate.student_id, StudentMergeCandidate.duplicate_student_id
+            ).where(StudentMergeCandidate.district_id == district_id)
+        ).tuples()
+    )
+    ids = columns["id"]
+    rows: list[dict[str, Any]] = []
+    for left, right, score, rule in zip(
+        result.left.tolist(),
+        result.right.tolist(),
+        result.scores.tolist(),
+        result.rules.tolist(),
+        strict=True,
+    ):
+        student_id, duplicate_id = sorted((UUID(str(ids[left])), UUID(str(ids[right]))), key=str)
+        if (student_id, duplicate_id) in existing:
+            continue
+        rows.append(
+            {
+                "district_id": district_id,
+                "student_id": student_id,
+                "duplicate_student_id": duplicate_id,
+                "match_rule": rule,
+                "score": round(score, 4),
+                "details": _pair_details(columns, left, right),
+            }
+        )
+    for chunk in _chunks(rows, INSERT_CHUNK):
+        session.execute(insert(StudentMergeCandidate), chunk)
+    session.commit()
+
+    logger.info(
+        "Dedupe for district %s compared %d of %d possible pairs and queued %d candidate(s)",
+        district_id,
+        result.stats["candidate_pairs"],
+        result.stats["naive_pairs"],
+        len(rows),
+    )
+    return {**result.stats, "candidates_created": len(rows)}
+
+
+def _identifier_codes(values: np.ndarray) -> np.ndarray:
+    unique, codes = np.unique(values, return_inverse=True)
+    normalized = np.array([normalize_identifier(str(value)) for value in unique])
+    return _codes(normalized[codes], normalized[codes] != "")
+
+
+def _codes(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Dense integer codes of ``values``, -1 where ``valid`` is False."""
+
+    _, codes = np.unique(values, return_inverse=True)
+    return np.where(valid, codes, -1)
+
+
+def _pair_details(columns: Mapping[str, np.ndarray], left: int, right: int) -> dict[str, Any]:
+    def describe(index: int) -> dict[str, Any]:
+        birth_date = columns["birth_date"][index]
+        return {
+            "sis_id": str(columns["sis_id"][index]),
+            "state_id": str(columns["state_id"][index]) or None,
+            "name": f"{columns['first_name'][index]} {columns['last_name'][index]}",
+            "birth_date": None if np.isnat(birth_date) else str(birth_date),
+        }
+
+    return {"student": describe(left), "duplicate": describe(right)}
+
+
+def _chunks(rows: list[dict[str, Any]], size: int) -> Iterable[list[dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
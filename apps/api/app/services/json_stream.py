@@ -0,0 +1,135 @@
+"""Incremental readers for large JSON extracts.
+
+``iter_json_records`` yields the elements of a top-level JSON array, or the lines of
+an NDJSON file, while reading the file in fixed-size chunks. Only the current chunk
+and the element being decoded are held in memory, whatever the extract's size.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, TypeVar
+
+CHUNK_CHARS = 64 * 1024
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789.eE+-"
+
+T = TypeVar("T")
+
+
+def iter_json_records(path: Path, *, chunk_chars: int = CHUNK_CHARS) -> Iterator[Any]:
+    """Yield records from a JSON array or NDJSON file, detected by its first character."""
+
+    with path.open(encoding="utf-8-sig") as stream:
+        head = stream.read(1)
+        while head and head in WHITESPACE:
+            head = stream.read(1)
+        if head == "[":
+            yield from iter_json_array(stream, chunk_chars=chunk_chars, opened=True)
+        elif head:
+            first_line = head + stream.readline()
+            if first_line.strip():
+                yield json.loads(first_line)
+            yield from iter_ndjson(stream)
+
+
+def iter_json_array(
+    stream: IO[str], *, chunk_chars: int = CHUNK_CHARS, opened: bool = False
+) -> Iterator[Any]:
+    """Yield the elements of the JSON array read from ``stream``.
+
+    ``opened`` means the caller already consumed the opening bracket.
+    """
+
+    reader = _ChunkReader(stream, chunk_chars)
+    if not opened:
+        reader.expect("[")
+    decoder = json.JSONDecoder()
+    if reader.peek() == "]":
+        reader.advance()
+        return
+    while True:
+        reader.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(reader.buffer, reader.pos)
+            except json.JSONDecodeError:
+                if not reader.fill():
+                    raise
+                continue
+            # A number cut at the buffer edge ("12" of "12.5") decodes too early.
+            truncated = end == len(reader.buffer) or (
+                isinstance(value, (int, float)) and reader.buffer[end] in NUMBER_CHARS
+            )
+            if truncated and reader.fill():
+                continue
+            break
+        reader.pos = end
+        yield value
+        separator = reader.peek()
+        reader.advance()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+
+
+def iter_ndjson(stream: IO[str]) -> Iterator[Any]:
+    """Yield one decoded value per non-blank line."""
+
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Group ``items`` into lists of ``size``; the last list may be shorter."""
+
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class _ChunkReader:
+    """A sliding text buffer over ``stream`` that drops consumed characters."""
+
+    def __init__(self, stream: IO[str], chunk_chars: int) -> None:
+        self.stream = stream
+        self.chunk_chars = chunk_chars
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; return False at end of input."""
+
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_chars)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character."""
+
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def advance(self) -> None:
+        self.pos += 1
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON input, found {found!r}")
+        self.advance()
@@ -0,0 +1,368 @@
+"""Per-district lease locks that keep syncs and rule runs from overlapping (US-014).
+
+``try_district_lease`` takes a lease on ``(kind, district_id)`` without blocking and
+returns None when another worker holds it. ``try_capacity_slot`` takes one of a fixed
+number of worker-wide slots, which caps how many syncs and rule runs run at once.
+
+Leases live in Redis (``SET NX PX`` with a random token) and are renewed by a
+background thread until released, so a worker that dies only blocks the district
+until the TTL runs out, or in PostgreSQL session advisory locks, which are tied to a
+dedicated connection that the server drops with the worker. Other databases (the
+SQLite test engine) use a process-local lock table instead of advisory locks.
+
+In ``auto`` mode the database lock is authoritative and always taken; the Redis
+lease is taken alongside it while Redis is reachable, which makes ``held`` checks a
+single Redis round trip. A worker that loses Redis keeps taking the same database
+locks as every other worker, so no two workers can hold one lease.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from typing import Protocol
+from uuid import UUID
+
+import redis
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from packages.shared.shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "crdc:lock"
+
+# After a failed connection, Redis is not retried for this many seconds.
+REDIS_RETRY_SECONDS = 30.0
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class LockBackend(Protocol):
+    def acquire(self, key: str, token: str, ttl: float) -> bool: ...
+
+    def extend(self, key: str, token: str, ttl: float) -> bool: ...
+
+    def release(self, key: str, token: str) -> None: ...
+
+    def held(self, key: str) -> bool: ...
+
+
+class RedisLockBackend:
+    """Leases as Redis keys holding the owner's token; only the owner may extend or delete."""
+
+    def __init__(self, client: redis.Redis) -> None:
+        self.client = client
+        self._release = client.register_script(_RELEASE_SCRIPT)
+        self._extend = client.register_script(_EXTEND_SCRIPT)
+
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        return bool(self.client.set(key, token, nx=True, px=int(ttl * 1000)))
+
+    def extend(self, key: str, token: str, ttl: float) -> bool:
+        return bool(self._extend(keys=[key], args=[token, int(ttl * 1000)]))
+
+    def release(self, key: str, token: str) -> None:
+        self._release(keys=[key], args=[token])
+
+    def held(self, key: str) -> bool:
+        return bool(self.client.exists(key))
+
+
+class AdvisoryLockBackend:
+    """PostgreSQL session advisory locks, each held on its own connection.
+
+    The TTL is not needed: the lock lasts until it is released or the connection
+    closes.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self._connections: dict[str, Connection] = {}
+
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        connection = self.engine.connect()
+        acquired = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": advisory_key(key)}
+        ).scalar()
+        if not acquired:
+            connection.close()
+            return False
+        # Keep the lock's connection out of any transaction so commits elsewhere
+        # cannot end it.
+        connection.commit()
+        self._connections[key] = connection
+        return True
+
+    def extend(self, key: str, token: str, ttl: float) -> bool:
+        return key in self._connections
+
+    def release(self, key: str, token: str) -> None:
+        connection = self._connections.pop(key, None)
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": advisory_key(key)}
+            )
+        finally:
+            connection.close()
+
+    def held(self, key: str) -> bool:
+        if key in self._connections:
+            return True
+        with self.engine.connect() as connection:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": advisory_key(key)}
+            ).scalar()
+            if acquired:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": advisory_key(key)}
+                )
+        return not acquired
+
+
+class LocalLockBackend:
+    """Expiring leases in a process-wide table, for databases without advisory locks."""
+
+    _leases: dict[str, tuple[str, float]] = {}
+    _mutex = threading.Lock()
+
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        with self._mutex:
+            current = self._leases.get(key)
+            if current is not None and current[1] > time.monotonic():
+                return False
+            self._leases[key] = (token, time.monotonic() + ttl)
+            return True
+
+    def extend(self, key: str, token: str, ttl: float) -> bool:
+        with self._mutex:
+            current = self._leases.get(key)
+            if current is None or current[0] != token:
+                return False
+            self._leases[key] = (token, time.monotonic() + ttl)
+            return True
+
+    def release(self, key: str, token: str) -> None:
+        with self._mutex:
+            current = self._leases.get(key)
+            if current is not None and current[0] == token:
+                del self._leases[key]
+
+    def held(self, key: str) -> bool:
+        with self._mutex:
+            current = self._leases.get(key)
+            return current is not None and current[1] > time.monotonic()
+
+
+class CombinedLockBackend:
+    """The database lock, plus a Redis lease taken alongside it when Redis is reachable.
+
+    The database lock decides who holds a key; Redis failures are logged and skipped.
+    A key that is free in the database but still set in Redis (a crashed worker's
+    lease that has not expired yet) is treated as held.
+    """
+
+    def __init__(self, database: LockBackend, redis_backend: Callable[[], LockBackend]) -> None:
+        self.database = database
+        self._redis = redis_backend
+        self._in_redis: set[tuple[str, str]] = set()
+
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        if not self.database.acquire(key, token, ttl):
+            return False
+        if not _redis_available():
+            return True
+        try:
+            acquired = self._redis().acquire(key, token, ttl)
+        except redis.RedisError:
+            _redis_failed()
+            return True
+        if not acquired:
+            self.database.release(key, token)
+            return False
+        self._in_redis.add((key, token))
+        return True
+
+    def extend(self, key: str, token: str, ttl: float) -> bool:
+        if (key, token) in self._in_redis:
+            try:
+                self._redis().extend(key, token, ttl)
+            except redis.RedisError:
+                logger.warning("Could not renew Redis lease %s; the database lock still holds", key)
+        return self.database.extend(key, token, ttl)
+
+    def release(self, key: str, token: str) -> None:
+        if (key, token) in self._in_redis:
+            self._in_redis.discard((key, token))
+            try:
+                self._redis().release(key, token)
+            except redis.RedisError:  # the Redis lease expires on its own
+                logger.warning("Could not release Redis lease %s", key)
+        self.database.release(key, token)
+
+    def held(self, key: str) -> bool:
+        if _redis_available():
+            try:
+                if self._redis().held(key):
+                    return True
+            except redis.RedisError:
+                _redis_failed()
+        return self.database.held(key)
+
+
+class LeaseLost(RuntimeError):
+    """A lease expired or passed to another holder while its owner was still working."""
+
+
+class Lease:
+    """A held lock, renewed every third of its TTL until ``release``.
+
+    ``lost`` is set once a renewal fails; holders call ``check`` before each write.
+    """
+
+    def __init__(self, backend: LockBackend, key: str, token: str, ttl: float) -> None:
+        self.backend = backend
+        self.key = key
+        self.token = token
+        self.ttl = ttl
+        self.lost = False
+        self._stopped = threading.Event()
+        self._renewer = threading.Thread(
+            target=self._renew, name=f"lease-{key}", daemon=True
+        )
+        self._renewer.start()
+
+    def _renew(self) -> None:
+        while not self._stopped.wait(self.ttl / 3):
+            try:
+                renewed = self.backend.extend(self.key, self.token, self.ttl)
+            except Exception:
+                logger.exception("Could not renew lease %s", self.key)
+                continue
+            if not renewed:
+                self.lost = True
+                logger.warning("Lease %s expired before it was renewed", self.key)
+                return
+
+    def check(self) -> None:
+        """Raise ``LeaseLost`` if another worker may now hold this lease."""
+
+        if self.lost:
+            raise LeaseLost(f"Lease {self.key} was lost")
+
+    def release(self) -> None:
+        self._stopped.set()
+        self._renewer.join()
+        try:
+            self.backend.release(self.key, self.token)
+        except Exception:  # the lease expires on its own
+            logger.exception("Could not release lease %s", self.key)
+
+
+def lock_key(kind: str, district_id: UUID | str) -> str:
+    return f"{LOCK_PREFIX}:{kind}:{district_id}"
+
+
+def advisory_key(key: str) -> int:
+    """Map a lock key onto PostgreSQL's signed 64-bit advisory lock space."""
+
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+def try_district_lease(
+    bind: Engine, kind: str, district_id: UUID | str, *, ttl: float | None = None
+) -> Lease | None:
+    """Take the ``kind`` lease for a district, or return None if it is already held."""
+
+    return _try_lease(bind, lock_key(kind, district_id), ttl)
+
+
+def try_capacity_slot(bind: Engine, limit: int, *, ttl: float | None = None) -> Lease | None:
+    """Take one of ``limit`` worker-wide slots for a sync or rule run, or return None.
+
+    The slots are ordinary leases, so a crashed worker's slot frees itself when it expires.
+    """
+
+    for slot in range(limit):
+        lease = _try_lease(bind, f"{LOCK_PREFIX}:capacity:{slot}", ttl)
+        if lease is not None:
+            return lease
+    return None
+
+
+def _try_lease(bind: Engine, key: str, ttl: float | None) -> Lease | None:
+    ttl = ttl or get_settings().district_lock_ttl_seconds
+    token = uuid.uuid4().hex
+    backend = _backend(bind)
+    acquired = backend.acquire(key, token, ttl)
+    return Lease(backend, key, token, ttl) if acquired else None
+
+
+def district_lock_held(bind: Engine, kind: str, district_id: UUID | str) -> bool:
+    return _backend(bind).held(lock_key(kind, district_id))
+
+
+_redis_backend: RedisLockBackend | None = None
+_redis_retry_at = 0.0
+_advisory_backends: dict[Engine, AdvisoryLockBackend] = {}
+_combined_backends: dict[Engine, CombinedLockBackend] = {}
+_local_backend = LocalLockBackend()
+
+
+def _backend(bind: Engine) -> LockBackend:
+    mode = get_settings().district_lock_backend
+    if mode == "redis":
+        return _redis_lock_backend()
+    if mode == "database":
+        return _database_backend(bind)
+    if bind not in _combined_backends:
+        _combined_backends[bind] = CombinedLockBackend(_database_backend(bind), _redis_lock_backend)
+    return _combined_backends[bind]
+
+
+def _redis_lock_backend() -> RedisLockBackend:
+    global _redis_backend
+    if _redis_backend is None:
+        settings = get_settings()
+        client = redis.Redis.from_url(
+            settings.redis_lock_url or settings.redis_broker_url,
+            socket_connect_timeout=1.0,
+            socket_timeout=5.0,
+        )
+        _redis_backend = RedisLockBackend(client)
+    return _redis_backend
+
+
+def _database_backend(bind: Engine) -> LockBackend:
+    if bind.dialect.name != "postgresql":
+        return _local_backend
+    if bind not in _advisory_backends:
+        _advisory_backends[bind] = AdvisoryLockBackend(bind)
+    return _advisory_backends[bind]
+
+
+def _redis_available() -> bool:
+    return time.monotonic() >= _redis_retry_at
+
+
+def _redis_failed() -> None:
+    global _redis_retry_at
+    logger.warning("Redis unavailable for district locks; using only the database locks")
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
@@ -0,0 +1,41 @@
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from apps.api.app.db.models import RuleVersion, Student
+from apps.api.app.schemas import RuleRunScope
+
+
+def parse_scope(scope: dict[str, Any] | None) -> RuleRunScope:
+    """Parse a stored ``RuleRun.scope`` document; missing scope means district-wide."""
+
+    return RuleRunScope.model_validate(scope or {})
+
+
+def student_scope_filters(scope: RuleRunScope) -> list[ColumnElement[bool]]:
+    """Translate scope filters into SQL predicates on ``Student``."""
+
+    filters: list[ColumnElement[bool]] = []
+    if scope.school_ids:
+        filters.append(Student.school_id.in_(scope.school_ids))
+    if scope.entity_ids:
+        filters.append(Student.id.in_(scope.entity_ids))
+    if scope.grade_bands:
+        filters.append(
+            or_(
+                *(
+                    and_(Student.grade_level >= band.min, Student.grade_level <= band.max)
+                    for band in scope.grade_bands
+                )
+            )
+        )
+    return filters
+
+
+def rule_scope_filters(scope: RuleRunScope) -> list[ColumnElement[bool]]:
+    """Translate scope filters into SQL predicates on ``RuleVersion``."""
+
+    if scope.categories:
+        return [RuleVersion.category.in_(scope.categories)]
+    return []
@@ -0,0 +1,108 @@
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Slowest plan nodes kept with a run's metrics.
+PLAN_NODES_RECORDED = 10
+
+
+@dataclass
+class RuleMetrics:
+    code: str
+    rule_version_id: str | None
+    violations: int = 0
+    write_seconds: float = 0.0
+
+
+@dataclass
+class RunMetricsRecorder:
+    """Accumulates timings and counters while a rule run executes.
+
+    ``include_children`` adds the memory of evaluation processes, for runs that
+    evaluate in a process pool.
+    """
+
+    rules: list[RuleMetrics]
+    include_children: bool = False
+    rows_scanned: int = 0
+    batches: int = 0
+    fetch_seconds: float = 0.0
+    evaluate_seconds: float = 0.0
+    write_seconds: float = 0.0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _rss_at_start: tuple[float, float] = field(
+        default_factory=lambda: (peak_rss_mb(), peak_rss_mb(children=True)), repr=False
+    )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the elapsed time of the block to ``<name>_seconds``."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            attribute = f"{name}_seconds"
+            setattr(self, attribute, getattr(self, attribute) + time.perf_counter() - started)
+
+    def fetched(self, batches: Iterable[T]) -> Iterator[T]:
+        """Iterate ``batches`` while charging the time spent producing them to fetch."""
+
+        iterator = iter(batches)
+        while True:
+            with self.phase("fetch"):
+                batch = next(iterator, None)
+            if batch is None:
+                return
+            self.batches += 1
+            yield batch
+
+    def peak_rss_growth_mb(self) -> float:
+        """How far this run raised the worker's high-water RSS, in MiB.
+
+        ``ru_maxrss`` only ever grows over a process's lifetime, so the run's share is
+        the growth since it started; a run that stays below an earlier run's peak
+        reports 0. With ``include_children``, the growth of the largest finished child
+        process's peak is added.
+        """
+
+        self_start, children_start = self._rss_at_start
+        growth = max(peak_rss_mb() - self_start, 0.0)
+        if self.include_children:
+            growth += max(peak_rss_mb(children=True) - children_start, 0.0)
+        return round(growth, 1)
+
+    def as_dict(self, plan_nodes: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+        return {
+            "rows_scanned": self.rows_scanned,
+            "batches": self.batches,
+            "violations": sum(rule.violations for rule in self.rules),
+            "elapsed_seconds": round(time.perf_counter() - self._started, 6),
+            "fetch_seconds": round(self.fetch_seconds, 6),
+            "evaluate_seconds": round(self.evaluate_seconds, 6),
+            "write_seconds": round(self.write_seconds, 6),
+            "peak_rss_mb": self.peak_rss_growth_mb(),
+            "rules": [
+                {**asdict(rule), "write_seconds": round(rule.write_seconds, 6)}
+                for rule in self.rules
+            ],
+            "plan": (plan_nodes or [])[:PLAN_NODES_RECORDED],
+        }
+
+
+def peak_rss_mb(*, children: bool = False) -> float:
+    """High-water resident set size of this process over its lifetime, in MiB.
+
+    With ``children``, the high-water RSS of its largest terminated, waited-for child.
+    """
+
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    divisor = 2**20 if sys.platform == "darwin" else 2**10
+    return round(peak / divisor, 1)
@@ -0,0 +1,114 @@
+"""Nightly sync slots in each district's local time (US-013).
+
+A district's nightly sync is due at ``nightly_sync_local_time`` in ``District.timezone``
+plus a jitter of up to ``nightly_sync_jitter_minutes``. The jitter is derived from the
+district id and the date, so a slot is stable across scheduler ticks and restarts, yet
+districts in the same timezone spread over the whole window instead of all starting
+at 2 a.m. Slots are returned as naive UTC datetimes, like the rest of the schema.
+"""
+
+import hashlib
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db.models import Connector, District, SourceSystem, SyncJob
+from packages.shared.shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEZONE = "America/Chicago"
+
+
+def district_zone(name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown district timezone %r; using %s", name, DEFAULT_TIMEZONE)
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def jitter(district_id: UUID, day: date, window: timedelta) -> timedelta:
+    """A stable offset in ``[0, window)`` for one district and local date."""
+
+    digest = hashlib.sha256(f"{district_id}:{day.isoformat()}".encode()).digest()
+    fraction = int.from_bytes(digest[:8], "big") / 2**64
+    return timedelta(seconds=int(window.total_seconds() * fraction))
+
+
+def nightly_slot(
+    district_id: UUID, zone: ZoneInfo, day: date, local_time: time, window: timedelta
+) -> datetime:
+    """The UTC start of the district's sync for local ``day``."""
+
+    local = datetime.combine(day, local_time, tzinfo=zone) + jitter(district_id, day, window)
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def last_nightly_run(
+    district_id: UUID, timezone_name: str | None, now: datetime
+) -> datetime:
+    """The most recent slot at or before ``now`` (naive UTC)."""
+
+    zone, local_time, window = _schedule(timezone_name)
+    today = now.replace(tzinfo=timezone.utc).astimezone(zone).date()
+    slot = nightly_slot(district_id, zone, today, local_time, window)
+    if slot > now:
+        slot = nightly_slot(district_id, zone, today - timedelta(days=1), local_time, window)
+    return slot
+
+
+def next_nightly_run(
+    district_id: UUID, timezone_name: str | None, now: datetime
+) -> datetime:
+    """The first slot after ``now`` (naive UTC)."""
+
+    zone, local_time, window = _schedule(timezone_name)
+    day = now.replace(tzinfo=timezone.utc).astimezone(zone).date()
+    while (slot := nightly_slot(district_id, zone, day, local_time, window)) <= now:
+        day += timedelta(days=1)
+    return slot
+
+
+def due_nightly_syncs(session: Session, now: datetime) -> list[tuple[Connector, datetime]]:
+    """PowerSchool connectors whose latest slot passed with no sync queued or run since."""
+
+    latest_job = (
+        select(
+            SyncJob.connector_id,
+            func.max(func.coalesce(SyncJob.scheduled_at, SyncJob.started_at)).label("latest"),
+        )
+        .group_by(SyncJob.connector_id)
+        .subquery()
+    )
+    rows = session.execute(
+        select(Connector, District.timezone, latest_job.c.latest)
+        .join(District, Connector.district_id == District.id)
+        .join(SourceSystem, Connector.source_system_id == SourceSystem.id)
+        .outerjoin(latest_job, latest_job.c.connector_id == Connector.id)
+        .where(SourceSystem.kind == "powerschool")
+    ).all()
+
+    due: list[tuple[Connector, datetime]] = []
+    for connector, timezone_name, latest in rows:
+        slot = last_nightly_run(connector.district_id, timezone_name, now)
+        if latest is None or _naive(latest) < slot:
+            due.append((connector, slot))
+    return due
+
+
+def _schedule(timezone_name: str | None) -> tuple[ZoneInfo, time, timedelta]:
+    settings = get_settings()
+    return (
+        district_zone(timezone_name),
+        time.fromisoformat(settings.nightly_sync_local_time),
+        timedelta(minutes=settings.nightly_sync_jitter_minutes),
+    )
+
+
+def _naive(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
@@ -0,0 +1,67 @@
+"""Resolve school names from extracts to school ids without a query per row."""
+
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db.models import School
+
+
+def normalize_school_name(name: str) -> str:
+    """Case-insensitive key with whitespace runs collapsed: " Lincoln  HIGH" -> "lincoln high"."""
+
+    return " ".join(name.split()).casefold()
+
+
+class SchoolResolver:
+    """Map a district's school names and aliases to school ids, creating unknown schools.
+
+    The district's schools are loaded once, on first use. An official name takes
+    precedence over another school's alias that normalizes the same way.
+    """
+
+    def __init__(self, session: Session, district_id: UUID) -> None:
+        self.session = session
+        self.district_id = district_id
+        self._ids: dict[str, UUID] | None = None
+
+    def _index(self) -> dict[str, UUID]:
+        if self._ids is None:
+            rows = self.session.execute(
+                select(School.id, School.name, School.aliases).where(
+                    School.district_id == self.district_id
+                )
+            ).all()
+            names = {normalize_school_name(name): school_id for school_id, name, _ in rows}
+            aliases = {
+                normalize_school_name(alias): school_id
+                for school_id, _, school_aliases in rows
+                for alias in school_aliases or ()
+            }
+            self._ids = {**aliases, **names}
+        return self._ids
+
+    def prefetch(self, names: Iterable[str]) -> int:
+        """Create every school in ``names`` that does not exist yet; return how many."""
+
+        ids = self._index()
+        missing: dict[str, School] = {}
+        for name in names:
+            key = normalize_school_name(name)
+            if key and key not in ids and key not in missing:
+                missing[key] = School(district_id=self.district_id, name=" ".join(name.split()))
+        if missing:
+            self.session.add_all(missing.values())
+            self.session.flush()
+            ids.update((key, school.id) for key, school in missing.items())
+        return len(missing)
+
+    def school_id(self, name: str) -> UUID:
+        key = normalize_school_name(name)
+        if not key:
+            raise ValueError("School name is required")
+        if key not in self._index():
+            self.prefetch([name])
+        return self._index()[key]
@@ -0,0 +1,129 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from apps.api.app.db.models import IngestBatch, IngestStatusEnum, Student
+from apps.api.app.services.student_columns import STUDENT_COLUMNS, iter_student_column_batches
+from packages.rules.rules.snapshot import (
+    ColumnarSnapshot,
+    load_snapshot,
+    snapshot_directory,
+    write_snapshot,
+)
+
+STUDENT_ENTITY = "Student"
+FETCH_BATCH_SIZE = 5000
+
+
+def student_snapshot_key(session: Session, district_id: UUID) -> str:
+    """Return the snapshot key for a district's current student data.
+
+    The key combines the hash of the latest successful student ingest batch with the
+    student row count and last update, so manual edits also yield a new key, and with
+    the snapshot's column names, so snapshots written with other columns are not reused.
+    """
+
+    batch = session.execute(
+        select(IngestBatch.source_hash, IngestBatch.id)
+        .where(
+            IngestBatch.district_id == district_id,
+            IngestBatch.table_name == "student",
+            IngestBatch.status == IngestStatusEnum.success,
+        )
+        .order_by(IngestBatch.created_at.desc())
+        .limit(1)
+    ).first()
+    count, last_updated = session.execute(
+        select(func.count(Student.id), func.max(Student.updated_at)).where(
+            Student.district_id == district_id
+        )
+    ).one()
+    batch_hash = (batch.source_hash or str(batch.id)) if batch else "none"
+    fingerprint = f"{batch_hash}:{count}:{last_updated}:{','.join(STUDENT_COLUMNS)}"
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def build_student_snapshot(session: Session, district_id: UUID, key: str) -> ColumnarSnapshot:
+    """Read a district's students into the columns rule runs evaluate.
+
+    Columns and their null handling come from ``STUDENT_COLUMNS``, so a preview sees
+    the same data as a run, and no ORM entities are hydrated.
+    """
+
+    batches = list(
+        iter_student_column_batches(session, district_id, None, batch_size=FETCH_BATCH_SIZE)
+    )
+    if not batches:
+        batches = [{name: convert([]) for name, (_, convert) in STUDENT_COLUMNS.items()}]
+    return ColumnarSnapshot(
+        entity=STUDENT_ENTITY,
+        key=key,
+        columns={
+            name: np.concatenate([batch[name] for batch in batches]) for name in STUDENT_COLUMNS
+        },
+    )
+
+
+def export_student_snapshot(session: Session, district_id: UUID, root: Path) -> Path:
+    """Write the district's student snapshot under ``root`` unless it already exists."""
+
+    key = student_snapshot_key(session, district_id)
+    directory = snapshot_directory(root, str(district_id), STUDENT_ENTITY, key)
+    if not directory.exists():
+        write_snapshot(directory, build_student_snapshot(session, district_id, key))
+    return directory
+
+
+def load_student_snapshot(
+    session: Session, district_id: UUID, root: Path
+) -> ColumnarSnapshot | None:
+    """Memory-map the current on-disk student snapshot, if one matches the live data."""
+
+    key = student_snapshot_key(session, district_id)
+    directory = snapshot_directory(root, str(district_id), STUDENT_ENTITY, key)
+    if not directory.exists():
+        return None
+    return load_snapshot(directory)
+
+
+class StudentSnapshotCache:
+    """Process-local LRU of district student snapshots, keyed by snapshot key.
+
+    Lookups fall back to the on-disk snapshot (memory-mapped) and finally to an
+    in-memory build from the database; nothing is written on a miss.
+    """
+
+    def __init__(self, root: Path, max_entries: int = 8) -> None:
+        self.root = root
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[UUID, str], ColumnarSnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session: Session, district_id: UUID) -> ColumnarSnapshot:
+        key = student_snapshot_key(session, district_id)
+        cache_key = (district_id, key)
+        with self._lock:
+            snapshot = self._entries.get(cache_key)
+            if snapshot is not None:
+                self._entries.move_to_end(cache_key)
+                return snapshot
+
+        directory = snapshot_directory(self.root, str(district_id), STUDENT_ENTITY, key)
+        if directory.exists():
+            snapshot = load_snapshot(directory)
+        else:
+            snapshot = build_student_snapshot(session, district_id, key)
+
+        with self._lock:
+            for stale in [k for k in self._entries if k[0] == district_id]:
+                del self._entries[stale]
+            self._entries[cache_key] = snapshot
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
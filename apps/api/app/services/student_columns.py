@@ -0,0 +1,87 @@
+from typing import Any, Callable, Iterable, Iterator
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from apps.api.app.db.models import Student
+from packages.rules.rules.snapshot import string_column
+
+Converter = Callable[[list[Any]], np.ndarray]
+
+
+def _uuid_column(values: list[Any]) -> np.ndarray:
+    return string_column([str(value) if value else None for value in values])
+
+
+def _bool_column(values: list[Any]) -> np.ndarray:
+    return np.array([bool(value) for value in values], dtype=bool)
+
+
+def _date_column(values: list[Any]) -> np.ndarray:
+    return np.array(values, dtype="datetime64[D]")
+
+
+# Student fields available to rules, with the array type each is materialized as.
+STUDENT_COLUMNS: dict[str, tuple[InstrumentedAttribute, Converter]] = {
+    "id": (Student.id, _uuid_column),
+    "school_id": (Student.school_id, _uuid_column),
+    "sis_id": (Student.sis_id, string_column),
+    "state_id": (Student.state_id, string_column),
+    "first_name": (Student.first_name, string_column),
+    "last_name": (Student.last_name, string_column),
+    "birth_date": (Student.birth_date, _date_column),
+    "grade_level": (Student.grade_level, lambda values: np.array(values, dtype=np.int16)),
+    "enrollment_status": (Student.enrollment_status, string_column),
+    "ell_status": (Student.ell_status, _bool_column),
+    "idea_flag": (Student.idea_flag, _bool_column),
+    "enrollment_start": (Student.enrollment_start, _date_column),
+    "enrollment_end": (Student.enrollment_end, _date_column),
+}
+
+# Always fetched so violations can be attributed to a student and school.
+KEY_COLUMNS = ("id", "school_id")
+
+
+def student_projection(fields: Iterable[str] | None) -> list[str]:
+    """Return the student columns to fetch for ``fields``; ``None`` selects every column."""
+
+    if fields is None:
+        return list(STUDENT_COLUMNS)
+    requested = set(fields)
+    unknown = requested - STUDENT_COLUMNS.keys()
+    if unknown:
+        raise ValueError(f"Unknown student field(s): {', '.join(sorted(unknown))}")
+    return [name for name in STUDENT_COLUMNS if name in requested or name in KEY_COLUMNS]
+
+
+def iter_student_column_batches(
+    session: Session,
+    district_id: UUID,
+    fields: Iterable[str] | None,
+    filters: Iterable[ColumnElement[bool]] = (),
+    *,
+    batch_size: int,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Stream a district's students as column batches of at most ``batch_size`` rows.
+
+    Only the projected columns are selected and rows arrive as plain tuples, so no ORM
+    entities are hydrated or tracked by the session.
+    """
+
+    names = student_projection(fields)
+    specs = [STUDENT_COLUMNS[name] for name in names]
+    result = session.execute(
+        select(*(attribute for attribute, _ in specs))
+        .where(Student.district_id == district_id, *filters)
+        .order_by(Student.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for rows in result.partitions():
+        values = list(zip(*rows, strict=True))
+        yield {
+            name: convert(list(column))
+            for name, (_, convert), column in zip(names, specs, values, strict=True)
+        }
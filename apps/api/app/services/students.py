@@ -1,10 +1,12 @@
+from datetime import date
 from typing import Tuple
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from apps.api.app.db.models import School, Student
+from apps.api.app.db.models import Student
+from apps.api.app.services.schools import SchoolResolver
 
 
 def upsert_student(
@@ -19,19 +21,20 @@ def upsert_student(
     school_name: str,
     ell_status: bool | None = None,
     idea_flag: bool | None = None,
+    source_row_hash: str | None = None,
+    state_id: str | None = None,
+    birth_date: date | None = None,
+    schools: SchoolResolver | None = None,
 ) -> Tuple[Student, bool]:
-    """Create or update a student record and return (student, created)."""
+    """Create or update a student record and return (student, created).
 
-    school = session.execute(
-        select(School).where(
-            School.district_id == district_id,
-            func.lower(School.name) == school_name.lower(),
-        )
-    ).scalar_one_or_none()
-    if school is None:
-        school = School(district_id=district_id, name=school_name)
-        session.add(school)
-        session.flush()
+    Pass one ``schools`` resolver for a whole batch; without it the district's schools
+    are loaded for this row alone.
+    """
+
+    if schools is None:
+        schools = SchoolResolver(session, district_id)
+    school_id = schools.school_id(school_name)
 
     student = session.execute(
         select(Student).where(Student.district_id == district_id, Student.sis_id == sis_id)
@@ -41,7 +44,7 @@ def upsert_student(
     if student is None:
         student = Student(
             district_id=district_id,
-            school_id=school.id,
+            school_id=school_id,
             sis_id=sis_id,
             first_name=first_name,
             last_name=last_name,
@@ -49,11 +52,14 @@ def upsert_student(
             enrollment_status=enrollment_status,
             ell_status=ell_status or False,
             idea_flag=idea_flag or False,
+            source_row_hash=source_row_hash,
+            state_id=state_id,
+            birth_date=birth_date,
         )
         session.add(student)
         created = True
     else:
-        student.school_id = school.id
+        student.school_id = school_id
         student.first_name = first_name
         student.last_name = last_name
         student.grade_level = grade_level
@@ -62,6 +68,11 @@ def upsert_student(
             student.ell_status = ell_status
         if idea_flag is not None:
             student.idea_flag = idea_flag
+        if state_id is not None:
+            student.state_id = state_id
+        if birth_date is not None:
+            student.birth_date = birth_date
+        student.source_row_hash = source_row_hash
 
     session.flush()
     return student, created
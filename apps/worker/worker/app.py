@@ -2,24 +2,46 @@ from celery import Celery
 
 from packages.shared.shared.config import get_settings
 
+from .queues import celery_config
+from .serialization import SERIALIZER, register_serializer
+
 
 def create_celery() -> Celery:
     """Create the Celery application with default settings."""
 
     settings = get_settings()
+    register_serializer(settings.celery_compression_threshold_bytes)
     celery_app = Celery(
         "crdc_precheck_worker",
         broker=settings.redis_broker_url,
         backend=settings.redis_result_url,
         include=["apps.worker.worker.tasks"],
+        task_cls="apps.worker.worker.serialization:BoundedResultTask",
     )
     celery_app.conf.update(
-        task_routes={"worker.tasks.*": {"queue": "default"}},
-        task_serializer="json",
-        result_serializer="json",
-        accept_content=["json"],
+        **celery_config(settings),
+        task_serializer=SERIALIZER,
+        result_serializer=SERIALIZER,
+        # JSON stays accepted so messages queued before an upgrade still run.
+        accept_content=[SERIALIZER, "json"],
+        result_accept_content=[SERIALIZER, "json"],
+        result_expires=settings.celery_result_expires_seconds,
+        result_max_bytes=settings.celery_result_max_bytes,
+        task_annotations={
+            f"worker.tasks.{name}": {"ignore_result": True}
+            for name in settings.celery_ignore_result_tasks
+        },
+        beat_schedule={
+            "heartbeat": {"task": "worker.tasks.heartbeat", "schedule": 60.0},
+            "nightly-syncs": {
+                "task": "worker.tasks.schedule_nightly_syncs",
+                "schedule": float(settings.nightly_sync_tick_seconds),
+            },
+        },
     )
     return celery_app
 
 
 app = create_celery()
+
+from . import metrics  # noqa: E402,F401  - connects task metric signal handlers
@@ -0,0 +1,438 @@
+"""Asynchronous, rate-limited connectors for paginated SIS APIs.
+
+``AsyncConnector.run`` drives a three-stage asyncio pipeline:
+
+* **fetch**: ``concurrency`` coroutines request pages. Each request first takes a
+  token from a ``TokenBucket``, and failed requests are retried with exponential
+  backoff (US-012).
+* **transform**: page records are mapped to extract rows and grouped into load batches.
+* **load**: each batch is handed to a synchronous callable, which runs in a thread so
+  that fetching continues meanwhile.
+
+The stages are joined by bounded queues, so a slow database throttles fetching
+instead of letting pages pile up in memory. ``run`` returns per-stage throughput
+for ``SyncJob.metrics``.
+
+A ``load`` that uses a database session must stay on the thread that opened the
+session. ``load_on_calling_thread`` does this: the event loop runs in a helper thread,
+and batches come back to the caller through a bounded queue.
+"""
+
+import asyncio
+import queue
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from packages.shared.shared.config import AppSettings
+
+from .pipeline import StageMetrics
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# PowerSchool enroll_status codes mapped to the statuses the rules expect.
+ENROLL_STATUSES = {
+    "A": "active",
+    "P": "pre-registered",
+    "I": "inactive",
+    "G": "graduated",
+    "T": "transferred",
+}
+
+# Marks the end of a queue's input.
+_DONE = object()
+
+# Seconds between checks for a failed load stage while a hand-off is blocked.
+HANDOFF_POLL_SECONDS = 0.1
+
+Batch = list[dict[str, Any]]
+
+
+class ConnectorError(Exception):
+    """A page could not be fetched within the retry budget."""
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second on average, with bursts up to ``capacity``."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available; return the seconds waited."""
+
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Full-jitter exponential backoff; a server's ``Retry-After`` takes precedence."""
+
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+@dataclass
+class PipelineMetrics:
+    fetch: StageMetrics = field(default_factory=StageMetrics)
+    transform: StageMetrics = field(default_factory=StageMetrics)
+    load: StageMetrics = field(default_factory=StageMetrics)
+    pages: int = 0
+    retries: int = 0
+    throttled_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        elapsed = self.elapsed_seconds
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "pages": self.pages,
+            "retries": self.retries,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "stages": {
+                "fetch": self.fetch.as_dict(elapsed),
+                "transform": self.transform.as_dict(elapsed),
+                "load": self.load.as_dict(elapsed),
+            },
+        }
+
+
+@dataclass(frozen=True)
+class PipelineLimits:
+    rate_per_second: float = 10.0
+    burst: int = 10
+    concurrency: int = 4
+    queue_size: int = 8
+    load_batch_size: int = 1000
+    retry: RetryPolicy = RetryPolicy()
+
+    @classmethod
+    def from_settings(cls, settings: AppSettings) -> "PipelineLimits":
+        return cls(
+            rate_per_second=settings.connector_rate_per_second,
+            burst=settings.connector_burst,
+            concurrency=settings.connector_concurrency,
+            queue_size=settings.connector_queue_size,
+            load_batch_size=settings.ingest_batch_size,
+            retry=RetryPolicy(attempts=settings.connector_max_attempts),
+        )
+
+
+class AsyncConnector:
+    """Base class for paginated API connectors.
+
+    Subclasses implement ``page_requests`` (the request parameters of every page),
+    ``records`` (records in a page response) and ``transform`` (one API record to an
+    extract row shaped like ``samples/powerschool/students.json``, or None to drop it).
+    """
+
+    def __init__(self, client: httpx.AsyncClient, limits: PipelineLimits | None = None) -> None:
+        self.client = client
+        self.limits = limits or PipelineLimits()
+        self.bucket = TokenBucket(self.limits.rate_per_second, self.limits.burst)
+        self.metrics = PipelineMetrics()
+
+    async def authenticate(self) -> None:
+        """Hook for obtaining credentials before the first page is fetched."""
+
+    def page_requests(self) -> AsyncIterator[dict[str, Any]]:
+        raise NotImplementedError
+
+    def records(self, response: httpx.Response) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    def transform(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        return record
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a rate-limited request, retrying transport errors and retryable statuses."""
+
+        retry = self.limits.retry
+        for attempt in range(retry.attempts):
+            self.metrics.throttled_seconds += await self.bucket.acquire()
+            retry_after = None
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                failure = f"{type(exc).__name__}: {exc}"
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response
+                failure = f"HTTP {response.status_code}"
+                retry_after = _retry_after(response)
+            if attempt + 1 < retry.attempts:
+                self.metrics.retries += 1
+                await asyncio.sleep(retry.delay(attempt, retry_after))
+        raise ConnectorError(f"{method} {url} failed after {retry.attempts} attempts ({failure})")
+
+    async def run(self, load: Callable[[list[dict[str, Any]]], Any]) -> dict[str, Any]:
+        """Fetch, transform and load every page; return the pipeline metrics."""
+
+        started = time.perf_counter()
+        await self.authenticate()
+        limits = self.limits
+        requests: asyncio.Queue = asyncio.Queue(maxsize=limits.concurrency * 2)
+        pages: asyncio.Queue = asyncio.Queue(maxsize=limits.queue_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=limits.queue_size)
+
+        async def plan() -> None:
+            async for params in self.page_requests():
+                await requests.put(params)
+            for _ in range(limits.concurrency):
+                await requests.put(_DONE)
+
+        async def fetch() -> None:
+            while (params := await requests.get()) is not _DONE:
+                fetch_started = time.perf_counter()
+                response = await self.request(**params)
+                page = self.records(response)
+                self.metrics.fetch.busy_seconds += time.perf_counter() - fetch_started
+                self.metrics.fetch.items += len(page)
+                self.metrics.pages += 1
+                await pages.put(page)
+
+        async def transform() -> None:
+            batch: list[dict[str, Any]] = []
+            while (page := await pages.get()) is not _DONE:
+                transform_started = time.perf_counter()
+                for record in page:
+                    payload = self.transform(record)
+                    if payload is not None:
+                        batch.append(payload)
+                self.metrics.transform.items += len(page)
+                self.metrics.transform.busy_seconds += time.perf_counter() - transform_started
+                while len(batch) >= limits.load_batch_size:
+                    await batches.put(batch[: limits.load_batch_size])
+                    batch = batch[limits.load_batch_size :]
+            if batch:
+                await batches.put(batch)
+            await batches.put(_DONE)
+
+        async def load_batches() -> None:
+            while (batch := await batches.get()) is not _DONE:
+                load_started = time.perf_counter()
+                await asyncio.to_thread(load, batch)
+                self.metrics.load.busy_seconds += time.perf_counter() - load_started
+                self.metrics.load.items += len(batch)
+
+        async def fetch_all() -> None:
+            async with asyncio.TaskGroup() as fetchers:
+                for _ in range(limits.concurrency):
+                    fetchers.create_task(fetch())
+            await pages.put(_DONE)
+
+        try:
+            async with asyncio.TaskGroup() as stages:
+                stages.create_task(plan())
+                stages.create_task(fetch_all())
+                stages.create_task(transform())
+                stages.create_task(load_batches())
+        except ExceptionGroup as group:
+            raise _first_error(group) from group
+
+        self.metrics.elapsed_seconds = time.perf_counter() - started
+        return self.metrics.as_dict()
+
+
+class PowerSchoolConnector(AsyncConnector):
+    """Students from the PowerSchool district API (``/ws/v1/district/student``).
+
+    The student count is fetched first, so every page can be requested concurrently.
+    OAuth client credentials are exchanged for a bearer token when configured.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limits: PipelineLimits | None = None,
+        *,
+        page_size: int = 100,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+    ) -> None:
+        super().__init__(client, limits)
+        self.page_size = page_size
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    async def authenticate(self) -> None:
+        if not self.client_id:
+            return
+        response = await self.request(
+            "POST",
+            "/oauth/access_token",
+            data={"grant_type": "client_credentials"},
+            auth=(self.client_id, self.client_secret or ""),
+        )
+        self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    async def page_requests(self) -> AsyncIterator[dict[str, Any]]:
+        response = await self.request("GET", "/ws/v1/district/student/count")
+        count = int(response.json()["resource"]["count"])
+        for page in range(1, -(-count // self.page_size) + 1):
+            yield {
+                "method": "GET",
+                "url": "/ws/v1/district/student",
+                "params": {
+                    "page": page,
+                    "pagesize": self.page_size,
+                    "expansions": "school_enrollment",
+                },
+            }
+
+    def records(self, response: httpx.Response) -> list[dict[str, Any]]:
+        students = (response.json().get("students") or {}).get("student") or []
+        # PowerSchool returns a bare object instead of a list for single-record pages.
+        return students if isinstance(students, list) else [students]
+
+    def transform(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        sis_id = record.get("local_id") or record.get("student_number")
+        if sis_id is None:
+            return None
+        name = record.get("name") or {}
+        enrollment = record.get("school_enrollment") or {}
+        return {
+            "sis_id": str(sis_id),
+            "first_name": name.get("first_name", ""),
+            "last_name": name.get("last_name", ""),
+            "grade_level": enrollment.get("grade_level", 0),
+            "school_name": enrollment.get("school_name"),
+            "enrollment_status": ENROLL_STATUSES.get(enrollment.get("enroll_status"), "active"),
+        }
+
+
+def load_on_calling_thread(
+    pipeline: Callable[[Callable[[Batch], None]], Awaitable[dict[str, Any]]],
+    load: Callable[[Batch], Any],
+    *,
+    queue_size: int,
+) -> dict[str, Any]:
+    """Run ``pipeline`` on an event loop in a helper thread and ``load`` on this one.
+
+    ``pipeline`` receives a hand-off callable to use as its load stage. Each batch it
+    hands off waits in a queue of ``queue_size`` until this thread has loaded the
+    batches before it, so backpressure still reaches the fetchers. The pipeline's
+    ``load`` stage metrics are replaced by what this thread measured.
+    """
+
+    handoff: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    outcome: dict[str, Any] = {}
+
+    def deliver(batch: Any) -> None:
+        while not stop.is_set():
+            try:
+                handoff.put(batch, timeout=HANDOFF_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+        raise ConnectorError("Load stage stopped")
+
+    def run_loop() -> None:
+        try:
+            outcome["metrics"] = asyncio.run(pipeline(deliver))
+        except BaseException as exc:  # re-raised on the calling thread
+            outcome["error"] = exc
+        finally:
+            try:
+                deliver(_DONE)
+            except ConnectorError:
+                pass
+
+    started = time.perf_counter()
+    load_metrics = StageMetrics()
+    thread = threading.Thread(target=run_loop, name="connector-loop", daemon=True)
+    thread.start()
+    try:
+        while True:
+            wait_started = time.perf_counter()
+            batch = handoff.get()
+            load_metrics.blocked_seconds += time.perf_counter() - wait_started
+            if batch is _DONE:
+                break
+            load_started = time.perf_counter()
+            load(batch)
+            load_metrics.busy_seconds += time.perf_counter() - load_started
+            load_metrics.items += len(batch)
+    finally:
+        stop.set()
+        thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+
+    metrics = outcome["metrics"]
+    elapsed = time.perf_counter() - started
+    metrics["elapsed_seconds"] = round(elapsed, 3)
+    metrics["stages"]["load"] = load_metrics.as_dict(elapsed)
+    return metrics
+
+
+def fetch_powerschool_students(
+    settings: AppSettings, load: Callable[[Batch], Any]
+) -> dict[str, Any]:
+    """Run a ``PowerSchoolConnector`` configured from settings; return its metrics.
+
+    ``load`` is called on the calling thread, so it may use that thread's session.
+    """
+
+    async def pipeline(deliver: Callable[[Batch], None]) -> dict[str, Any]:
+        async with httpx.AsyncClient(
+            base_url=settings.powerschool_base_url, timeout=30.0
+        ) as client:
+            connector = PowerSchoolConnector(
+                client,
+                PipelineLimits.from_settings(settings),
+                page_size=settings.powerschool_page_size,
+                client_id=settings.powerschool_client_id,
+                client_secret=settings.powerschool_client_secret,
+            )
+            return await connector.run(deliver)
+
+    return load_on_calling_thread(pipeline, load, queue_size=settings.connector_queue_size)
+
+
+def _first_error(group: BaseExceptionGroup) -> BaseException:
+    error = group.exceptions[0]
+    return _first_error(error) if isinstance(error, BaseExceptionGroup) else error
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
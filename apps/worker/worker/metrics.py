@@ -0,0 +1,114 @@
+"""Prometheus metrics for Celery tasks, collected through Celery signals.
+
+Publishers stamp each message with its publish time, so the worker can report how long
+a task waited in the queue. Duration is measured between ``task_prerun`` and
+``task_postrun``. Row counts come from the ``rows_*`` fields of task results.
+
+The exporter starts with the worker's main process. Under the prefork pool, set
+``PROMETHEUS_MULTIPROC_DIR`` so that child processes write their samples where the
+exporter can aggregate them.
+"""
+
+import logging
+import os
+import time
+from typing import Any
+
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+from packages.shared.shared.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED_AT_HEADER = "published_at"
+
+TASK_QUEUE_WAIT = Histogram(
+    "crdc_worker_task_queue_wait_seconds",
+    "Time between publishing a task and a worker starting it.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 3600),
+)
+TASK_DURATION = Histogram(
+    "crdc_worker_task_duration_seconds",
+    "Task execution time by final state.",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+TASK_ROWS = Counter(
+    "crdc_worker_task_rows_total",
+    "Rows processed by tasks, by kind of work.",
+    ["task", "kind"],
+)
+
+# Task result fields reported as processed rows, with the kind label they map to.
+ROW_FIELDS = {"rows_ingested": "ingested", "rows_scanned": "scanned", "violations": "violations"}
+
+_started: dict[str, float] = {}
+
+
+@before_task_publish.connect
+def _stamp_publish_time(headers: dict[str, Any] | None = None, **_: Any) -> None:
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def _task_started(task_id: str | None = None, task: Any = None, **_: Any) -> None:
+    if task_id is None or task is None:
+        return
+    _started[task_id] = time.perf_counter()
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    if published_at is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(time.time() - float(published_at), 0.0))
+
+
+@task_postrun.connect
+def _task_finished(
+    task_id: str | None = None,
+    task: Any = None,
+    retval: Any = None,
+    state: str | None = None,
+    **_: Any,
+) -> None:
+    started = _started.pop(task_id, None) if task_id else None
+    if task is None or started is None:
+        return
+    TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+    if isinstance(retval, dict):
+        for field, kind in ROW_FIELDS.items():
+            value = retval.get(field)
+            if isinstance(value, int) and value > 0:
+                TASK_ROWS.labels(task.name, kind).inc(value)
+
+
+@worker_init.connect
+def _start_exporter(**_: Any) -> None:
+    settings = get_settings()
+    if not settings.metrics_enabled:
+        return
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(settings.worker_metrics_port, registry=registry)
+    logger.info("Worker metrics exported on port %d", settings.worker_metrics_port)
+
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid: int | None = None, **_: Any) -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,185 @@
+"""Threaded read → transform → write pipeline with bounded queues.
+
+``StagedPipeline`` runs the reader and the transformer in their own threads and the
+writer on the calling thread, which keeps database sessions on the thread that
+opened them. Bounded queues between stages provide backpressure: a slow writer
+blocks the transformer, which in turn blocks the reader, so at most
+``queue_size`` batches wait between any two stages. Parsing and normalization thus
+overlap database round trips.
+
+``run`` returns stage timings and queue depths in the shape stored in
+``SyncJob.metrics``.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+# Seconds between checks for a failed downstream stage while blocked on a queue.
+POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+@dataclass
+class StageMetrics:
+    items: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+
+    def as_dict(self, elapsed: float) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "items_per_second": round(self.items / elapsed, 1) if elapsed else None,
+        }
+
+
+class _StageQueue:
+    """A bounded queue that samples its depth on every get."""
+
+    def __init__(self, maxsize: int, stop: threading.Event) -> None:
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.stop = stop
+        self.samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+
+    def put(self, item: Any) -> float:
+        """Put ``item``, waiting for space; return the seconds spent blocked."""
+
+        started = time.perf_counter()
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=POLL_SECONDS)
+                return time.perf_counter() - started
+            except queue.Full:
+                continue
+        raise _Stopped
+
+    def get(self) -> tuple[Any, float]:
+        started = time.perf_counter()
+        depth = self.queue.qsize()
+        self.samples += 1
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+        while not self.stop.is_set():
+            try:
+                return self.queue.get(timeout=POLL_SECONDS), time.perf_counter() - started
+            except queue.Empty:
+                continue
+        raise _Stopped
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "capacity": self.queue.maxsize,
+            "max_depth": self.max_depth,
+            "mean_depth": round(self.depth_total / self.samples, 2) if self.samples else 0,
+        }
+
+
+class _Stopped(Exception):
+    """Raised in a stage when another stage failed."""
+
+
+class StagedPipeline(Generic[T, U]):
+    def __init__(
+        self,
+        source: Iterable[T],
+        transform: Callable[[T], U],
+        write: Callable[[U], Any],
+        *,
+        queue_size: int = 4,
+    ) -> None:
+        self.source = source
+        self.transform = transform
+        self.write = write
+        self.queue_size = queue_size
+        self.stages = {name: StageMetrics() for name in ("read", "transform", "write")}
+
+    def run(self) -> dict[str, Any]:
+        """Run every batch through the three stages; re-raise the first stage error."""
+
+        started = time.perf_counter()
+        stop = threading.Event()
+        read_queue = _StageQueue(self.queue_size, stop)
+        write_queue = _StageQueue(self.queue_size, stop)
+        errors: list[BaseException] = []
+
+        def guarded(stage: Callable[[], None]) -> Callable[[], None]:
+            def run_stage() -> None:
+                try:
+                    stage()
+                except _Stopped:
+                    pass
+                except BaseException as exc:  # re-raised on the calling thread
+                    errors.append(exc)
+                    stop.set()
+
+            return run_stage
+
+        def read() -> None:
+            metrics = self.stages["read"]
+            iterator = iter(self.source)
+            while True:
+                item_started = time.perf_counter()
+                item = next(iterator, _DONE)
+                metrics.busy_seconds += time.perf_counter() - item_started
+                if item is _DONE:
+                    break
+                metrics.items += 1
+                metrics.blocked_seconds += read_queue.put(item)
+            read_queue.put(_DONE)
+
+        def transform() -> None:
+            metrics = self.stages["transform"]
+            while True:
+                item, waited = read_queue.get()
+                metrics.blocked_seconds += waited
+                if item is _DONE:
+                    break
+                item_started = time.perf_counter()
+                result = self.transform(item)
+                metrics.busy_seconds += time.perf_counter() - item_started
+                metrics.items += 1
+                metrics.blocked_seconds += write_queue.put(result)
+            write_queue.put(_DONE)
+
+        def write() -> None:
+            metrics = self.stages["write"]
+            while True:
+                item, waited = write_queue.get()
+                metrics.blocked_seconds += waited
+                if item is _DONE:
+                    break
+                item_started = time.perf_counter()
+                self.write(item)
+                metrics.busy_seconds += time.perf_counter() - item_started
+                metrics.items += 1
+
+        threads = [
+            threading.Thread(target=guarded(read), name="pipeline-read", daemon=True),
+            threading.Thread(target=guarded(transform), name="pipeline-transform", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        guarded(write)()
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        elapsed = time.perf_counter() - started
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": {name: stage.as_dict(elapsed) for name, stage in self.stages.items()},
+            "queues": {"read": read_queue.as_dict(), "write": write_queue.as_dict()},
+        }
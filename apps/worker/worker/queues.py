@@ -0,0 +1,107 @@
+"""Celery queue topology: which queue each task runs on, and at what priority.
+
+Long-running work is kept away from the short tasks users wait on:
+
+* ``ingest``: connector syncs, which can run for most of an hour.
+* ``rules``: district-wide rule runs.
+* ``exports``: snapshots and evidence packets.
+* ``housekeeping``: heartbeats, compaction and the nightly sync scheduler.
+* ``interactive``: work a user is waiting on in the UI, such as a rule run scoped to
+  one school.
+
+Each queue gets its own worker (``python -m apps.worker.worker.queues <queue>``) with
+the concurrency configured in ``AppSettings.celery_queue_concurrency``, so a slow
+sync can never occupy the slots heartbeats and interactive runs need. Within a
+queue, messages are consumed by priority; with the Redis broker, 0 is the highest.
+"""
+
+import sys
+from typing import Any
+
+from kombu import Queue
+
+from packages.shared.shared.config import AppSettings, get_settings
+
+QUEUES = ("ingest", "rules", "exports", "housekeeping", "interactive")
+
+TASK_QUEUES = {
+    "worker.tasks.sync_powerschool": "ingest",
+    "worker.tasks.process_rule_run": "rules",
+    "worker.tasks.dedupe_students": "rules",
+    "worker.tasks.export_district_snapshot": "exports",
+    "worker.tasks.compact_rule_results": "housekeeping",
+    "worker.tasks.heartbeat": "housekeeping",
+    "worker.tasks.schedule_nightly_syncs": "housekeeping",
+}
+
+# Redis emulates priorities with one list per step; 0 is consumed first.
+PRIORITY_STEPS = list(range(10))
+
+
+def task_routes(settings: AppSettings) -> dict[str, dict[str, Any]]:
+    routes: dict[str, dict[str, Any]] = {}
+    for name, queue in TASK_QUEUES.items():
+        routes[name] = {"queue": queue}
+        priority = settings.celery_task_priorities.get(name.rsplit(".", 1)[-1])
+        if priority is not None:
+            routes[name]["priority"] = priority
+    # Tasks added later without a route land with the other housekeeping work.
+    routes["worker.tasks.*"] = {"queue": "housekeeping"}
+    return routes
+
+
+def interactive_options(settings: AppSettings | None = None) -> dict[str, Any]:
+    """``apply_async`` options for work a user is waiting on."""
+
+    settings = settings or get_settings()
+    return {"queue": "interactive", "priority": settings.celery_interactive_priority}
+
+
+def on_demand_options(task_name: str, settings: AppSettings | None = None) -> dict[str, Any]:
+    """Keep a task on its usual queue, but ahead of scheduled work there."""
+
+    settings = settings or get_settings()
+    return {"queue": TASK_QUEUES[task_name], "priority": settings.celery_interactive_priority}
+
+
+def celery_config(settings: AppSettings) -> dict[str, Any]:
+    return {
+        "task_queues": [Queue(name) for name in QUEUES],
+        "task_default_queue": "housekeeping",
+        "task_routes": task_routes(settings),
+        "task_queue_max_priority": PRIORITY_STEPS[-1],
+        "task_default_priority": PRIORITY_STEPS[len(PRIORITY_STEPS) // 2],
+        "broker_transport_options": {"priority_steps": PRIORITY_STEPS},
+        "worker_prefetch_multiplier": settings.celery_prefetch_multiplier,
+        "task_acks_late": settings.celery_acks_late,
+        # With late acks, a task whose worker died is redelivered instead of lost.
+        "task_reject_on_worker_lost": settings.celery_acks_late,
+    }
+
+
+def worker_argv(queues: list[str], settings: AppSettings | None = None) -> list[str]:
+    """Arguments for a worker consuming ``queues`` with their combined concurrency."""
+
+    settings = settings or get_settings()
+    unknown = sorted(set(queues) - set(QUEUES))
+    if unknown:
+        raise ValueError(f"Unknown queue(s): {', '.join(unknown)}")
+    concurrency = sum(settings.celery_queue_concurrency.get(queue, 1) for queue in queues)
+    return [
+        "worker",
+        "--loglevel=info",
+        f"--queues={','.join(queues)}",
+        f"--concurrency={concurrency}",
+        f"--hostname={'-'.join(queues)}@%h",
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    queues = (argv if argv is not None else sys.argv[1:]) or list(QUEUES)
+    from .app import app
+
+    app.worker_main(worker_argv([name for arg in queues for name in arg.split(",")]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compact task messages and bounded task results.
+
+Messages are encoded with msgpack under the ``crdc-msgpack`` serializer. Payloads of
+``celery_compression_threshold_bytes`` or more are zlib-compressed, while small
+messages (most task arguments are a single id) skip the compression cost. A one-byte
+header records which form follows.
+
+Results pass through ``BoundedResultTask``: a result whose encoded size exceeds
+``celery_result_max_bytes`` is replaced by a summary of its scalar fields before it
+reaches the result backend, so one oversized return value cannot bloat Redis.
+"""
+
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import msgpack
+from celery import Task
+from kombu.serialization import dumps, register
+
+logger = logging.getLogger(__name__)
+
+SERIALIZER = "crdc-msgpack"
+CONTENT_TYPE = "application/x-crdc-msgpack"
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+
+def _default(value: Any) -> Any:
+    # Same conversions as the JSON serializer: these arrive as strings.
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def encode(value: Any, threshold: int) -> bytes:
+    packed = msgpack.packb(value, default=_default, use_bin_type=True)
+    if len(packed) >= threshold:
+        compressed = zlib.compress(packed, 6)
+        if len(compressed) < len(packed):
+            return _ZLIB + compressed
+    return _RAW + packed
+
+
+def decode(data: bytes) -> Any:
+    data = bytes(data)
+    header, body = data[:1], data[1:]
+    if header == _ZLIB:
+        body = zlib.decompress(body)
+    elif header != _RAW:
+        raise ValueError(f"Unknown {SERIALIZER} header {header!r}")
+    return msgpack.unpackb(body, raw=False)
+
+
+def register_serializer(threshold: int) -> None:
+    register(
+        SERIALIZER,
+        lambda value: encode(value, threshold),
+        decode,
+        content_type=CONTENT_TYPE,
+        content_encoding="binary",
+    )
+
+
+def cap_result(task_name: str, result: Any, serializer: str, max_bytes: int) -> Any:
+    """Return ``result``, or a summary of it when its encoded form exceeds ``max_bytes``."""
+
+    if max_bytes <= 0 or result is None:
+        return result
+    size = len(dumps(result, serializer=serializer)[2])
+    if size <= max_bytes:
+        return result
+    logger.warning(
+        "Result of %s is %d bytes, over the %d byte limit; storing a summary",
+        task_name,
+        size,
+        max_bytes,
+    )
+    summary: dict[str, Any] = {"result_truncated": True, "result_bytes": size}
+    if not isinstance(result, dict):
+        return summary
+    # Keep the scalar fields (status, ids, counts) that still fit under the limit.
+    kept: dict[str, Any] = {}
+    for key, value in result.items():
+        if not isinstance(value, (str, int, float, bool, type(None))):
+            continue
+        candidate = {**kept, key: value}
+        if len(dumps({**candidate, **summary}, serializer=serializer)[2]) <= max_bytes:
+            kept = candidate
+    return {**kept, **summary}
+
+
+class BoundedResultTask(Task):
+    """Caps the result of every task executed by a worker; direct calls are untouched."""
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        result = super().__call__(*args, **kwargs)
+        if self.request.called_directly or self.ignore_result:
+            return result
+        max_bytes = self.app.conf.get("result_max_bytes", 0)
+        return cap_result(self.name, result, self.app.conf.result_serializer, max_bytes)
@@ -1,14 +1,24 @@
-import json
-from datetime import datetime, timezone
+import logging
+import time
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 from uuid import UUID
 
-from sqlalchemy import select
+import numpy as np
+from celery import Task
+from celery.app.task import Context
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from packages.rules.rules.evaluator import evaluate_rule
+from packages.rules.rules.dsl import DslError, compile_dsl, row_count, validate_dsl
+from packages.rules.rules.evidence import build_details, evidence_fields
 from packages.rules.rules.models import RuleDefinition, RuleSeverity
+from packages.rules.rules.parallel import ParallelPlan
+from packages.rules.rules.plan import PlanStats, RulePlan
+from packages.rules.rules.records import RecordBatch
+from packages.shared.shared.config import AppSettings, get_settings
 
 from apps.api.app.db.models import (
     AuthMethodEnum,
@@ -24,14 +34,43 @@ from apps.api.app.db.models import (
     RuleSeverityEnum,
     RuleVersion,
     SourceSystem,
-    Student,
     SyncJob,
     SyncStatusEnum,
 )
 from apps.api.app.db.session import SessionLocal
+from apps.api.app.schemas import RuleRunScope
+from apps.api.app.services.change_detection import (
+    file_hash,
+    load_row_hashes,
+    row_hash,
+    source_unchanged,
+)
+from apps.api.app.services.coalescing import rule_run_queued_ahead, running_sync_job
+from apps.api.app.services.compaction import compact_rule_runs
+from apps.api.app.services.dedupe import find_duplicate_students
+from apps.api.app.services.json_stream import batched, iter_json_records
+from apps.api.app.services.locks import Lease, try_capacity_slot, try_district_lease
+from apps.api.app.services.rule_scope import (
+    parse_scope,
+    rule_scope_filters,
+    student_scope_filters,
+)
+from apps.api.app.services.run_metrics import RuleMetrics, RunMetricsRecorder
+from apps.api.app.services.scheduling import due_nightly_syncs
+from apps.api.app.services.schools import SchoolResolver
+from apps.api.app.services.snapshots import export_student_snapshot
+from apps.api.app.services.student_columns import STUDENT_COLUMNS, iter_student_column_batches
 from apps.api.app.services.students import upsert_student
 
 from .app import app
+from .connectors import fetch_powerschool_students
+from .pipeline import StagedPipeline
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_POWERSCHOOL_EXTRACT = (
+    Path(__file__).resolve().parents[3] / "samples" / "powerschool" / "students.json"
+)
 
 
 @app.task(name="worker.tasks.heartbeat")
@@ -41,45 +80,172 @@ def heartbeat() -> dict[str, str]:
     return {"status": "alive", "timestamp": datetime.now(tz=timezone.utc).isoformat()}
 
 
-@app.task(name="worker.tasks.process_rule_run")
-def process_rule_run(rule_run_id: str) -> dict[str, Any]:
+@app.task(name="worker.tasks.process_rule_run", bind=True)
+def process_rule_run(self: Task, rule_run_id: str) -> dict[str, Any]:
     """Execute a rule run for the given identifier."""
 
     session: Session = SessionLocal()
+    metrics: RunMetricsRecorder | None = None
+    plan_stats = PlanStats()
+    lease: Lease | None = None
+    slot: Lease | None = None
     try:
         rule_run = session.get(RuleRun, UUID(rule_run_id))
         if rule_run is None:
             return {"status": "not_found", "rule_run_id": rule_run_id}
 
+        lease = try_district_lease(session.get_bind(), "rules", rule_run.district_id)
+        acquired, slot = _acquire_capacity(session) if lease is not None else (False, None)
+        if not acquired:
+            # Another run is writing results for this district, or every worker-wide
+            # slot is busy. An equivalent run queued earlier will cover this one;
+            # otherwise try again once the lease or a slot is free.
+            ahead = rule_run_queued_ahead(session, rule_run)
+            if ahead is not None:
+                rule_run.status = RuleRunStatusEnum.success
+                rule_run.finished_at = datetime.utcnow()
+                rule_run.coalesced_into_id = ahead.id
+                session.commit()
+                return {
+                    "status": "coalesced",
+                    "rule_run_id": rule_run_id,
+                    "coalesced_into": str(ahead.id),
+                }
+            # Keeps this run live for rule_run_queued_ahead while it waits.
+            rule_run.updated_at = datetime.utcnow()
+            session.commit()
+            countdown = get_settings().district_lock_retry_seconds
+            self.apply_async(
+                (rule_run_id,), countdown=countdown, **_requeue_options(self.request)
+            )
+            return {"status": "deferred", "rule_run_id": rule_run_id, "retry_in": countdown}
+
         rule_run.status = RuleRunStatusEnum.running
         rule_run.started_at = datetime.utcnow()
         session.commit()
         session.refresh(rule_run)
 
-        rules = _load_rules(session, rule_run)
-        violations_created = 0
-
-        for rule in rules:
-            violations_created += _apply_rule(session, rule_run, rule)
+        scope = parse_scope(rule_run.scope)
+        rules = _load_rules(session, rule_run, scope)
+        plan = RulePlan(rules)
+        metrics = RunMetricsRecorder(
+            rules=[RuleMetrics(code=rule.code, rule_version_id=rule.version_id) for rule in rules],
+            include_children=get_settings().rule_eval_workers > 1,
+        )
+        evidence = [evidence_fields(rule.dsl) for rule in rules]
+        fields: set[str] | None = None
+        if all(root is not None for root in plan.roots) and None not in evidence:
+            fields = set(plan.columns()).union(*evidence)
+        settings = get_settings()
+
+        with ExitStack() as stack:
+            evaluator: RulePlan | ParallelPlan = plan
+            if settings.rule_eval_workers > 1:
+                evaluator = stack.enter_context(
+                    ParallelPlan(
+                        plan,
+                        settings.rule_eval_workers,
+                        min_chunk_rows=_parallel_chunk_rows(settings),
+                    )
+                )
+            batches = iter_student_column_batches(
+                session,
+                rule_run.district_id,
+                fields,
+                student_scope_filters(scope),
+                batch_size=settings.rule_fetch_batch_size,
+            )
+            for columns in metrics.fetched(batches):
+                metrics.rows_scanned += row_count(columns)
+                with metrics.phase("evaluate"):
+                    violations = evaluator.evaluate(columns, plan_stats)
+                for rule, rule_metrics, rule_evidence, indices in zip(
+                    rules, metrics.rules, evidence, violations, strict=True
+                ):
+                    lease.check()
+                    started = time.perf_counter()
+                    rule_metrics.violations += _record_violations(
+                        session, rule_run, rule, rule_evidence, columns, indices
+                    )
+                    elapsed = time.perf_counter() - started
+                    rule_metrics.write_seconds += elapsed
+                    metrics.write_seconds += elapsed
+        lease.check()
+        with metrics.phase("write"):
+            session.commit()
 
         rule_run.status = RuleRunStatusEnum.success
         rule_run.finished_at = datetime.utcnow()
+        rule_run.metrics = metrics.as_dict(plan_stats.as_dict())
         session.commit()
-        return {"status": "success", "rule_run_id": rule_run_id, "violations": violations_created}
+        logger.info(
+            "Rule run %s evaluated %d rule(s) as %d plan node(s), %d shared, over %d row(s)",
+            rule_run_id,
+            len(rules),
+            len(plan.nodes),
+            plan.shared_nodes,
+            metrics.rows_scanned,
+        )
+        return {
+            "status": "success",
+            "rule_run_id": rule_run_id,
+            "violations": rule_run.metrics["violations"],
+            "rows_scanned": metrics.rows_scanned,
+            "plan": plan_stats.as_dict(),
+        }
     except Exception:  # pragma: no cover - defensive logging branch
         session.rollback()
         rule_run = session.get(RuleRun, UUID(rule_run_id))
         if rule_run:
             rule_run.status = RuleRunStatusEnum.failed
             rule_run.finished_at = datetime.utcnow()
+            if metrics is not None:
+                rule_run.metrics = metrics.as_dict(plan_stats.as_dict())
             session.commit()
         raise
     finally:
+        for held in (slot, lease):
+            if held is not None:
+                held.release()
         session.close()
 
 
-def _load_rules(session: Session, rule_run: RuleRun) -> list[RuleDefinition]:
-    query = select(RuleVersion).where(RuleVersion.enabled.is_(True))
+def _parallel_chunk_rows(settings: AppSettings) -> int:
+    """Chunk threshold small enough that a full fetch batch reaches every worker."""
+
+    per_worker = settings.rule_fetch_batch_size // settings.rule_eval_workers
+    return max(min(settings.rule_eval_min_chunk_rows, per_worker), 1)
+
+
+def _requeue_options(request: Context) -> dict[str, Any]:
+    """Queue and priority of the message being handled, for re-queueing a deferred task.
+
+    Without them the copy would follow ``task_routes``, so an interactive run would
+    drop back to its default queue. A direct call has no delivery info and keeps the
+    default routing. Every queue is bound with its own name as routing key.
+    """
+
+    delivery_info = request.delivery_info or {}
+    options: dict[str, Any] = {}
+    if delivery_info.get("routing_key"):
+        options["queue"] = delivery_info["routing_key"]
+    if delivery_info.get("priority") is not None:
+        options["priority"] = delivery_info["priority"]
+    return options
+
+
+def _acquire_capacity(session: Session) -> tuple[bool, Lease | None]:
+    """Take a worker-wide slot; ``(False, None)`` when all ``max_concurrent_jobs`` are busy."""
+
+    limit = get_settings().max_concurrent_jobs
+    if limit <= 0:
+        return True, None
+    slot = try_capacity_slot(session.get_bind(), limit)
+    return slot is not None, slot
+
+
+def _load_rules(session: Session, rule_run: RuleRun, scope: RuleRunScope) -> list[RuleDefinition]:
+    query = select(RuleVersion).where(RuleVersion.enabled.is_(True), *rule_scope_filters(scope))
     if rule_run.rule_version_id:
         query = query.where(RuleVersion.id == rule_run.rule_version_id)
     else:
@@ -96,101 +262,207 @@ def _load_rules(session: Session, rule_run: RuleRun) -> list[RuleDefinition]:
                 code=rv.code,
                 description=rv.title,
                 severity=RuleSeverity(rv.severity.value),
+                version_id=str(rv.id),
                 predicate=predicate,
+                dsl=rv.dsl or {},
             )
         )
     return definitions
 
 
 def _compile_predicate(rule_version: RuleVersion):
-    dsl = rule_version.dsl or {}
-    rule_type = dsl.get("type")
+    """Compile a stored rule, failing the run on a DSL it cannot evaluate.
 
-    if rule_type == "grade_range":
-        min_grade = dsl.get("min", 0)
-        max_grade = dsl.get("max", 12)
+    Rules saved before creation was validated may hold reference or unknown types,
+    which would otherwise pass every record and hide their violations, or evidence
+    that names no student column.
+    """
 
-        def predicate(record: dict[str, Any]) -> bool:
-            grade = record.get("grade_level")
-            return grade is not None and min_grade <= grade <= max_grade
+    try:
+        validate_dsl(rule_version.dsl, fields=STUDENT_COLUMNS)
+    except DslError as exc:
+        raise DslError(f"Rule {rule_version.code} ({rule_version.id}): {exc}") from exc
+    return compile_dsl(rule_version.dsl).test
+
+
+def _record_violations(
+    session: Session,
+    rule_run: RuleRun,
+    rule: RuleDefinition,
+    evidence: tuple[str, ...] | None,
+    columns: dict[str, np.ndarray],
+    indices: np.ndarray,
+) -> int:
+    if not len(indices):
+        return 0
+    rule_version_id = UUID(rule.version_id) if rule.version_id else None
+    severity = RuleSeverityEnum(rule.severity.value)
+    rows: list[dict[str, Any]] = []
+    for violation in RecordBatch(columns).take(indices):
+        school_id = violation.get("school_id")
+        rows.append(
+            {
+                "rule_run_id": rule_run.id,
+                "rule_version_id": rule_version_id,
+                "district_id": rule_run.district_id,
+                "school_id": UUID(school_id) if school_id else None,
+                "entity_type": "Student",
+                "entity_id": UUID(violation["id"]),
+                "severity": severity,
+                "status": RuleResultStatusEnum.open,
+                "message": _build_violation_message(rule, violation),
+                "details": build_details(violation, evidence),
+            }
+        )
+    # Bulk insert keeps results out of the identity map, so memory stays flat per batch.
+    session.execute(insert(RuleResult), rows)
+    return len(rows)
 
-        return predicate
 
-    if rule_type == "enrollment_status":
-        required_status = dsl.get("required", "active")
+def _build_violation_message(rule: RuleDefinition, violation: Mapping[str, Any]) -> str:
+    if rule.code == "GRADE-RANGE":
+        grade = violation.get("grade_level")
+        return f"Grade level {grade} outside configured range"
+    if rule.code == "ENROLLMENT-STATUS":
+        status = violation.get("enrollment_status")
+        return f"Unexpected enrollment status: {status}"
+    return rule.description
 
-        def predicate(record: dict[str, Any]) -> bool:
-            return record.get("enrollment_status") == required_status
 
-        return predicate
+@app.task(name="worker.tasks.compact_rule_results")
+def compact_rule_results(retention_days: int | None = None) -> dict[str, Any]:
+    """Roll superseded rule runs past the retention horizon into summaries and archive them."""
 
-    # Fallback to always passing if rule type unknown.
-    return lambda record: True
+    settings = get_settings()
+    days = retention_days if retention_days is not None else settings.rule_result_retention_days
+    session: Session = SessionLocal()
+    try:
+        stats = compact_rule_runs(
+            session,
+            older_than=datetime.utcnow() - timedelta(days=days),
+            archive_root=Path(settings.rule_result_archive_dir),
+        )
+        return {"status": "success", **stats}
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
 
-def _apply_rule(session: Session, rule_run: RuleRun, rule: RuleDefinition) -> int:
-    students = list(
-        session.execute(
-            select(Student).where(Student.district_id == rule_run.district_id)
-        ).scalars()
-    )
-    student_dicts = [
-        {
-            "id": str(student.id),
-            "school_id": str(student.school_id),
-            "grade_level": student.grade_level,
-            "enrollment_status": student.enrollment_status,
-            "first_name": student.first_name,
-            "last_name": student.last_name,
-        }
-        for student in students
-    ]
+@app.task(name="worker.tasks.schedule_nightly_syncs")
+def schedule_nightly_syncs() -> dict[str, Any]:
+    """Queue the sync of every district whose nightly slot has passed (US-013).
+
+    Beat runs this every ``nightly_sync_tick_seconds``. Each sync is queued with a
+    ``SyncJob`` stamped with its slot, so later ticks do not queue it again.
+    """
 
-    violations = evaluate_rule(rule, student_dicts)
-
-    for violation in violations:
-        student_id = UUID(violation["id"])
-        school_uuid = UUID(violation["school_id"]) if violation.get("school_id") else None
-        message = _build_violation_message(rule, violation)
-        result = RuleResult(
-            rule_run_id=rule_run.id,
-            district_id=rule_run.district_id,
-            school_id=school_uuid,
-            entity_type="Student",
-            entity_id=student_id,
-            severity=RuleSeverityEnum(rule.severity.value),
-            status=RuleResultStatusEnum.open,
-            message=message,
-            details=violation,
+    session: Session = SessionLocal()
+    try:
+        jobs = [
+            (connector.district_id, SyncJob(connector_id=connector.id, scheduled_at=slot))
+            for connector, slot in due_nightly_syncs(session, datetime.utcnow())
+        ]
+        session.add_all(job for _, job in jobs)
+        session.commit()
+        for district_id, job in jobs:
+            sync_powerschool.apply_async((str(district_id),), {"sync_job_id": str(job.id)})
+        return {"status": "success", "dispatched": len(jobs)}
+    finally:
+        session.close()
+
+
+@app.task(name="worker.tasks.dedupe_students")
+def dedupe_students(district_id: str) -> dict[str, Any]:
+    """Queue likely duplicate students in the district for review (US-040)."""
+
+    settings = get_settings()
+    session: Session = SessionLocal()
+    try:
+        stats = find_duplicate_students(
+            session,
+            UUID(district_id),
+            min_score=settings.dedupe_min_score,
+            max_block_size=settings.dedupe_max_block_size,
+            batch_size=settings.rule_fetch_batch_size,
         )
-        session.add(result)
+        return {"status": "success", "district_id": district_id, **stats}
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
-    session.commit()
-    return len(violations)
 
+@app.task(name="worker.tasks.export_district_snapshot")
+def export_district_snapshot(district_id: str) -> dict[str, Any]:
+    """Export the district's students into a memory-mappable columnar snapshot."""
+
+    settings = get_settings()
+    session: Session = SessionLocal()
+    try:
+        directory = export_student_snapshot(
+            session, UUID(district_id), Path(settings.snapshot_dir)
+        )
+        return {"status": "success", "district_id": district_id, "path": str(directory)}
+    finally:
+        session.close()
 
-def _build_violation_message(rule: RuleDefinition, violation: dict[str, Any]) -> str:
-    if rule.code == "GRADE-RANGE":
-        grade = violation.get("grade_level")
-        return f"Grade level {grade} outside configured range"
-    if rule.code == "ENROLLMENT-STATUS":
-        status = violation.get("enrollment_status")
-        return f"Unexpected enrollment status: {status}"
-    return rule.description
 
+@app.task(name="worker.tasks.sync_powerschool", bind=True)
+def sync_powerschool(
+    self: Task, district_id: str, sync_job_id: str | None = None
+) -> dict[str, Any]:
+    """Sync students from the PowerSchool API or an extract file.
 
-@app.task(name="worker.tasks.sync_powerschool")
-def sync_powerschool(district_id: str) -> dict[str, Any]:
-    """Simulate a PowerSchool sync by loading local sample data."""
+    With ``powerschool_base_url`` set, pages are fetched through the rate-limited
+    connector pipeline. Otherwise the extract (the bundled sample by default) is
+    parsed, normalized and written by the threads of a ``StagedPipeline``. Either way,
+    rows are loaded in ``ingest_batch_size`` batches, each committed on this thread,
+    and the pipeline's stage metrics are stored on the ``SyncJob``. Scheduled syncs
+    pass the ``sync_job_id`` of their queued job; other syncs create one on start.
+    """
 
     session: Session = SessionLocal()
     started_at = datetime.utcnow()
     job: SyncJob | None = None
     batch: IngestBatch | None = None
+    lease: Lease | None = None
+    slot: Lease | None = None
     try:
         district = session.get(District, UUID(district_id))
         if district is None:
             return {"status": "not_found", "district_id": district_id}
+        if sync_job_id is not None:
+            job = session.get(SyncJob, UUID(sync_job_id))
+
+        lease = try_district_lease(session.get_bind(), "sync", district.id)
+        if lease is None:
+            # A sync for this district is already running and will pick up the same source.
+            running = running_sync_job(session, district.id)
+            if job is not None:
+                job.status = SyncStatusEnum.success
+                job.finished_at = datetime.utcnow()
+                job.metrics = {"coalesced_into": str(running.id) if running else None}
+                session.commit()
+                job = None
+            return {
+                "status": "coalesced",
+                "district_id": district_id,
+                "sync_job_id": str(running.id) if running else None,
+            }
+
+        acquired, slot = _acquire_capacity(session)
+        if not acquired:
+            countdown = get_settings().district_lock_retry_seconds
+            self.apply_async(
+                (district_id,),
+                {"sync_job_id": sync_job_id},
+                countdown=countdown,
+                **_requeue_options(self.request),
+            )
+            return {"status": "deferred", "district_id": district_id, "retry_in": countdown}
 
         source = session.execute(
             select(SourceSystem).where(
@@ -220,72 +492,154 @@ def sync_powerschool(district_id: str) -> dict[str, Any]:
             session.add(connector)
             session.commit()
 
-        job = SyncJob(
-            connector_id=connector.id,
-            status=SyncStatusEnum.running,
-            scheduled_at=started_at,
-            started_at=started_at,
-        )
-        session.add(job)
+        if job is None:
+            job = SyncJob(connector_id=connector.id, scheduled_at=started_at)
+            session.add(job)
+        job.status = SyncStatusEnum.running
+        job.started_at = started_at
         session.commit()
 
+        settings = get_settings()
+        api_mode = bool(settings.powerschool_base_url)
+        extract_path = Path(settings.powerschool_extract_path or SAMPLE_POWERSCHOOL_EXTRACT)
+        digest = None if api_mode else file_hash(extract_path)
+        unchanged_source = digest is not None and source_unchanged(
+            session,
+            district_id=district.id,
+            table_name="student",
+            digest=digest,
+            source_system_id=source.id,
+        )
+
         batch = IngestBatch(
             district_id=district.id,
             source_system_id=source.id,
             sync_job_id=job.id,
             table_name="student",
             status=IngestStatusEnum.pending,
+            source_hash=digest,
         )
         session.add(batch)
         session.commit()
 
-        sample_path = Path(__file__).resolve().parents[3] / "samples" / "powerschool" / "students.json"
-        data = json.loads(sample_path.read_text(encoding="utf-8"))
+        counts = {"written": 0, "unchanged": 0}
+
+        def write(prepared: list[tuple[dict[str, Any], str]]) -> None:
+            lease.check()
+            written = _write_powerschool_batch(session, district.id, prepared)
+            counts["written"] += written
+            counts["unchanged"] += len(prepared) - written
+            batch.rows_ingested = counts["written"]
+            session.commit()
 
-        rows = 0
-        for entry in data:
-            _upsert_student_from_dict(session, district.id, entry)
-            rows += 1
+        metrics = None
+        if api_mode:
+            metrics = fetch_powerschool_students(
+                settings, lambda entries: write(_prepare_powerschool_batch(entries))
+            )
+        elif not unchanged_source:
+            metrics = StagedPipeline(
+                batched(iter_json_records(extract_path), settings.ingest_batch_size),
+                _prepare_powerschool_batch,
+                write,
+                queue_size=settings.connector_queue_size,
+            ).run()
 
-        batch.rows_ingested = rows
         batch.status = IngestStatusEnum.success
-        connector.status = ConnectorStatusEnum.healthy
+        connector.status = (
+            ConnectorStatusEnum.degraded
+            if metrics and metrics.get("retries")
+            else ConnectorStatusEnum.healthy
+        )
         connector.last_sync_at = datetime.utcnow()
         job.status = SyncStatusEnum.success
+        job.metrics = metrics
         job.finished_at = datetime.utcnow()
         session.commit()
 
-        return {"status": "success", "rows_ingested": rows, "sync_job_id": str(job.id)}
-    except Exception:
+        return {
+            "status": "unchanged" if unchanged_source else "success",
+            "rows_ingested": counts["written"],
+            "rows_unchanged": counts["unchanged"],
+            "sync_job_id": str(job.id),
+        }
+    except Exception as exc:
         session.rollback()
         if job is not None:
             job.status = SyncStatusEnum.failed
+            job.error = str(exc)
             job.finished_at = datetime.utcnow()
+            job.connector.status = ConnectorStatusEnum.error
             session.commit()
         if batch is not None:
             batch.status = IngestStatusEnum.failed
             session.commit()
         raise
     finally:
+        for held in (slot, lease):
+            if held is not None:
+                held.release()
         session.close()
 
 
-def _upsert_student_from_dict(session: Session, district_id: UUID, payload: dict[str, Any]) -> None:
-    sis_id = payload["sis_id"]
-    grade_level = int(payload.get("grade_level", 0))
-    enrollment_status = payload.get("enrollment_status") or "active"
-    school_name = payload.get("school_name") or "North High School"
-    ell = payload.get("ell_status")
-    idea = payload.get("idea_flag")
-    upsert_student(
-        session,
-        district_id=district_id,
-        sis_id=sis_id,
-        first_name=payload.get("first_name", ""),
-        last_name=payload.get("last_name", ""),
-        grade_level=grade_level,
-        enrollment_status=enrollment_status,
-        school_name=school_name,
-        ell_status=bool(ell) if ell is not None else None,
-        idea_flag=bool(idea) if idea is not None else None,
-    )
+def _prepare_powerschool_batch(
+    entries: list[dict[str, Any]],
+) -> list[tuple[dict[str, Any], str]]:
+    """Normalize extract rows and hash them; runs off the writer thread."""
+
+    payloads = [_powerschool_payload(entry) for entry in entries]
+    return [(payload, row_hash(payload)) for payload in payloads]
+
+
+def _write_powerschool_batch(
+    session: Session, district_id: UUID, prepared: list[tuple[dict[str, Any], str]]
+) -> int:
+    """Upsert the new or changed rows of one prepared batch; return how many were written."""
+
+    sis_ids = (payload["sis_id"] for payload, _ in prepared)
+    known_hashes = load_row_hashes(session, district_id, sis_ids)
+    changed = [
+        (payload, payload_hash)
+        for payload, payload_hash in prepared
+        if known_hashes.get(payload["sis_id"]) != payload_hash
+    ]
+    schools = SchoolResolver(session, district_id)
+    schools.prefetch(payload["school_name"] for payload, _ in changed)
+    written = 0
+    for payload, payload_hash in changed:
+        if known_hashes.get(payload["sis_id"]) == payload_hash:
+            continue
+        upsert_student(
+            session,
+            district_id=district_id,
+            source_row_hash=payload_hash,
+            schools=schools,
+            **payload,
+        )
+        known_hashes[payload["sis_id"]] = payload_hash
+        written += 1
+    return written
+
+
+def _powerschool_payload(entry: dict[str, Any]) -> dict[str, Any]:
+    """Normalize a PowerSchool extract row into ``upsert_student`` keyword arguments."""
+
+    ell = entry.get("ell_status")
+    idea = entry.get("idea_flag")
+    payload = {
+        "sis_id": entry["sis_id"],
+        "first_name": entry.get("first_name", ""),
+        "last_name": entry.get("last_name", ""),
+        "grade_level": int(entry.get("grade_level", 0)),
+        "enrollment_status": entry.get("enrollment_status") or "active",
+        "school_name": entry.get("school_name") or "North High School",
+        "ell_status": bool(ell) if ell is not None else None,
+        "idea_flag": bool(idea) if idea is not None else None,
+    }
+    # Dedupe identifiers are only added when present, so row hashes of extracts
+    # without them stay unchanged.
+    if entry.get("state_id"):
+        payload["state_id"] = str(entry["state_id"])
+    if entry.get("birth_date"):
+        payload["birth_date"] = date.fromisoformat(entry["birth_date"])
+    return payload
@@ -0,0 +1,162 @@
+"""Benchmark the student dedupe engine on a synthetic district (US-040).
+
+Usage: python -m benchmarks.dedupe [--sizes 100000 500000] [--duplicate-rate 0.02]
+       [--repeat 3] [--output results.json] [--baseline previous.json] [--threshold 0.2]
+
+Each run generates ``size`` students and then re-enters ``duplicate-rate`` of them as
+duplicates. Each duplicate gets one edit: a new SIS id with a padded copy of the
+original, a one-letter typo in the last or first name, or the day and month of birth
+swapped. Some duplicates keep the original state id. The report covers latency and
+throughput, the pairs compared against the naive n²/2, and recall and precision
+against the injected duplicates.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from apps.api.app.services.dedupe import DedupeEngine
+
+from .results import compare, load_results, report, summarize, write_results
+
+LAST_SYLLABLES = np.array(
+    ["GAR", "CIA", "SMI", "TH", "NGU", "YEN", "JOHN", "SON", "MIL", "LER", "BRO", "WN", "DAV",
+     "IS", "LO", "PEZ", "WIL", "LI", "AMS", "HER", "NAN", "DEZ", "KO", "WAL", "SKI", "PA", "TEL"]
+)
+FIRST_SYLLABLES = np.array(
+    ["LI", "AM", "O", "LIV", "NO", "AH", "EM", "MA", "TE", "A", "VA", "E", "JAH", "SO", "PHI",
+     "LU", "CAS", "MI", "IR", "BEL", "ETH", "AN", "ZO", "GAN", "KA", "DI", "E", "GO", "PRI", "YA",
+     "FA", "TI", "HAN", "NAH", "KAI", "RO", "SA", "BEN", "JA", "XI"]
+)
+
+
+def synthetic_students(size: int, duplicate_rate: float, seed: int = 11) -> tuple[dict, set]:
+    """Columns shaped like ``DEDUPE_FIELDS`` and the set of true duplicate pairs."""
+
+    rng = np.random.default_rng(seed)
+    originals = int(size / (1 + duplicate_rate))
+    syllables = rng.integers(0, len(LAST_SYLLABLES), size=(originals, 3))
+    lengths = rng.integers(2, 4, size=originals)
+    last = np.array(
+        [
+            "".join(LAST_SYLLABLES[row[:length]]).title()
+            for row, length in zip(syllables, lengths, strict=True)
+        ]
+    )
+    first = np.array(
+        [
+            "".join(FIRST_SYLLABLES[row]).title()
+            for row in rng.integers(0, len(FIRST_SYLLABLES), size=(originals, 2))
+        ]
+    )
+    born = np.datetime64("2006-01-01") + rng.integers(0, 13 * 365, size=originals).astype("m8[D]")
+    born[rng.random(originals) < 0.02] = np.datetime64("NaT")
+    sis = np.array([f"S{index:07d}" for index in range(originals)])
+    state = np.where(
+        rng.random(originals) < 0.6,
+        np.array([f"ST{index:08d}" for index in range(originals)]),
+        "",
+    )
+
+    sources = rng.choice(originals, size=size - originals, replace=False)
+    edits = rng.integers(0, 4, size=len(sources))
+    dup_last, dup_first = last[sources].copy(), first[sources].copy()
+    dup_born, dup_state = born[sources].copy(), state[sources].copy()
+    dup_sis = np.array([f"D{index:07d}" for index in range(len(sources))])
+    for index, edit in enumerate(edits):
+        if edit == 0:
+            dup_sis[index] = "00" + sis[sources[index]]
+        elif edit == 1:
+            dup_last[index] = _typo(dup_last[index], rng)
+        elif edit == 2:
+            dup_first[index] = _typo(dup_first[index], rng)
+        else:
+            dup_born[index] = _swap_day_month(dup_born[index])
+    # Re-entered records often miss the state id the original had.
+    dup_state[rng.random(len(sources)) < 0.5] = ""
+
+    columns = {
+        "id": np.arange(size).astype(str),
+        "sis_id": np.concatenate([sis, dup_sis]),
+        "state_id": np.concatenate([state, dup_state]),
+        "first_name": np.concatenate([first, dup_first]),
+        "last_name": np.concatenate([last, dup_last]),
+        "birth_date": np.concatenate([born, dup_born]),
+    }
+    truth = {(int(source), originals + index) for index, source in enumerate(sources)}
+    return columns, truth
+
+
+def _typo(name: str, rng: np.random.Generator) -> str:
+    position = int(rng.integers(1, len(name)))
+    return name[:position] + "aeiou"[int(rng.integers(0, 5))] + name[position + 1 :]
+
+
+def _swap_day_month(value: np.datetime64) -> np.datetime64:
+    if np.isnat(value):
+        return value
+    year, month, day = (int(part) for part in str(value).split("-"))
+    if day > 12:
+        return value
+    return np.datetime64(f"{year:04d}-{day:02d}-{month:02d}")
+
+
+def dedupe(columns: dict[str, np.ndarray], truth: set, repeat: int) -> list[dict[str, Any]]:
+    size = len(columns["sis_id"])
+    durations, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = DedupeEngine(columns).run()
+        durations.append(time.perf_counter() - started)
+
+    found = set(zip(result.left.tolist(), result.right.tolist(), strict=True))
+    true_positives = len(found & truth)
+    quality = {
+        "scenario": f"quality@{size}",
+        "rows": size,
+        "duplicates": len(truth),
+        "recall": round(true_positives / len(truth), 4) if truth else None,
+        "precision": round(true_positives / len(found), 4) if found else None,
+        "pair_reduction": round(
+            result.stats["naive_pairs"] / max(result.stats["candidate_pairs"], 1)
+        ),
+        **result.stats,
+    }
+    return [summarize(f"dedupe@{size}", durations, size), quality]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--duplicate-rate", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed iterations per size.")
+    parser.add_argument("--output", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous results file.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative change.")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        columns, truth = synthetic_students(size, args.duplicate_rate)
+        results.extend(dedupe(columns, truth, args.repeat))
+        del columns
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        write_results(args.output, results, benchmark="dedupe", repeat=args.repeat)
+    if args.baseline:
+        regressions = compare(
+            results,
+            load_results(args.baseline),
+            metrics=("p95_ms", "rows_per_s", "candidate_pairs"),
+            threshold=args.threshold,
+        )
+        report(regressions, len(results))
+
+
+if __name__ == "__main__":
+    main()
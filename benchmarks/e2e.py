@@ -0,0 +1,295 @@
+"""End-to-end API benchmarks over a synthetic district.
+
+Usage: python -m benchmarks.e2e [--schools 5] [--students 2000] [--iterations 5]
+       [--sync-rows 2000] [--database-url URL] [--output results.json]
+       [--baseline previous.json]
+
+Generates a district with ``generate_synthetic`` and drives the API in process through
+``TestClient``: CSV import, PowerSchool sync, rule runs, readiness, exception export
+and evidence packets. Celery tasks run inline, so timings cover the worker code too.
+``powerschool_sync`` writes an extract with every row changed before each iteration,
+so it times the row-diff write path; ``powerschool_sync_unchanged`` re-syncs the same
+extract and times the unchanged-file short-circuit. Each scenario reports p50/p95
+latency and throughput. With ``--baseline`` the run exits non-zero when a scenario's
+p95 grew by more than ``--threshold``.
+
+The default in-memory SQLite database keeps runs self-contained; pass a PostgreSQL
+``--database-url`` (with the schema migrated) for numbers comparable to production.
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import ExceptionRecord, ExceptionStatusEnum, RuleResult
+from apps.api.app.db.session import get_session
+from apps.api.app.main import create_app
+from apps.api.app.routers import evidence as evidence_router
+from apps.api.app.services.synthetic import SyntheticSpec, generate_synthetic
+from apps.worker.worker import tasks as worker_tasks
+from packages.shared.shared.config import get_settings
+
+from .results import compare, load_results, report, summarize, write_results
+
+CSV_MAPPING = {
+    "sis_id": "student_id",
+    "first_name": "first",
+    "last_name": "last",
+    "grade_level": "grade",
+    "school_name": "school",
+    "enrollment_status": "status",
+}
+
+
+class Harness:
+    """A test client bound to one synthetic district, with tasks executed inline."""
+
+    def __init__(self, args: argparse.Namespace, storage: Path) -> None:
+        if args.database_url:
+            engine = create_engine(args.database_url, future=True)
+        else:
+            engine = create_engine(
+                "sqlite+pysqlite:///:memory:",
+                future=True,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+            Base.metadata.create_all(engine)
+        self.sessions = sessionmaker(
+            bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
+        )
+
+        worker_tasks.SessionLocal = self.sessions
+        for task in (worker_tasks.process_rule_run, worker_tasks.sync_powerschool):
+            task.apply_async = _eager(task)
+        evidence_router.STORAGE_ROOT = storage
+        self.storage = storage
+
+        app = create_app()
+        app.dependency_overrides[get_session] = self._session
+        self.client = TestClient(app)
+
+        spec = SyntheticSpec(
+            schools_per_district=args.schools,
+            students_per_school=args.students,
+            seed=args.seed,
+            name_prefix=f"Bench {uuid4().hex[:6]}",
+        )
+        with self.sessions() as session:
+            self.district = generate_synthetic(session, spec)[0]
+            self.school_name = f"{spec.name_prefix} District 1 School 1"
+        self.headers = {"Authorization": f"Bearer {self.district.api_token}"}
+        self.exception_ids: list[str] = []
+
+    def _session(self):
+        session = self.sessions()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def request(self, method: str, url: str, expected: int, **kwargs: Any):
+        response = self.client.request(method, url, headers=self.headers, **kwargs)
+        if response.status_code != expected:
+            raise RuntimeError(f"{method} {url} returned {response.status_code}: {response.text}")
+        return response
+
+    def open_exceptions(self, limit: int) -> None:
+        """Open exceptions for the first violations so exports and packets have content."""
+
+        with self.sessions() as session:
+            result_ids = session.execute(
+                select(RuleResult.id)
+                .where(RuleResult.district_id == self.district.district_id)
+                .limit(limit)
+            ).scalars().all()
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "id": uuid4(),
+                    "district_id": self.district.district_id,
+                    "rule_result_id": result_id,
+                    "status": ExceptionStatusEnum.open,
+                    "rationale": "Benchmark exception",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for result_id in result_ids
+            ]
+            if rows:
+                session.execute(insert(ExceptionRecord), rows)
+                session.commit()
+        self.exception_ids = [str(row["id"]) for row in rows]
+
+
+def _eager(task):
+    return lambda args=(), kwargs=None, **options: task.apply(args, kwargs, throw=True)
+
+
+def csv_payload(rows: int, school_name: str) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(CSV_MAPPING.values()))
+    writer.writeheader()
+    for index in range(rows):
+        writer.writerow(
+            {
+                "student_id": f"CSV-{index:07d}",
+                "first": "Import",
+                "last": f"Student{index}",
+                "grade": index % 13,
+                "school": school_name,
+                "status": "active",
+            }
+        )
+    return buffer.getvalue().encode("utf-8")
+
+
+def write_extract(path: Path, rows: int, school_name: str, version: int) -> None:
+    """Write a PowerSchool extract whose grades all differ from the previous ``version``."""
+
+    records = [
+        {
+            "sis_id": f"PS-{index:07d}",
+            "first_name": "Sync",
+            "last_name": f"Student{index}",
+            "grade_level": (index + version) % 13,
+            "school_name": school_name,
+            "enrollment_status": "active",
+        }
+        for index in range(rows)
+    ]
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+# Name, timed call, rows per call, and an untimed call made before each timed one.
+Scenario = tuple[str, Callable[[], Any], int | None, Callable[[], Any] | None]
+
+
+def scenarios(harness: Harness, args: argparse.Namespace) -> list[Scenario]:
+    payload = csv_payload(args.csv_rows, harness.school_name)
+    students = args.schools * args.students
+    extract = harness.storage / "powerschool.json"
+    versions = itertools.count()
+
+    def change_extract() -> None:
+        write_extract(extract, args.sync_rows, harness.school_name, next(versions))
+        get_settings().powerschool_extract_path = str(extract)
+
+    def csv_import() -> None:
+        harness.request(
+            "POST",
+            "/import/students/csv",
+            202,
+            files={"file": ("students.csv", payload, "text/csv")},
+            data={"mapping": json.dumps(CSV_MAPPING)},
+        )
+
+    def powerschool_sync() -> None:
+        harness.request("POST", "/connectors/powerschool/sync", 202)
+
+    def rule_run() -> None:
+        harness.request("POST", "/rules/runs", 202, json={"initiated_by": "benchmark"})
+
+    def readiness() -> None:
+        harness.request("GET", "/readiness", 200)
+
+    def exports() -> None:
+        harness.request("GET", "/exports/exceptions.csv", 200)
+
+    def evidence_packet() -> None:
+        harness.request(
+            "POST",
+            "/evidence/packets",
+            201,
+            json={"name": "Benchmark packet", "exception_ids": harness.exception_ids},
+        )
+
+    return [
+        ("csv_import", csv_import, args.csv_rows, None),
+        ("powerschool_sync", powerschool_sync, args.sync_rows, change_extract),
+        ("powerschool_sync_unchanged", powerschool_sync, None, None),
+        ("rule_run", rule_run, students, None),
+        ("readiness", readiness, None, None),
+        ("exports", exports, args.exceptions, None),
+        ("evidence_packet", evidence_packet, args.exceptions, None),
+    ]
+
+
+def measure(
+    name: str,
+    run: Callable[[], Any],
+    rows: int | None,
+    iterations: int,
+    prepare: Callable[[], Any] | None = None,
+) -> dict[str, Any]:
+    # Warm-up: first-call imports, query compilation and cache fills.
+    if prepare is not None:
+        prepare()
+    run()
+    durations = []
+    for _ in range(iterations):
+        if prepare is not None:
+            prepare()
+        started = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - started)
+    return summarize(name, durations, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schools", type=int, default=5, help="Schools in the district.")
+    parser.add_argument("--students", type=int, default=2000, help="Students per school.")
+    parser.add_argument("--csv-rows", type=int, default=500, help="Rows per CSV upload.")
+    parser.add_argument("--sync-rows", type=int, default=2000, help="Rows per sync extract.")
+    parser.add_argument("--exceptions", type=int, default=50, help="Exceptions to export.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenario", action="append", help="Run only the named scenario(s).")
+    parser.add_argument("--database-url", help="Benchmark against this database instead.")
+    parser.add_argument("--output", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous results file.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p95 growth.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as storage:
+        harness = Harness(args, Path(storage))
+        harness.request("POST", "/rules/runs", 202, json={"initiated_by": "benchmark"})
+        harness.open_exceptions(args.exceptions)
+        results = [
+            measure(name, run, rows, args.iterations, prepare)
+            for name, run, rows, prepare in scenarios(harness, args)
+            if not args.scenario or name in args.scenario
+        ]
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        write_results(
+            args.output,
+            results,
+            benchmark="e2e",
+            students=args.schools * args.students,
+            iterations=args.iterations,
+        )
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), threshold=args.threshold)
+        report(regressions, len(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Summaries, JSON result files and baseline comparison shared by the benchmarks.
+
+Usage: python -m benchmarks.results CURRENT.json BASELINE.json [--metric p95_ms]
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile; stable for the small sample sizes benchmarks use."""
+
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(
+    name: str, durations: Sequence[float], rows: int | None = None, *, unit: str = "rows"
+) -> dict[str, Any]:
+    """Latency percentiles in milliseconds plus throughput for one scenario.
+
+    ``rows`` is the number of ``unit`` items each iteration processed; scenarios
+    without a count report operations per second only.
+    """
+
+    total = sum(durations)
+    summary: dict[str, Any] = {
+        "scenario": name,
+        "iterations": len(durations),
+        "p50_ms": round(percentile(durations, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 2),
+        "max_ms": round(max(durations) * 1000, 2),
+        "mean_ms": round(total / len(durations) * 1000, 2),
+        "ops_per_s": round(len(durations) / total, 2) if total else None,
+    }
+    if rows is not None:
+        summary[unit] = rows
+        summary[f"{unit}_per_s"] = round(rows * len(durations) / total, 1) if total else None
+    return summary
+
+
+def write_results(path: Path, results: list[dict[str, Any]], **meta: Any) -> None:
+    document = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **meta,
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> dict[str, dict[str, Any]]:
+    """Results of a previous run keyed by scenario name."""
+
+    document = json.loads(path.read_text(encoding="utf-8"))
+    return {result["scenario"]: result for result in document["results"]}
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    *,
+    metrics: Sequence[str] = ("p95_ms",),
+    threshold: float = 0.2,
+) -> list[str]:
+    """Describe scenarios that got worse than the baseline by more than ``threshold``.
+
+    Metrics ending in ``_per_s`` regress when they fall; all others when they grow.
+    Scenarios or metrics missing from either side are skipped.
+    """
+
+    regressions = []
+    for result in results:
+        previous_result = baseline.get(result["scenario"], {})
+        for metric in metrics:
+            previous, current = previous_result.get(metric), result.get(metric)
+            if not previous or current is None:
+                continue
+            change = (current - previous) / previous
+            worse = -change if metric.endswith("_per_s") else change
+            if worse > threshold:
+                regressions.append(
+                    f"{result['scenario']}: {metric} {previous} -> {current} ({change:+.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("current", type=Path)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("--metric", action="append", help="Metric to compare (default p95_ms).")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative change.")
+    args = parser.parse_args()
+
+    current = list(load_results(args.current).values())
+    regressions = compare(
+        current,
+        load_results(args.baseline),
+        metrics=args.metric or ("p95_ms",),
+        threshold=args.threshold,
+    )
+    report(regressions, len(current))
+
+
+def report(regressions: list[str], scenarios: int) -> None:
+    """Print regressions and exit non-zero if there were any."""
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions across {scenarios} scenario(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Micro-benchmarks for the rules package: evaluation, plan compilation and memory.
+
+Usage: python -m benchmarks.rules_eval [--sizes 10000 100000 1000000] [--repeat 5]
+       [--output results.json] [--baseline previous.json] [--threshold 0.2]
+
+For each record count the suite times a single-rule ``RulePlan`` per DSL rule type,
+the combined plan over all of them, and reports the memory per record of the columns
+plus the ``tracemalloc`` peak of evaluating the combined plan. Compile time is
+measured for a plan of ``--compile-rules`` DSL documents. ``--sizes 10000000`` is
+supported but needs roughly 1.5 GiB of memory.
+
+Results are comparable with ``python -m benchmarks.results CURRENT BASELINE``. With
+``--baseline`` the run itself fails when p95 latency or bytes per record grew, or
+throughput fell, by more than ``--threshold``.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from packages.rules.rules.models import RuleDefinition
+from packages.rules.rules.plan import RulePlan
+
+from .results import compare, load_results, report, summarize, write_results
+
+STATUSES = np.array(["active", "withdrawn", "transferred"])
+
+RULE_TYPES: dict[str, dict[str, Any]] = {
+    "grade_range": {"type": "grade_range", "min": 0, "max": 12},
+    "enrollment_status": {"type": "enrollment_status", "required": "active"},
+    "eq": {"type": "eq", "field": "enrollment_status", "value": "withdrawn"},
+    "in": {"type": "in", "field": "grade_level", "values": [9, 10, 11, 12]},
+    "range": {"type": "range", "field": "grade_level", "min": 6},
+    "flag": {"type": "flag", "field": "ell_status"},
+    "not_null": {"type": "not_null", "field": "enrollment_end"},
+    "within": {
+        "type": "within",
+        "field": "reported_on",
+        "start": "enrollment_start",
+        "end": "enrollment_end",
+    },
+    "all": {
+        "type": "all",
+        "of": [{"type": "grade_range"}, {"type": "flag", "field": "idea_flag", "value": False}],
+    },
+    "any": {
+        "type": "any",
+        "of": [{"type": "enrollment_status"}, {"type": "flag", "field": "ell_status"}],
+    },
+    "not": {"type": "not", "of": {"type": "flag", "field": "idea_flag"}},
+    "where": {
+        "type": "range",
+        "field": "grade_level",
+        "min": 9,
+        "where": {"type": "eq", "field": "enrollment_status", "value": "active"},
+    },
+}
+
+
+def rule(code: str, dsl: dict[str, Any]) -> RuleDefinition:
+    return RuleDefinition(code=code, description=code, dsl=dsl)
+
+
+def student_columns(rows: int, seed: int = 7) -> dict[str, np.ndarray]:
+    """Columns shaped like the projected student fetch, with some nulls and violations."""
+
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2023-08-15") + rng.integers(0, 400, size=rows).astype("m8[D]")
+    end = start + rng.integers(30, 700, size=rows).astype("m8[D]")
+    end[rng.random(rows) < 0.8] = np.datetime64("NaT")
+    return {
+        "grade_level": rng.integers(-1, 15, size=rows, dtype=np.int16),
+        "enrollment_status": STATUSES[rng.integers(0, len(STATUSES), size=rows)],
+        "ell_status": rng.random(rows) < 0.1,
+        "idea_flag": rng.random(rows) < 0.14,
+        "enrollment_start": start,
+        "enrollment_end": end,
+        "reported_on": np.full(rows, np.datetime64("2024-10-01"), dtype="M8[D]"),
+    }
+
+
+def timed(run: Callable[[], Any], repeat: int) -> list[float]:
+    run()  # warm-up
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def evaluation(columns: dict[str, np.ndarray], repeat: int) -> list[dict[str, Any]]:
+    rows = len(columns["grade_level"])
+    results = []
+    for name, dsl in RULE_TYPES.items():
+        plan = RulePlan([rule(name, dsl)])
+        durations = timed(lambda plan=plan: plan.evaluate(columns), repeat)
+        results.append(summarize(f"eval:{name}@{rows}", durations, rows))
+    combined = RulePlan([rule(name, dsl) for name, dsl in RULE_TYPES.items()])
+    results.append(
+        summarize(f"eval:all_rules@{rows}", timed(lambda: combined.evaluate(columns), repeat), rows)
+    )
+    return results
+
+
+def memory(columns: dict[str, np.ndarray]) -> dict[str, Any]:
+    """Column bytes plus the evaluation peak, per record, for the combined plan."""
+
+    rows = len(columns["grade_level"])
+    plan = RulePlan([rule(name, dsl) for name, dsl in RULE_TYPES.items()])
+    gc.collect()
+    tracemalloc.start()
+    plan.evaluate(columns)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    column_bytes = sum(values.nbytes for values in columns.values())
+    return {
+        "scenario": f"memory@{rows}",
+        "rows": rows,
+        "column_bytes_per_row": round(column_bytes / rows, 1),
+        "eval_peak_bytes_per_row": round(peak / rows, 1),
+        "bytes_per_row": round((column_bytes + peak) / rows, 1),
+    }
+
+
+def compilation(rule_count: int, repeat: int) -> dict[str, Any]:
+    """Compile ``rule_count`` DSL documents into one plan; bounds vary so few nodes dedupe."""
+
+    documents = list(RULE_TYPES.values())
+    rules = []
+    for index in range(rule_count):
+        dsl = {**documents[index % len(documents)]}
+        if dsl["type"] in ("grade_range", "range"):
+            dsl["min"] = index % 7
+        rules.append(rule(f"R{index}", dsl))
+    durations = timed(lambda: RulePlan(rules), repeat)
+    return summarize(f"compile:{rule_count}_rules", durations, rule_count, unit="rules")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed iterations per scenario.")
+    parser.add_argument("--compile-rules", type=int, default=200)
+    parser.add_argument("--output", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous results file.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative change.")
+    args = parser.parse_args()
+
+    results = [compilation(args.compile_rules, args.repeat)]
+    for size in args.sizes:
+        columns = student_columns(size)
+        results.extend(evaluation(columns, args.repeat))
+        results.append(memory(columns))
+        del columns
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        write_results(args.output, results, benchmark="rules_eval", repeat=args.repeat)
+    if args.baseline:
+        regressions = compare(
+            results,
+            load_results(args.baseline),
+            metrics=("p95_ms", "rows_per_s", "rules_per_s", "bytes_per_row"),
+            threshold=args.threshold,
+        )
+        report(regressions, len(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare peak memory of dict records and columnar record batches during rule evaluation.
+
+Usage: python -m benchmarks.rules_memory [--rows 1000000]
+
+Both scenarios start from the same synthetic student columns, evaluate the grade range
+rule and build the serialized details of every violation. The reported
+``tracemalloc`` peak covers the record representation, evaluation and serialization,
+but not the shared source columns.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable
+
+import numpy as np
+
+from packages.rules.rules.dsl import compile_dsl
+from packages.rules.rules.evaluator import evaluate_rule, evaluate_rule_columns
+from packages.rules.rules.models import RuleDefinition
+from packages.rules.rules.records import RecordBatch
+from packages.rules.rules.snapshot import string_column
+
+DSL = {"type": "grade_range", "min": 0, "max": 12}
+RULE = RuleDefinition(
+    code="GRADE-RANGE", description="Grade range", predicate=compile_dsl(DSL).test, dsl=DSL
+)
+STATUSES = ["active", "withdrawn", "transferred"]
+
+
+def source_columns(rows: int) -> dict[str, np.ndarray]:
+    """Columns as delivered by the projected student fetch; built outside the trace."""
+
+    rng = np.random.default_rng(7)
+    index = np.arange(rows)
+    school = str(uuid.uuid4())
+    return {
+        "id": string_column([str(uuid.uuid4()) for _ in range(rows)]),
+        "school_id": string_column([school] * rows),
+        "grade_level": rng.integers(0, 14, size=rows, dtype=np.int16),
+        "enrollment_status": string_column([STATUSES[i % 3] for i in range(rows)]),
+        "ell_status": index % 7 == 0,
+        "idea_flag": index % 11 == 0,
+    }
+
+
+def dict_records(columns: dict[str, np.ndarray]) -> int:
+    names = list(columns)
+    rows = zip(*(columns[name].tolist() for name in names), strict=True)
+    records = [dict(zip(names, row, strict=True)) for row in rows]
+    violations = evaluate_rule(RULE, records)
+    details = [dict(violation) for violation in violations]
+    return len(details)
+
+
+def record_batch(columns: dict[str, np.ndarray]) -> int:
+    batch = RecordBatch(columns)
+    violations = batch.take(evaluate_rule_columns(RULE, batch.columns))
+    details = violations.to_dicts()
+    return len(details)
+
+
+def measure(
+    name: str, scenario: Callable[[dict[str, np.ndarray]], int], columns: dict[str, np.ndarray]
+) -> dict[str, Any]:
+    rows = len(columns["id"])
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    violations = scenario(columns)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "scenario": name,
+        "rows": rows,
+        "violations": violations,
+        "peak_mib": round(peak / 2**20, 1),
+        "bytes_per_row": round(peak / rows, 1),
+        "seconds": round(elapsed, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic students.")
+    args = parser.parse_args()
+
+    columns = source_columns(args.rows)
+    results = [
+        measure("dict_records", dict_records, columns),
+        measure("record_batch", record_batch, columns),
+    ]
+    baseline, compact = results
+    print(
+        json.dumps(
+            {
+                "results": results,
+                "reduction": round(baseline["peak_mib"] / max(compact["peak_mib"], 0.1), 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
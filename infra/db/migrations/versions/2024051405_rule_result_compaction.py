@@ -0,0 +1,62 @@
+"""Rule result compaction summaries and archive tracking"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "2024051405"
+down_revision = "2024051404"
+branch_labels = None
+depends_on = None
+
+rule_severity = sa.Enum("error", "warning", "info", name="rule_severity", native_enum=False)
+
+
+def upgrade() -> None:
+    op.add_column("rule_run", sa.Column("compacted_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("rule_run", sa.Column("archive_uri", sa.String(length=512), nullable=True))
+
+    op.add_column("rule_result", sa.Column("rule_version_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "fk_rule_result_rule_version",
+        "rule_result",
+        "rule_version",
+        ["rule_version_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_rule_result_rule_version_id", "rule_result", ["rule_version_id"])
+    op.create_index("ix_rule_result_rule_run_id", "rule_result", ["rule_run_id"])
+
+    op.create_table(
+        "rule_result_summary",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("rule_run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("district_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("rule_version_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("rule_code", sa.String(length=32), nullable=True),
+        sa.Column("school_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("severity", rule_severity, nullable=False),
+        sa.Column("result_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["rule_run_id"], ["rule_run.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["district_id"], ["district.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["rule_version_id"], ["rule_version.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["school_id"], ["school.id"], ondelete="SET NULL"),
+    )
+    op.create_index("ix_rule_result_summary_rule_run_id", "rule_result_summary", ["rule_run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rule_result_summary_rule_run_id", table_name="rule_result_summary")
+    op.drop_table("rule_result_summary")
+
+    op.drop_index("ix_rule_result_rule_run_id", table_name="rule_result")
+    op.drop_index("ix_rule_result_rule_version_id", table_name="rule_result")
+    op.drop_constraint("fk_rule_result_rule_version", "rule_result", type_="foreignkey")
+    op.drop_column("rule_result", "rule_version_id")
+
+    op.drop_column("rule_run", "archive_uri")
+    op.drop_column("rule_run", "compacted_at")
@@ -0,0 +1,18 @@
+"""Rule categories for scoped rule runs"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2024051406"
+down_revision = "2024051405"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("rule_version", sa.Column("category", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("rule_version", "category")
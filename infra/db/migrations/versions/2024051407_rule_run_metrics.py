@@ -0,0 +1,18 @@
+"""Per-run performance metrics for rule runs"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2024051407"
+down_revision = "2024051406"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("rule_run", sa.Column("metrics", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("rule_run", "metrics")
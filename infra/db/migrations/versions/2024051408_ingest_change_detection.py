@@ -0,0 +1,24 @@
+"""Student row hashes and source hash lookup for change-detecting ingestion"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2024051408"
+down_revision = "2024051407"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("student", sa.Column("source_row_hash", sa.String(length=64), nullable=True))
+    op.create_index(
+        "ix_ingest_batch_source_latest",
+        "ingest_batch",
+        ["district_id", "table_name", "source_system_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingest_batch_source_latest", table_name="ingest_batch")
+    op.drop_column("student", "source_row_hash")
@@ -0,0 +1,56 @@
+"""Student identifiers for dedupe and the merge candidate review table"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "2024051409"
+down_revision = "2024051408"
+branch_labels = None
+depends_on = None
+
+merge_candidate_status = sa.Enum(
+    "pending", "approved", "rejected", name="merge_candidate_status", native_enum=False
+)
+
+
+def upgrade() -> None:
+    op.add_column("student", sa.Column("state_id", sa.String(length=64), nullable=True))
+    op.add_column("student", sa.Column("birth_date", sa.Date(), nullable=True))
+    op.create_index("ix_student_district_state", "student", ["district_id", "state_id"])
+
+    op.create_table(
+        "student_merge_candidate",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("district_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("student_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("duplicate_student_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("match_rule", sa.String(length=16), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("status", merge_candidate_status, nullable=False, server_default="pending"),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["district_id"], ["district.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["student_id"], ["student.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["duplicate_student_id"], ["student.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint(
+            "student_id", "duplicate_student_id", name="uq_student_merge_candidate"
+        ),
+    )
+    op.create_index(
+        "ix_student_merge_candidate_district_status",
+        "student_merge_candidate",
+        ["district_id", "status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_student_merge_candidate_district_status", table_name="student_merge_candidate"
+    )
+    op.drop_table("student_merge_candidate")
+    op.drop_index("ix_student_district_state", table_name="student")
+    op.drop_column("student", "birth_date")
+    op.drop_column("student", "state_id")
@@ -0,0 +1,18 @@
+"""School name aliases for ingestion school resolution"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2024051410"
+down_revision = "2024051409"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("school", sa.Column("aliases", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("school", "aliases")
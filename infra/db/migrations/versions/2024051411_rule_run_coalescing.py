@@ -0,0 +1,31 @@
+"""Record which rule run a deferred duplicate run was coalesced into"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "2024051411"
+down_revision = "2024051410"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "rule_run",
+        sa.Column("coalesced_into_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_rule_run_coalesced_into_id",
+        "rule_run",
+        "rule_run",
+        ["coalesced_into_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_rule_run_coalesced_into_id", "rule_run", type_="foreignkey")
+    op.drop_column("rule_run", "coalesced_into_id")
@@ -1,6 +1,34 @@
 """Rules DSL and evaluator for CRDC PreCheck."""
 
 from .models import RuleDefinition, RuleSeverity
-from .evaluator import evaluate_rule
+from .dsl import DslError, compile_dsl, validate_dsl
+from .evaluator import evaluate_rule, evaluate_rule_columns
+from .evidence import build_details, evidence_fields, upgrade_details
+from .joins import HashJoin, evaluate_reference_rule
+from .parallel import ParallelPlan
+from .plan import PlanStats, RulePlan
+from .records import RecordBatch, RecordView
+from .snapshot import ColumnarSnapshot, load_snapshot, write_snapshot
 
-__all__ = ["RuleDefinition", "RuleSeverity", "evaluate_rule"]
+__all__ = [
+    "ColumnarSnapshot",
+    "DslError",
+    "HashJoin",
+    "ParallelPlan",
+    "PlanStats",
+    "RecordBatch",
+    "RecordView",
+    "RuleDefinition",
+    "RulePlan",
+    "RuleSeverity",
+    "build_details",
+    "compile_dsl",
+    "evaluate_rule",
+    "evaluate_reference_rule",
+    "evaluate_rule_columns",
+    "evidence_fields",
+    "load_snapshot",
+    "upgrade_details",
+    "validate_dsl",
+    "write_snapshot",
+]
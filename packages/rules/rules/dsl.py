@@ -0,0 +1,403 @@
+"""Compile rule DSL documents into expressions usable on rows and on columns."""
+
+from dataclasses import dataclass
+from typing import Any, Collection, Mapping
+
+import numpy as np
+
+Columns = Mapping[str, np.ndarray]
+
+
+class Expr:
+    """Compiled DSL node. ``test`` checks one record, ``mask`` a whole column batch.
+
+    Nodes are frozen dataclasses, so structurally identical expressions compare and
+    hash equal regardless of which rule they came from. Leaf nodes implement ``mask``;
+    composite nodes implement ``combine``, which merges already computed child masks.
+    """
+
+    def children(self) -> tuple["Expr", ...]:
+        return ()
+
+    def columns(self) -> frozenset[str]:
+        fields: set[str] = set()
+        for child in self.children():
+            fields |= child.columns()
+        return frozenset(fields)
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        raise NotImplementedError
+
+    def mask(self, columns: Columns) -> np.ndarray:
+        return self.combine(columns, [child.mask(columns) for child in self.children()])
+
+    def combine(self, columns: Columns, inputs: list[np.ndarray]) -> np.ndarray:
+        return self.mask(columns)
+
+
+@dataclass(frozen=True)
+class Const(Expr):
+    value: bool
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        return self.value
+
+    def mask(self, columns: Columns) -> np.ndarray:
+        return np.full(row_count(columns), self.value, dtype=bool)
+
+
+@dataclass(frozen=True)
+class Equals(Expr):
+    field: str
+    value: Any
+
+    def columns(self) -> frozenset[str]:
+        return frozenset({self.field})
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        return record.get(self.field) == self.value
+
+    def mask(self, columns: Columns) -> np.ndarray:
+        return np.asarray(columns[self.field] == self.value, dtype=bool)
+
+
+@dataclass(frozen=True)
+class InSet(Expr):
+    field: str
+    values: tuple[Any, ...]
+
+    def columns(self) -> frozenset[str]:
+        return frozenset({self.field})
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        return record.get(self.field) in self.values
+
+    def mask(self, columns: Columns) -> np.ndarray:
+        return np.isin(columns[self.field], self.values)
+
+
+@dataclass(frozen=True)
+class Between(Expr):
+    field: str
+    min: Any = None
+    max: Any = None
+
+    def columns(self) -> frozenset[str]:
+        return frozenset({self.field})
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        value = record.get(self.field)
+        if value is None:
+            return False
+        if self.min is not None and value < self.min:
+            return False
+        if self.max is not None and value > self.max:
+            return False
+        return True
+
+    def mask(self, columns: Columns) -> np.ndarray:
+        values = columns[self.field]
+        result = np.ones(len(values), dtype=bool)
+        if self.min is not None:
+            result &= values >= self.min
+        if self.max is not None:
+            result &= values <= self.max
+        return result
+
+
+@dataclass(frozen=True)
+class NotNull(Expr):
+    field: str
+
+    def columns(self) -> frozenset[str]:
+        return frozenset({self.field})
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        return record.get(self.field) not in (None, "")
+
+    def mask(self, columns: Columns) -> np.ndarray:
+        values = columns[self.field]
+        if values.dtype.kind == "O":
+            return np.fromiter((v not in (None, "") for v in values), dtype=bool, count=len(values))
+        if values.dtype.kind in "US":
+            return values != values.dtype.type()
+        return ~_missing(values)
+
+
+@dataclass(frozen=True)
+class Within(Expr):
+    """``field`` lies between two other fields of the same row; a null bound is open."""
+
+    field: str
+    start: str
+    end: str
+
+    def columns(self) -> frozenset[str]:
+        return frozenset({self.field, self.start, self.end})
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        value = record.get(self.field)
+        if value is None:
+            return False
+        start, end = record.get(self.start), record.get(self.end)
+        if start is not None and value < start:
+            return False
+        if end is not None and value > end:
+            return False
+        return True
+
+    def mask(self, columns: Columns) -> np.ndarray:
+        values, start, end = columns[self.field], columns[self.start], columns[self.end]
+        if "O" in (values.dtype.kind, start.dtype.kind, end.dtype.kind):
+            rows = zip(values.tolist(), start.tolist(), end.tolist(), strict=True)
+            return np.fromiter(
+                (self.test({self.field: v, self.start: s, self.end: e}) for v, s, e in rows),
+                dtype=bool,
+                count=len(values),
+            )
+        return ~_missing(values) & (_missing(start) | (values >= start)) & (
+            _missing(end) | (values <= end)
+        )
+
+
+@dataclass(frozen=True)
+class AllOf(Expr):
+    parts: tuple[Expr, ...]
+
+    def children(self) -> tuple[Expr, ...]:
+        return self.parts
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        return all(part.test(record) for part in self.parts)
+
+    def combine(self, columns: Columns, inputs: list[np.ndarray]) -> np.ndarray:
+        result = np.ones(row_count(columns), dtype=bool)
+        for mask in inputs:
+            result &= mask
+        return result
+
+
+@dataclass(frozen=True)
+class AnyOf(Expr):
+    parts: tuple[Expr, ...]
+
+    def children(self) -> tuple[Expr, ...]:
+        return self.parts
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        return any(part.test(record) for part in self.parts)
+
+    def combine(self, columns: Columns, inputs: list[np.ndarray]) -> np.ndarray:
+        result = np.zeros(row_count(columns), dtype=bool)
+        for mask in inputs:
+            result |= mask
+        return result
+
+
+@dataclass(frozen=True)
+class Not(Expr):
+    part: Expr
+
+    def children(self) -> tuple[Expr, ...]:
+        return (self.part,)
+
+    def test(self, record: Mapping[str, Any]) -> bool:
+        return not self.part.test(record)
+
+    def combine(self, columns: Columns, inputs: list[np.ndarray]) -> np.ndarray:
+        return ~inputs[0]
+
+
+def compile_dsl(dsl: Mapping[str, Any] | None) -> Expr:
+    """Compile a rule DSL document into an expression that is True for passing records.
+
+    An empty document always passes; an unknown rule type raises ``DslError``. A
+    ``where`` clause limits the rule to matching records; all other records pass.
+    """
+
+    dsl = dsl or {}
+    expr = _compile_node(dsl)
+    if dsl.get("where"):
+        expr = AnyOf(_canonical((Not(_compile_node(dsl["where"])), expr)))
+    return expr
+
+
+class DslError(ValueError):
+    """A rule DSL document that is malformed or does not fit the columns it names."""
+
+
+# Rule types ``compile_dsl`` evaluates. Reference rules join other entities and go
+# through ``evaluate_reference_rule`` instead.
+_RULE_TYPES = frozenset(
+    {
+        "grade_range",
+        "enrollment_status",
+        "eq",
+        "in",
+        "range",
+        "flag",
+        "not_null",
+        "within",
+        "all",
+        "any",
+        "not",
+    }
+)
+
+# Operand fields of each rule type that name a column.
+_FIELD_KEYS = {
+    "eq": ("field",),
+    "in": ("field",),
+    "range": ("field",),
+    "flag": ("field",),
+    "not_null": ("field",),
+    "within": ("field", "start", "end"),
+}
+
+
+def validate_dsl(
+    dsl: Any,
+    dtypes: Mapping[str, np.dtype] | None = None,
+    *,
+    fields: Collection[str] | None = None,
+) -> None:
+    """Raise ``DslError`` unless ``dsl`` is a well-formed document.
+
+    An empty document is valid and always passes, as in ``compile_dsl``. With
+    ``dtypes`` (column name to dtype), comparison operands must also suit the column
+    they are compared with, so evaluation cannot fail on e.g. ``grade_level >= "abc"``.
+    The ``evidence`` list must name columns in ``fields``, or in ``dtypes`` when
+    ``fields`` is not given.
+    """
+
+    if dsl is None or (isinstance(dsl, Mapping) and not dsl):
+        return
+    _validate_node(dsl, dtypes or {}, "dsl")
+    if "evidence" in dsl:
+        _validate_evidence(dsl["evidence"], fields if fields is not None else dtypes)
+
+
+def _validate_evidence(evidence: Any, fields: Collection[str] | None) -> None:
+    if not isinstance(evidence, (list, tuple)) or not all(
+        isinstance(name, str) and name for name in evidence
+    ):
+        raise DslError("dsl.evidence must be a list of field names")
+    unknown = sorted(set(evidence) - set(fields)) if fields is not None else []
+    if unknown:
+        raise DslError(f"dsl.evidence names unknown field(s): {', '.join(unknown)}")
+
+
+def _validate_node(dsl: Any, dtypes: Mapping[str, np.dtype], path: str) -> None:
+    if not isinstance(dsl, Mapping):
+        raise DslError(f"{path} must be an object")
+    rule_type = dsl.get("type")
+    if not isinstance(rule_type, str):
+        raise DslError(f"{path}.type must be a string")
+    if rule_type == "reference":
+        raise DslError(f"{path}.type 'reference' joins other entities and cannot run per record")
+    if rule_type not in _RULE_TYPES:
+        raise DslError(f"{path}.type {rule_type!r} is not a known rule type")
+
+    for key in _FIELD_KEYS.get(rule_type, ()):
+        if not isinstance(dsl.get(key), str) or not dsl[key]:
+            raise DslError(f"{path}.{key} must name a field")
+    if rule_type in ("all", "any"):
+        parts = dsl.get("of", [])
+        if not isinstance(parts, (list, tuple)):
+            raise DslError(f"{path}.of must be a list of rules")
+        for index, part in enumerate(parts):
+            _validate_node(part, dtypes, f"{path}.of[{index}]")
+    elif rule_type == "not":
+        _validate_node(dsl.get("of"), dtypes, f"{path}.of")
+    elif rule_type == "in" and not isinstance(dsl.get("values", []), (list, tuple)):
+        raise DslError(f"{path}.values must be a list")
+
+    field = "grade_level" if rule_type == "grade_range" else dsl.get("field")
+    operands: dict[str, Any] = {}
+    if rule_type in ("grade_range", "range"):
+        operands = {key: dsl[key] for key in ("min", "max") if dsl.get(key) is not None}
+    elif rule_type == "eq" and dsl.get("value") is not None:
+        operands = {"value": dsl["value"]}
+    elif rule_type == "in":
+        operands = {f"values[{index}]": value for index, value in enumerate(dsl.get("values", []))}
+    dtype = dtypes.get(field) if isinstance(field, str) else None
+    for key, value in operands.items():
+        if dtype is not None and not _operand_fits(value, dtype):
+            raise DslError(f"{path}.{key} {value!r} cannot be compared with {field} ({dtype})")
+        if dtype is None and not isinstance(value, (str, int, float, bool)):
+            raise DslError(f"{path}.{key} must be a string, number or boolean")
+
+    if dsl.get("where") is not None:
+        _validate_node(dsl["where"], dtypes, f"{path}.where")
+
+
+def _operand_fits(value: Any, dtype: np.dtype) -> bool:
+    kind = dtype.kind
+    if kind == "O":
+        return True
+    if kind == "b":
+        return isinstance(value, bool)
+    if kind in "iuf":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if kind in "US":
+        return isinstance(value, str)
+    if kind in "mM":
+        if not isinstance(value, str):
+            return False
+        try:
+            np.datetime64(value)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+def _compile_node(dsl: Mapping[str, Any]) -> Expr:
+    rule_type = dsl.get("type")
+
+    if rule_type == "grade_range":
+        return Between("grade_level", dsl.get("min", 0), dsl.get("max", 12))
+    if rule_type == "enrollment_status":
+        return Equals("enrollment_status", dsl.get("required", "active"))
+    if rule_type == "eq":
+        return Equals(dsl["field"], dsl.get("value"))
+    if rule_type == "in":
+        return InSet(dsl["field"], tuple(dsl.get("values", ())))
+    if rule_type == "range":
+        return Between(dsl["field"], dsl.get("min"), dsl.get("max"))
+    if rule_type == "flag":
+        return Equals(dsl["field"], bool(dsl.get("value", True)))
+    if rule_type == "not_null":
+        return NotNull(dsl["field"])
+    if rule_type == "within":
+        return Within(dsl["field"], dsl["start"], dsl["end"])
+    if rule_type == "all":
+        return AllOf(_canonical(compile_dsl(part) for part in dsl.get("of", ())))
+    if rule_type == "any":
+        return AnyOf(_canonical(compile_dsl(part) for part in dsl.get("of", ())))
+    if rule_type == "not":
+        return Not(compile_dsl(dsl["of"]))
+
+    if not dsl:
+        return Const(True)
+    raise DslError(f"Unknown rule type: {rule_type!r}")
+
+
+def _canonical(parts) -> tuple[Expr, ...]:
+    return tuple(sorted(set(parts), key=repr))
+
+
+def _missing(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind in "mM":
+        return np.isnat(values)
+    if values.dtype.kind == "f":
+        return np.isnan(values)
+    return np.zeros(len(values), dtype=bool)
+
+
+def row_count(columns: Columns) -> int:
+    """Return the number of rows in a column batch."""
+
+    for values in columns.values():
+        return len(values)
+    return 0
@@ -1,18 +1,47 @@
-from typing import Any, Iterable
+from typing import Any, Iterable, Mapping
 
+import numpy as np
+
+from .dsl import Columns, compile_dsl
 from .models import RuleDefinition
+from .records import RecordBatch
 
 
-def evaluate_rule(rule: RuleDefinition, records: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+def evaluate_rule(
+    rule: RuleDefinition, records: Iterable[Mapping[str, Any]]
+) -> list[Mapping[str, Any]]:
     """Return records that violate the provided rule.
 
-    Sprint 0 implementation treats a missing predicate as a no-op.
+    Violations are the input records themselves, so passing a ``RecordBatch`` yields
+    lightweight row views rather than copies. A missing predicate is a no-op.
     """
     if rule.predicate is None:
         return []
 
-    violations: list[dict[str, Any]] = []
+    violations: list[Mapping[str, Any]] = []
     for record in records:
         if not rule.predicate(record):
             violations.append(record)
     return violations
+
+
+def evaluate_rule_columns(rule: RuleDefinition, columns: Columns) -> np.ndarray:
+    """Return row indices in ``columns`` that violate the provided rule.
+
+    Rules carrying a DSL document are evaluated as vectorized masks; rules with only a
+    Python predicate fall back to testing one materialized row at a time.
+    """
+    if rule.dsl is not None:
+        return np.flatnonzero(~compile_dsl(rule.dsl).mask(columns))
+    return evaluate_predicate_columns(rule, columns)
+
+
+def evaluate_predicate_columns(rule: RuleDefinition, columns: Columns) -> np.ndarray:
+    """Apply a rule's Python predicate to each row of ``columns``; return failing indices."""
+    if rule.predicate is None:
+        return np.empty(0, dtype=np.intp)
+
+    failing = [
+        index for index, view in enumerate(RecordBatch(columns)) if not rule.predicate(view)
+    ]
+    return np.asarray(failing, dtype=np.intp)
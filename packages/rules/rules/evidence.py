@@ -0,0 +1,58 @@
+"""Evidence payloads persisted as ``RuleResult.details``.
+
+Version 2 details keep only the fields a rule declares as evidence::
+
+    {"schema_version": 2, "evidence": {"grade_level": 14}}
+
+Rules list them under an ``evidence`` key of their DSL document; otherwise the fields
+the rule tests are used. Version 1 details, which held the whole student record, are
+upgraded on read by dropping identity and PII fields.
+"""
+
+from datetime import date
+from typing import Any, Iterable, Mapping
+
+from .dsl import compile_dsl
+
+DETAILS_SCHEMA_VERSION = 2
+
+# Already stored in dedicated RuleResult columns.
+IDENTITY_FIELDS = frozenset({"id", "school_id"})
+# Never copied into evidence unless a rule asks for them explicitly.
+PII_FIELDS = frozenset({"first_name", "last_name"})
+
+
+def evidence_fields(dsl: Mapping[str, Any] | None) -> tuple[str, ...] | None:
+    """Return the evidence fields for a rule, or ``None`` when it has no DSL document."""
+
+    if dsl is None:
+        return None
+    if "evidence" in dsl:
+        return tuple(dsl["evidence"])
+    return tuple(sorted(compile_dsl(dsl).columns() - IDENTITY_FIELDS))
+
+
+def build_details(record: Mapping[str, Any], fields: Iterable[str] | None) -> dict[str, Any]:
+    """Build version 2 details from a violating record.
+
+    Without declared fields, every field except identity and PII fields is kept.
+    """
+
+    if fields is None:
+        fields = [name for name in record if name not in IDENTITY_FIELDS | PII_FIELDS]
+    return {
+        "schema_version": DETAILS_SCHEMA_VERSION,
+        "evidence": {name: _json_value(record.get(name)) for name in fields},
+    }
+
+
+def upgrade_details(details: Mapping[str, Any] | None) -> dict[str, Any] | None:
+    """Return ``details`` in the current schema, converting version 1 payloads."""
+
+    if details is None or details.get("schema_version") == DETAILS_SCHEMA_VERSION:
+        return details  # type: ignore[return-value]
+    return build_details(details, None)
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
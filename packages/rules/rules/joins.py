@@ -0,0 +1,208 @@
+"""Cross-entity rule evaluation using in-memory hash joins with disk spilling.
+
+A reference rule declares a join from the entity it checks to another collection and
+an optional ``match`` condition evaluated on the joined row. Records without any
+matching partner violate the rule, for example::
+
+    {
+        "type": "reference",
+        "entity": "RestraintEvent",
+        "join": {
+            "entity": "Enrollment",
+            "left_on": ["student_id", "school_id"],
+            "right_on": ["student_id", "school_id"],
+        },
+        "match": {
+            "type": "within",
+            "field": "occurred_at",
+            "start": "Enrollment.start_date",
+            "end": "Enrollment.end_date",
+        },
+    }
+
+Columns of the joined collection are exposed to ``match`` prefixed with its entity name.
+When the build side exceeds ``spill_threshold`` rows, both inputs are hash-partitioned
+to temporary files and joined one partition at a time, keeping memory bounded by the
+largest partition instead of the whole collection.
+"""
+
+import pickle
+import shutil
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal, Mapping, Sequence
+
+from pydantic import BaseModel, Field
+
+from .dsl import compile_dsl
+from .models import RuleDefinition
+
+Record = dict[str, Any]
+JoinKey = tuple[Any, ...]
+
+DEFAULT_PARTITIONS = 32
+
+
+class JoinSpec(BaseModel):
+    entity: str = Field(..., description="Collection joined to the rule's entity.")
+    left_on: list[str] = Field(..., description="Key fields on the rule's entity.")
+    right_on: list[str] = Field(..., description="Key fields on the joined collection.")
+
+
+class ReferenceRule(BaseModel):
+    entity: str = Field(..., description="Collection the rule checks.")
+    join: JoinSpec
+    match: dict[str, Any] | None = Field(
+        default=None, description="DSL condition a joined row must satisfy to count as a match."
+    )
+    require: Literal["present", "absent"] = Field(
+        "present", description="Whether a match must exist or must not exist."
+    )
+
+
+class HashJoin:
+    """Hash join that spills both inputs into partitions once the build side is too large."""
+
+    def __init__(
+        self,
+        right: Iterable[Record],
+        right_on: Sequence[str],
+        *,
+        spill_threshold: int | None = None,
+        spill_dir: Path | None = None,
+        partitions: int = DEFAULT_PARTITIONS,
+    ) -> None:
+        self.right_on = list(right_on)
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.partitions = partitions
+        self.spilled = False
+        self._table: dict[JoinKey, list[Record]] = defaultdict(list)
+        self._workdir: Path | None = None
+        self._right_files: list[Path] = []
+        self._build(right)
+
+    def _build(self, right: Iterable[Record]) -> None:
+        rows = iter(right)
+        buffered = 0
+        for row in rows:
+            key = _key(row, self.right_on)
+            if key is None:
+                continue
+            self._table[key].append(row)
+            buffered += 1
+            if self.spill_threshold is not None and buffered > self.spill_threshold:
+                self._spill_build(rows)
+                return
+
+    def _spill_build(self, remaining: Iterator[Record]) -> None:
+        self.spilled = True
+        self._workdir = Path(tempfile.mkdtemp(prefix="rules-join-", dir=self.spill_dir))
+        self._right_files = [self._workdir / f"right-{i}.pkl" for i in range(self.partitions)]
+        buffered = (row for group in self._table.values() for row in group)
+        _partition_to_files(buffered, self.right_on, self._right_files, append=False)
+        self._table = defaultdict(list)
+        _partition_to_files(remaining, self.right_on, self._right_files, append=True)
+
+    def matches(
+        self, left: Iterable[Record], left_on: Sequence[str]
+    ) -> Iterator[tuple[Record, list[Record]]]:
+        """Yield each left record with the right records sharing its key.
+
+        Left records with a null key component yield an empty match list. When the
+        join has spilled, records come back grouped by partition rather than input order.
+        """
+
+        if not self.spilled:
+            for row in left:
+                key = _key(row, left_on)
+                yield row, (self._table.get(key, []) if key is not None else [])
+            return
+
+        assert self._workdir is not None
+        left_files = [self._workdir / f"left-{i}.pkl" for i in range(self.partitions)]
+        unkeyed = _partition_to_files(left, left_on, left_files, append=False)
+        try:
+            for row in unkeyed:
+                yield row, []
+            for right_file, left_file in zip(self._right_files, left_files, strict=True):
+                table: dict[JoinKey, list[Record]] = defaultdict(list)
+                for row in _read_partition(right_file):
+                    table[_key(row, self.right_on)].append(row)
+                for row in _read_partition(left_file):
+                    yield row, table.get(_key(row, left_on), [])
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+
+
+def evaluate_reference_rule(
+    rule: RuleDefinition,
+    collections: Mapping[str, Iterable[Record]],
+    *,
+    spill_threshold: int | None = None,
+    spill_dir: Path | None = None,
+) -> list[Record]:
+    """Return records of the rule's entity that violate its declared reference."""
+
+    spec = ReferenceRule.model_validate(rule.dsl or {})
+    condition = compile_dsl(spec.match) if spec.match else None
+    prefix = f"{spec.join.entity}."
+
+    join = HashJoin(
+        collections[spec.join.entity],
+        spec.join.right_on,
+        spill_threshold=spill_threshold,
+        spill_dir=spill_dir,
+    )
+    violations: list[Record] = []
+    for row, candidates in join.matches(collections[spec.entity], spec.join.left_on):
+        if condition is None:
+            matched = bool(candidates)
+        else:
+            matched = any(
+                condition.test({**row, **{prefix + k: v for k, v in candidate.items()}})
+                for candidate in candidates
+            )
+        if matched != (spec.require == "present"):
+            violations.append(row)
+    return violations
+
+
+def _key(row: Record, fields: Sequence[str]) -> JoinKey | None:
+    key = tuple(row.get(name) for name in fields)
+    return None if any(part is None for part in key) else key
+
+
+def _partition_to_files(
+    rows: Iterable[Record], fields: Sequence[str], paths: list[Path], *, append: bool
+) -> list[Record]:
+    """Append rows to per-partition pickle streams; return rows whose key has a null part."""
+
+    unkeyed: list[Record] = []
+    handles = [path.open("ab" if append else "wb") for path in paths]
+    try:
+        for row in rows:
+            key = _key(row, fields)
+            if key is None:
+                unkeyed.append(row)
+                continue
+            pickle.dump(row, handles[hash(key) % len(handles)], protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for handle in handles:
+            handle.close()
+    return unkeyed
+
+
+def _read_partition(path: Path) -> Iterator[Record]:
+    with path.open("rb") as handle:
+        while True:
+            try:
+                yield pickle.load(handle)
+            except EOFError:
+                return
@@ -16,7 +16,14 @@ class RuleDefinition(BaseModel):
     code: str = Field(..., description="Unique rule code identifier.")
     description: str = Field(..., description="Human-readable rule summary.")
     severity: RuleSeverity = Field(RuleSeverity.error, description="Rule severity.")
+    version_id: str | None = Field(
+        default=None, description="Identifier of the stored rule version, if any."
+    )
     predicate: Callable[[dict[str, Any]], bool] | None = Field(
         default=None,
         description="Callable predicate returning True when the record passes.",
     )
+    dsl: dict[str, Any] | None = Field(
+        default=None,
+        description="DSL document the predicate was compiled from; enables columnar evaluation.",
+    )
@@ -0,0 +1,160 @@
+"""Evaluate a ``RulePlan`` across worker processes.
+
+Each batch of columns is copied once into a single shared memory block. Worker
+processes attach to it and evaluate a contiguous chunk of rows through zero-copy array
+views, so only the block layout goes to the workers and only the violating row indices
+come back. Every worker rebuilds the plan from the rules' DSL documents at start-up.
+Node ids are therefore identical in every process, and per-node timings merge into the
+caller's ``PlanStats``.
+
+Rules that only carry a Python predicate, and batches holding object columns, are
+evaluated in the calling process. So is everything when the caller is a daemonic
+process, such as a Celery prefork pool worker, which may not start child processes.
+"""
+
+import logging
+import math
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing.context import BaseContext
+from typing import Any
+
+import numpy as np
+
+from .dsl import Columns, row_count
+from .evaluator import evaluate_predicate_columns
+from .models import RuleDefinition
+from .plan import PlanStats, RulePlan
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows per worker, process overhead outweighs the parallel speed-up.
+MIN_CHUNK_ROWS = 20_000
+
+# (column name, dtype string, rows, byte offset) for every column in a shared block.
+Layout = list[tuple[str, str, int, int]]
+
+_worker_plan: RulePlan | None = None
+
+
+class ParallelPlan:
+    """Process-pool counterpart of ``RulePlan.evaluate`` for large column batches."""
+
+    def __init__(
+        self,
+        plan: RulePlan,
+        workers: int,
+        *,
+        min_chunk_rows: int = MIN_CHUNK_ROWS,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        self.plan = plan
+        self.workers = workers
+        self.min_chunk_rows = min_chunk_rows
+        self._pool: Executor | None = None
+        if multiprocessing.current_process().daemon:
+            logger.warning(
+                "Daemonic processes cannot start a process pool; evaluating rules in-process"
+            )
+            return
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=([rule.dsl for rule in plan.rules],),
+        )
+
+    def __enter__(self) -> "ParallelPlan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def evaluate(self, columns: Columns, stats: PlanStats | None = None) -> list[np.ndarray]:
+        """Return, for each rule in order, the row indices of ``columns`` it flags."""
+
+        rows = row_count(columns)
+        chunks = min(self.workers, rows // self.min_chunk_rows)
+        if (
+            self._pool is None
+            or chunks < 2
+            or any(values.dtype.kind == "O" for values in columns.values())
+        ):
+            return self.plan.evaluate(columns, stats)
+
+        layout, size = _layout(columns)
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            for name, dtype, length, offset in layout:
+                view = np.ndarray((length,), dtype=dtype, buffer=block.buf, offset=offset)
+                view[:] = columns[name]
+                del view
+            step = math.ceil(rows / chunks)
+            futures = [
+                self._pool.submit(
+                    _evaluate_chunk, block.name, layout, start, min(start + step, rows)
+                )
+                for start in range(0, rows, step)
+            ]
+            results = [future.result() for future in futures]
+        finally:
+            block.close()
+            block.unlink()
+
+        violations: list[np.ndarray] = []
+        for position, (rule, root) in enumerate(zip(self.plan.rules, self.plan.roots, strict=True)):
+            if root is None:
+                violations.append(evaluate_predicate_columns(rule, columns))
+                continue
+            violations.append(
+                np.concatenate([chunk_violations[position] for chunk_violations, _ in results])
+            )
+        if stats is not None:
+            for _, chunk_stats in results:
+                stats.merge(chunk_stats)
+        return violations
+
+
+def _layout(columns: Columns) -> tuple[Layout, int]:
+    layout: Layout = []
+    offset = 0
+    for name, values in columns.items():
+        offset = -(-offset // 16) * 16
+        layout.append((name, values.dtype.str, len(values), offset))
+        offset += values.nbytes
+    return layout, offset
+
+
+def _init_worker(dsl_documents: list[dict[str, Any] | None]) -> None:
+    global _worker_plan
+    _worker_plan = RulePlan(
+        [
+            RuleDefinition(code=f"rule-{index}", description="", dsl=dsl)
+            for index, dsl in enumerate(dsl_documents)
+        ]
+    )
+
+
+def _evaluate_chunk(
+    block_name: str, layout: Layout, start: int, stop: int
+) -> tuple[list[np.ndarray], PlanStats]:
+    assert _worker_plan is not None
+    # Pool processes share the parent's resource tracker, which already holds this block,
+    # so attaching here neither leaks it nor unlinks it when the worker exits.
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        columns = {
+            name: np.ndarray((length,), dtype=dtype, buffer=block.buf, offset=offset)[start:stop]
+            for name, dtype, length, offset in layout
+        }
+        stats = PlanStats()
+        violations = [indices + start for indices in _worker_plan.evaluate(columns, stats)]
+        del columns
+        return violations, stats
+    finally:
+        block.close()
@@ -0,0 +1,163 @@
+"""Shared evaluation plan across the rules of a run.
+
+``RulePlan`` merges the compiled DSL of every rule into a single DAG in which
+structurally identical subexpressions (active enrollment, grade bands, program flags)
+appear once. Each node's mask is computed once per column batch and reused by every
+rule and parent node that references it.
+"""
+
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Sequence
+
+import numpy as np
+
+from .dsl import Columns, Expr, compile_dsl, row_count
+from .evaluator import evaluate_predicate_columns
+from .models import RuleDefinition
+
+
+@dataclass
+class NodeStats:
+    label: str
+    rules: int
+    evaluations: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "label": self.label,
+            "rules": self.rules,
+            "evaluations": self.evaluations,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 6),
+        }
+
+
+@dataclass
+class PlanStats:
+    """Per-node timings accumulated across every batch evaluated by a plan."""
+
+    nodes: dict[int, NodeStats] = field(default_factory=dict)
+
+    def record(self, node_id: int, label: str, rules: int, rows: int, seconds: float) -> None:
+        stats = self.nodes.get(node_id)
+        if stats is None:
+            stats = self.nodes[node_id] = NodeStats(label=label, rules=rules)
+        stats.evaluations += 1
+        stats.rows += rows
+        stats.seconds += seconds
+
+    def merge(self, other: "PlanStats") -> None:
+        for node_id, stats in other.nodes.items():
+            current = self.nodes.get(node_id)
+            if current is None:
+                self.nodes[node_id] = replace(stats)
+                continue
+            current.evaluations += stats.evaluations
+            current.rows += stats.rows
+            current.seconds += stats.seconds
+
+    def as_dict(self) -> list[dict[str, Any]]:
+        """Return node stats ordered from slowest to fastest."""
+
+        ordered = sorted(self.nodes.items(), key=lambda item: item[1].seconds, reverse=True)
+        return [{"node": node_id, **stats.as_dict()} for node_id, stats in ordered]
+
+
+class RulePlan:
+    """DAG of deduplicated DSL expressions for a set of rules.
+
+    Nodes are stored in topological order (children before parents), so a single
+    forward pass evaluates the whole plan. Rules without a DSL document fall back to
+    their Python predicate, applied row by row.
+    """
+
+    def __init__(self, rules: Sequence[RuleDefinition]) -> None:
+        self.rules = list(rules)
+        self.nodes: list[Expr] = []
+        self.inputs: list[tuple[int, ...]] = []
+        self.labels: list[str] = []
+        self.references: list[int] = []
+        self._index: dict[Expr, int] = {}
+        self.roots: list[int | None] = []
+        for rule in self.rules:
+            if rule.dsl is None:
+                self.roots.append(None)
+                continue
+            self.roots.append(self._add(compile_dsl(rule.dsl)))
+        for root in self.roots:
+            if root is not None:
+                self._count_references(root, set())
+
+    def _add(self, expr: Expr) -> int:
+        existing = self._index.get(expr)
+        if existing is not None:
+            return existing
+        inputs = tuple(self._add(child) for child in expr.children())
+        node_id = len(self.nodes)
+        self.nodes.append(expr)
+        self.inputs.append(inputs)
+        self.references.append(0)
+        if inputs:
+            refs = ", ".join(f"#{child}" for child in inputs)
+            self.labels.append(f"{type(expr).__name__}({refs})")
+        else:
+            self.labels.append(repr(expr))
+        self._index[expr] = node_id
+        return node_id
+
+    def _count_references(self, node_id: int, seen: set[int]) -> None:
+        if node_id in seen:
+            return
+        seen.add(node_id)
+        self.references[node_id] += 1
+        for child in self.inputs[node_id]:
+            self._count_references(child, seen)
+
+    @property
+    def shared_nodes(self) -> int:
+        """Number of nodes referenced by more than one rule."""
+
+        return sum(1 for count in self.references if count > 1)
+
+    def columns(self) -> frozenset[str]:
+        """Columns referenced by any rule in the plan."""
+
+        fields: set[str] = set()
+        for expr in self.nodes:
+            fields |= expr.columns()
+        return frozenset(fields)
+
+    def evaluate(self, columns: Columns, stats: PlanStats | None = None) -> list[np.ndarray]:
+        """Return, for each rule in order, the row indices of ``columns`` it flags."""
+
+        rows = row_count(columns)
+        masks: list[np.ndarray] = []
+        for node_id, expr in enumerate(self.nodes):
+            started = time.perf_counter()
+            masks.append(expr.combine(columns, [masks[child] for child in self.inputs[node_id]]))
+            if stats is not None:
+                stats.record(
+                    node_id,
+                    self.labels[node_id],
+                    self.references[node_id],
+                    rows,
+                    time.perf_counter() - started,
+                )
+
+        violations: list[np.ndarray] = []
+        for rule, root in zip(self.rules, self.roots, strict=True):
+            if root is not None:
+                violations.append(np.flatnonzero(~masks[root]))
+            else:
+                violations.append(evaluate_predicate_columns(rule, columns))
+        return violations
+
+    def describe(self) -> list[dict[str, Any]]:
+        return [
+            {"node": node_id, "label": self.labels[node_id], "rules": self.references[node_id]}
+            for node_id in range(len(self.nodes))
+        ]
+
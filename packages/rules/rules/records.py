@@ -0,0 +1,94 @@
+"""Compact record representation for rule evaluation.
+
+A ``RecordBatch`` keeps a collection as one array per field (struct of arrays) and
+hands out ``RecordView`` rows: two-slot objects that read straight from the arrays.
+Rules and predicates see an ordinary read-only mapping, while per-row dicts are only
+built at the serialization boundary through ``RecordView.to_dict``.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from .dsl import Columns, row_count
+
+
+class RecordBatch:
+    """Column arrays of equal length viewed as a sequence of records."""
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Columns) -> None:
+        self.columns = columns
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Mapping[str, Any]], fields: Sequence[str] | None = None
+    ) -> "RecordBatch":
+        """Transpose row mappings into columns; missing fields become ``None``."""
+
+        rows = list(records)
+        if fields is None:
+            fields = list(dict.fromkeys(name for row in rows for name in row))
+        columns: dict[str, np.ndarray] = {}
+        for name in fields:
+            values = [row.get(name) for row in rows]
+            column = np.array(values)
+            if column.dtype.kind not in "biufUSM" or any(value is None for value in values):
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+            columns[name] = column
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return row_count(self.columns)
+
+    def __iter__(self) -> Iterator["RecordView"]:
+        for index in range(len(self)):
+            yield RecordView(self, index)
+
+    def row(self, index: int) -> "RecordView":
+        return RecordView(self, index)
+
+    def take(self, indices: np.ndarray | Sequence[int]) -> "RecordBatch":
+        """Return a batch holding only the rows at ``indices``."""
+
+        positions = np.asarray(indices, dtype=np.intp)
+        return RecordBatch({name: values[positions] for name, values in self.columns.items()})
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return [view.to_dict() for view in self]
+
+
+class RecordView(Mapping[str, Any]):
+    """Read-only mapping over one row of a ``RecordBatch``."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: RecordBatch, index: int) -> None:
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, name: str) -> Any:
+        return _scalar(self._batch.columns[name][self._index])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._batch.columns)
+
+    def __len__(self) -> int:
+        return len(self._batch.columns)
+
+    def __repr__(self) -> str:
+        return f"RecordView({self.to_dict()!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: _scalar(values[self._index]) for name, values in self._batch.columns.items()}
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, np.datetime64) and np.isnat(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -0,0 +1,109 @@
+"""Columnar, memory-mappable snapshots of entity collections for offline evaluation.
+
+A snapshot is a directory holding one ``.npy`` file per column plus a ``manifest.json``
+describing the entity, key and row count. Loading with ``mmap=True`` maps the column
+files read-only, so evaluation reads straight from the page cache without copies.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass
+class ColumnarSnapshot:
+    entity: str
+    key: str
+    columns: dict[str, np.ndarray]
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def __len__(self) -> int:
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Materialize a single row as a plain dict of Python scalars."""
+
+        return {name: values[index].item() for name, values in self.columns.items()}
+
+
+def snapshot_directory(root: Path, district_id: str, entity: str, key: str) -> Path:
+    return root / district_id / entity.lower() / key
+
+
+def write_snapshot(directory: Path, snapshot: ColumnarSnapshot) -> Path:
+    """Write ``snapshot`` to ``directory`` atomically and return the directory."""
+
+    row_counts = {len(values) for values in snapshot.columns.values()}
+    if len(row_counts) > 1:
+        raise ValueError("All snapshot columns must have the same length")
+
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".snapshot-", dir=directory.parent))
+    try:
+        for name, values in snapshot.columns.items():
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(values), allow_pickle=False)
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "entity": snapshot.entity,
+            "key": snapshot.key,
+            "rows": len(snapshot),
+            "created_at": snapshot.created_at,
+            "columns": {name: values.dtype.str for name, values in snapshot.columns.items()},
+        }
+        (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        if directory.exists():
+            shutil.rmtree(directory)
+        os.replace(staging, directory)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return directory
+
+
+def load_snapshot(
+    directory: Path, *, mmap: bool = True, columns: set[str] | None = None
+) -> ColumnarSnapshot:
+    """Load a snapshot, memory-mapping column files unless ``mmap`` is False.
+
+    ``columns`` restricts loading to the named columns.
+    """
+
+    manifest = read_manifest(directory)
+    mmap_mode = "r" if mmap else None
+    loaded = {
+        name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+        for name in manifest["columns"]
+        if columns is None or name in columns
+    }
+    return ColumnarSnapshot(
+        entity=manifest["entity"],
+        key=manifest["key"],
+        columns=loaded,
+        created_at=manifest["created_at"],
+    )
+
+
+def read_manifest(directory: Path) -> Mapping[str, Any]:
+    manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format in {directory}")
+    return manifest
+
+
+def string_column(values: list[str | None]) -> np.ndarray:
+    """Build a fixed-width unicode column (memory-mappable, unlike object arrays)."""
+
+    width = max((len(value) for value in values if value), default=1)
+    return np.array([value or "" for value in values], dtype=f"<U{width}")
@@ -48,6 +48,158 @@ class AppSettings(BaseSettings):
     minio_endpoint: str = Field(
         "http://minio:9000", description="Object storage endpoint for evidence assets."
     )
+    metrics_enabled: bool = Field(
+        True, description="Expose Prometheus metrics from the API and the worker."
+    )
+    worker_metrics_port: int = Field(
+        9808, description="Port of the worker's Prometheus exporter."
+    )
+    sql_profiler_enabled: bool = Field(
+        False, description="Profile SQL per API request and report it in Server-Timing headers."
+    )
+    sql_profiler_query_threshold: int = Field(
+        25, description="Statements per request above which the profiler logs a warning."
+    )
+    sql_profiler_slow_statements: int = Field(
+        3, description="Slowest statements the profiler logs for each request."
+    )
+    rule_result_retention_days: int = Field(
+        90, description="Age in days after which superseded rule runs are compacted."
+    )
+    rule_result_archive_dir: str = Field(
+        "storage/archive/rule_results",
+        description="Local directory receiving archived raw rule results.",
+    )
+    snapshot_dir: str = Field(
+        "storage/snapshots",
+        description="Local directory holding columnar district snapshots for offline evaluation.",
+    )
+    snapshot_cache_size: int = Field(
+        8, description="Number of district snapshots the API keeps in memory for rule previews."
+    )
+    powerschool_extract_path: str | None = Field(
+        None,
+        description=(
+            "PowerSchool extract read by the sync, as a JSON array or NDJSON; "
+            "defaults to the bundled sample."
+        ),
+    )
+    powerschool_base_url: str | None = Field(
+        None, description="PowerSchool API root; when set, syncs use the API instead of a file."
+    )
+    powerschool_client_id: str | None = Field(None, description="PowerSchool OAuth client id.")
+    powerschool_client_secret: str | None = Field(
+        None, description="PowerSchool OAuth client secret."
+    )
+    powerschool_page_size: int = Field(100, description="Students requested per API page.")
+    connector_rate_per_second: float = Field(
+        10.0, description="Average API requests per second allowed per connector sync."
+    )
+    connector_burst: int = Field(10, description="Requests a connector may burst above its rate.")
+    connector_concurrency: int = Field(4, description="Concurrent page fetches per sync.")
+    connector_queue_size: int = Field(
+        8, description="Pages or load batches buffered between connector pipeline stages."
+    )
+    connector_max_attempts: int = Field(
+        5, description="Attempts per API request before a sync fails, with exponential backoff."
+    )
+    ingest_batch_size: int = Field(
+        1000, description="Extract rows parsed, compared and committed together during syncs."
+    )
+    redis_lock_url: str | None = Field(
+        None, description="Redis URL for district lease locks; defaults to the broker URL."
+    )
+    district_lock_backend: str = Field(
+        "auto",
+        description=(
+            "Where district leases live: 'redis', 'database' (PostgreSQL advisory locks), "
+            "or 'auto' to always take the database lock and add a Redis lease while Redis "
+            "is reachable. Every worker must use the same setting."
+        ),
+    )
+    district_lock_ttl_seconds: float = Field(
+        300.0, description="Lease TTL for district syncs and rule runs; renewed while held."
+    )
+    district_lock_retry_seconds: int = Field(
+        30,
+        description=(
+            "Delay before a sync or rule run retries when its district is locked or "
+            "every worker-wide slot is busy."
+        ),
+    )
+    max_concurrent_jobs: int = Field(
+        8, description="Syncs and rule runs allowed to run at once across all workers; 0 is no cap."
+    )
+    nightly_sync_local_time: str = Field(
+        "02:00", description="Start of the nightly sync window in each district's timezone."
+    )
+    nightly_sync_jitter_minutes: int = Field(
+        120, description="Width of the window over which district nightly syncs are spread."
+    )
+    nightly_sync_tick_seconds: int = Field(
+        300, description="How often beat checks for districts whose nightly sync is due."
+    )
+    celery_queue_concurrency: dict[str, int] = Field(
+        {"ingest": 2, "rules": 2, "exports": 2, "housekeeping": 1, "interactive": 4},
+        description="Worker processes per Celery queue; a worker serving several queues adds them.",
+    )
+    celery_task_priorities: dict[str, int] = Field(
+        {
+            "heartbeat": 0,
+            "process_rule_run": 5,
+            "sync_powerschool": 5,
+            "export_district_snapshot": 5,
+            "compact_rule_results": 9,
+            "schedule_nightly_syncs": 0,
+            "dedupe_students": 7,
+        },
+        description="Default priority per task name within its queue; 0 runs first.",
+    )
+    celery_interactive_priority: int = Field(
+        0, description="Priority of tasks a user triggered from the API and is waiting on."
+    )
+    celery_prefetch_multiplier: int = Field(
+        1, description="Messages each worker process reserves ahead; keep 1 for long tasks."
+    )
+    celery_acks_late: bool = Field(
+        True, description="Acknowledge tasks after they finish, so a lost worker's task reruns."
+    )
+    celery_compression_threshold_bytes: int = Field(
+        16 * 1024, description="Task messages and results at least this large are zlib-compressed."
+    )
+    celery_result_max_bytes: int = Field(
+        256 * 1024,
+        description="Encoded results above this size are stored as a summary; 0 disables the cap.",
+    )
+    celery_result_expires_seconds: int = Field(
+        24 * 3600, description="Seconds task results are kept in the result backend."
+    )
+    celery_ignore_result_tasks: list[str] = Field(
+        ["heartbeat"], description="Fire-and-forget tasks whose results are never stored."
+    )
+    rule_fetch_batch_size: int = Field(
+        5000, description="Students streamed from the database per rule evaluation batch."
+    )
+    dedupe_min_score: float = Field(
+        0.85, description="Name and birth date score at which two students become merge candidates."
+    )
+    dedupe_max_block_size: int = Field(
+        500, description="Students sharing a dedupe blocking key above which the block is skipped."
+    )
+    rule_eval_workers: int = Field(
+        0,
+        description=(
+            "Processes evaluating each student batch of a rule run in parallel; "
+            "0 or 1 evaluates inside the task process."
+        ),
+    )
+    rule_eval_min_chunk_rows: int = Field(
+        1000,
+        description=(
+            "Fewest rows each evaluation process gets; capped so every fetched batch "
+            "still splits across all rule_eval_workers."
+        ),
+    )
 
 
 @lru_cache
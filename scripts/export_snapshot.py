@@ -0,0 +1,32 @@
+"""Export a district's students into a columnar snapshot for offline rule evaluation."""
+
+import argparse
+from pathlib import Path
+from uuid import UUID
+
+from apps.api.app.db.session import SessionLocal
+from apps.api.app.services.snapshots import export_student_snapshot
+from packages.shared.shared.config import get_settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("district_id", type=UUID, help="District to export.")
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=Path(get_settings().snapshot_dir),
+        help="Snapshot root directory (defaults to SNAPSHOT_DIR).",
+    )
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        directory = export_student_snapshot(session, args.district_id, args.root)
+        print(f"Snapshot ready at {directory}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
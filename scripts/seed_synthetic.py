@@ -1,5 +1,12 @@
-"""Seed synthetic data for local development."""
+"""Seed synthetic data for local development.
 
+Without arguments this creates the small demo district. Pass ``--districts`` to
+bulk-generate load-test data instead, e.g.::
+
+    python scripts/seed_synthetic.py --districts 2 --schools 20 --students 2500
+"""
+
+import argparse
 from datetime import date, datetime
 
 from sqlalchemy import func, select
@@ -27,10 +34,16 @@ from apps.api.app.db.models import (
     UserRoleEnum,
 )
 from apps.api.app.db.session import SessionLocal
+from apps.api.app.services.synthetic import SyntheticSpec, generate_synthetic
 from apps.worker.worker.tasks import process_rule_run
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.districts:
+        seed_load_test(args)
+        return
+
     session = SessionLocal()
     try:
         district = session.execute(select(District)).scalar_one_or_none()
@@ -54,6 +67,38 @@ def main() -> None:
         session.close()
 
 
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--districts", type=int, default=0, help="Bulk-generate N districts")
+    parser.add_argument("--schools", type=int, default=5, help="Schools per district")
+    parser.add_argument("--students", type=int, default=500, help="Students per school")
+    parser.add_argument("--grade-violation-rate", type=float, default=0.02)
+    parser.add_argument("--status-violation-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def seed_load_test(args: argparse.Namespace) -> None:
+    spec = SyntheticSpec(
+        districts=args.districts,
+        schools_per_district=args.schools,
+        students_per_school=args.students,
+        grade_violation_rate=args.grade_violation_rate,
+        status_violation_rate=args.status_violation_rate,
+        seed=args.seed,
+    )
+    session = SessionLocal()
+    try:
+        for district in generate_synthetic(session, spec):
+            print(
+                f"District {district.district_id}: {district.students} students, "
+                f"{district.grade_violations} grade and {district.status_violations} status "
+                f"violation(s), admin token {district.api_token}"
+            )
+    finally:
+        session.close()
+
+
 def create_demo_district(session: SessionLocal) -> District:
     district = District(name="Demo Unified School District", timezone="America/Chicago")
     session.add(district)
@@ -198,7 +243,7 @@ def ensure_demo_user(session: SessionLocal, district: District) -> None:
                 last_login_at=datetime.utcnow(),
             )
         )
-    session.commit()
+        session.commit()
         print("Created demo admin user (token: demo-admin-token).")
 
 
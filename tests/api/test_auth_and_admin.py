@@ -18,8 +18,8 @@ db_session_module = __import__("apps.api.app.db.session", fromlist=["SessionLoca
 db_session_module.SessionLocal = TestingSessionLocal
 db_session_module.engine = engine
 worker_tasks.SessionLocal = TestingSessionLocal
-worker_tasks.process_rule_run.delay = lambda rule_run_id: worker_tasks.process_rule_run(rule_run_id)
-worker_tasks.sync_powerschool.delay = lambda district_id: worker_tasks.sync_powerschool(district_id)
+worker_tasks.process_rule_run.apply_async = lambda args, **options: worker_tasks.process_rule_run(*args)
+worker_tasks.sync_powerschool.apply_async = lambda args, **options: worker_tasks.sync_powerschool(*args)
 
 app = create_app()
 
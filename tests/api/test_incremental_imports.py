@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.session import get_session
+from apps.api.app.main import create_app
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+app = create_app()
+
+
+def _get_test_session():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+app.dependency_overrides[get_session] = _get_test_session
+client = TestClient(app)
+
+MAPPING = {
+    "sis_id": "id",
+    "first_name": "first",
+    "last_name": "last",
+    "grade_level": "grade",
+    "school_name": "school",
+}
+
+
+def _csv(grades: list[int]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["id", "first", "last", "grade", "school"])
+    for index, grade in enumerate(grades):
+        writer.writerow([f"INC{index}", "Pat", f"Student{index}", grade, "Hash Elementary"])
+    return buffer.getvalue()
+
+
+def _upload(headers: dict[str, str], content: str) -> dict:
+    response = client.post(
+        "/import/students/csv",
+        headers=headers,
+        data={"mapping": json.dumps(MAPPING)},
+        files={"file": ("students.csv", content, "text/csv")},
+    )
+    assert response.status_code == 202
+    return response.json()
+
+
+def test_csv_reimport_writes_only_changed_rows() -> None:
+    district_id = UUID(client.post("/districts", json={"name": "Incremental CSV"}).json()["id"])
+    headers = {"X-District-ID": str(district_id)}
+    grades = [index % 12 for index in range(100)]
+
+    first = _upload(headers, _csv(grades))
+    assert (first["students_created"], first["skipped"]) == (100, False)
+
+    repeat = _upload(headers, _csv(grades))
+    assert repeat["skipped"] is True
+    assert repeat["rows_processed"] == 0
+
+    grades[42] = 12
+    changed = _upload(headers, _csv(grades))
+    assert changed["skipped"] is False
+    assert changed["students_updated"] == 1
+    assert changed["students_unchanged"] == 99
@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.session import get_session
+from apps.api.app.main import create_app
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+app = create_app()
+
+
+def _get_test_session():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+app.dependency_overrides[get_session] = _get_test_session
+client = TestClient(app)
+
+
+def _sample(body: str, name: str, **labels: str) -> float:
+    for line in body.splitlines():
+        if not line.startswith(name + "{"):
+            continue
+        if all(f'{key}="{value}"' in line for key, value in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} {labels} not exported")
+
+
+def test_metrics_endpoint_reports_route_latency_and_queries():
+    response = client.post("/districts", json={"name": "Metrics District", "timezone": "America/Chicago"})
+    assert response.status_code == 201
+    client.get(f"/districts/{response.json()['id']}/does-not-exist")
+
+    body = client.get("/metrics").text
+
+    route = {"method": "POST", "route": "/districts"}
+    assert _sample(body, "crdc_api_request_duration_seconds_count", status="201", **route) >= 1
+    assert _sample(body, "crdc_api_request_db_queries_sum", **route) >= 1
+    assert _sample(body, "crdc_api_response_serialization_seconds_count", route="/districts") >= 1
+    assert _sample(body, "crdc_api_request_duration_seconds_count", route="unmatched") >= 1
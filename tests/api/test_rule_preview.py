@@ -0,0 +1,145 @@
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import RuleResult, RuleRun
+from apps.api.app.db.session import get_session
+from apps.api.app.main import create_app
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+app = create_app()
+
+
+def _get_test_session():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+app.dependency_overrides[get_session] = _get_test_session
+client = TestClient(app)
+
+
+def _seed_district() -> UUID:
+    district_id = UUID(
+        client.post("/districts", json={"name": "Preview District", "timezone": "America/Chicago"}).json()["id"]
+    )
+    headers = {"X-District-ID": str(district_id)}
+    school_id = client.post("/schools", headers=headers, json={"name": "Preview High", "level": "high"}).json()["id"]
+    for sis_id, grade in [("P1", 9), ("P2", 14), ("P3", 11), ("P4", -2)]:
+        response = client.post(
+            "/students",
+            headers=headers,
+            json={
+                "school_id": school_id,
+                "sis_id": sis_id,
+                "first_name": "Test",
+                "last_name": sis_id,
+                "grade_level": grade,
+                "ell_status": False,
+                "idea_flag": False,
+            },
+        )
+        assert response.status_code == 201
+    return district_id
+
+
+def test_rule_preview_counts_violations_without_writing():
+    district_id = _seed_district()
+
+    response = client.post(
+        "/rules/versions/preview",
+        headers={"X-District-ID": str(district_id)},
+        json={"dsl": {"type": "grade_range", "min": 0, "max": 12}, "sample_size": 1},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rows_evaluated"] == 4
+    assert body["violations"] == 2
+    assert len(body["sample"]) == 1
+    assert body["sample"][0]["sis_id"] in {"P2", "P4"}
+
+    with TestingSessionLocal() as session:
+        assert session.execute(select(func.count(RuleRun.id))).scalar_one() == 0
+        assert session.execute(select(func.count(RuleResult.id))).scalar_one() == 0
+
+
+def test_rule_preview_sees_every_column_a_run_evaluates():
+    district_id = _seed_district()
+
+    response = client.post(
+        "/rules/versions/preview",
+        headers={"X-District-ID": str(district_id)},
+        json={"dsl": {"type": "not_null", "field": "enrollment_end"}, "sample_size": 1},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["violations"] == 4
+    assert body["sample"][0]["enrollment_end"] is None
+    assert body["sample"][0]["first_name"] == "Test"
+
+
+def test_rule_preview_rejects_unknown_fields():
+    district_id = _seed_district()
+
+    response = client.post(
+        "/rules/versions/preview",
+        headers={"X-District-ID": str(district_id)},
+        json={"dsl": {"type": "eq", "field": "shoe_size", "value": 9}},
+    )
+
+    assert response.status_code == 400
+    assert "shoe_size" in response.json()["detail"]
+
+
+def test_rule_preview_rejects_malformed_dsl():
+    district_id = _seed_district()
+
+    for dsl in (
+        {"type": "all", "of": "x"},
+        {"type": "range", "field": "grade_level", "min": "abc"},
+    ):
+        response = client.post(
+            "/rules/versions/preview",
+            headers={"X-District-ID": str(district_id)},
+            json={"dsl": dsl},
+        )
+
+        assert response.status_code == 400, dsl
+        assert response.json()["detail"].startswith("Invalid rule DSL")
+
+
+def test_rule_versions_reject_unknown_types_and_evidence():
+    district_id = _seed_district()
+
+    for dsl in (
+        {"type": "reference", "entity": "RestraintEvent", "join": {"entity": "Enrollment"}},
+        {"type": "grade_rnage", "min": 0, "max": 12},
+        {"type": "all", "of": [{"type": "grade_range"}, {"type": "lookup"}]},
+        {"type": "grade_range", "evidence": "sis_id"},
+        {"type": "grade_range", "evidence": ["sis_id", "shoe_size"]},
+    ):
+        response = client.post(
+            "/rules/versions",
+            headers={"X-District-ID": str(district_id)},
+            json={"code": "BAD", "title": "Bad rule", "applies_to": "Student", "dsl": dsl},
+        )
+
+        assert response.status_code == 400, dsl
+        assert response.json()["detail"].startswith("Invalid rule DSL")
@@ -35,8 +35,8 @@ def _get_test_session():
 app.dependency_overrides[get_session] = _get_test_session
 
 # Patch Celery delay to run synchronously for tests
-worker_tasks.sync_powerschool.delay = lambda district_id: worker_tasks.sync_powerschool(district_id)
-worker_tasks.process_rule_run.delay = lambda rule_run_id: worker_tasks.process_rule_run(rule_run_id)
+worker_tasks.sync_powerschool.apply_async = lambda args, **options: worker_tasks.sync_powerschool(*args)
+worker_tasks.process_rule_run.apply_async = lambda args, **options: worker_tasks.process_rule_run(*args)
 
 client = TestClient(app)
 
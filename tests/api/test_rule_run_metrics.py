@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.session import get_session
+from apps.api.app.main import create_app
+from apps.api.app.services import run_metrics
+from apps.worker.worker import tasks as worker_tasks
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+app = create_app()
+
+
+def _get_test_session():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+app.dependency_overrides[get_session] = _get_test_session
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _run_tasks_inline(monkeypatch):
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(
+        worker_tasks.process_rule_run,
+        "apply_async",
+        lambda args, **options: worker_tasks.process_rule_run(*args),
+    )
+
+
+def _seed_district() -> dict[str, str]:
+    district_id = UUID(
+        client.post("/districts", json={"name": "Metrics District", "timezone": "America/Denver"}).json()["id"]
+    )
+    headers = {"X-District-ID": str(district_id)}
+    school_id = client.post("/schools", headers=headers, json={"name": "Metrics High", "level": "high"}).json()["id"]
+    for sis_id, grade in [("M1", 9), ("M2", 14), ("M3", 15)]:
+        client.post(
+            "/students",
+            headers=headers,
+            json={
+                "school_id": school_id,
+                "sis_id": sis_id,
+                "first_name": "Test",
+                "last_name": sis_id,
+                "grade_level": grade,
+                "ell_status": False,
+                "idea_flag": False,
+            },
+        )
+    client.post(
+        "/rules/versions",
+        headers=headers,
+        json={
+            "code": "GRADE-RANGE",
+            "title": "Grade range",
+            "applies_to": "Student",
+            "dsl": {"type": "grade_range", "min": 0, "max": 12},
+        },
+    )
+    return headers
+
+
+def test_rule_run_metrics_are_recorded_per_run_and_rule():
+    headers = _seed_district()
+    rule_run_id = client.post("/rules/runs", headers=headers, json={}).json()["id"]
+
+    response = client.get(f"/rules/runs/{rule_run_id}/metrics", headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "success"
+    assert body["duration_seconds"] >= 0
+    metrics = body["metrics"]
+    assert metrics["rows_scanned"] == 3
+    assert metrics["violations"] == 2
+    assert metrics["peak_rss_mb"] >= 0
+    assert [rule["code"] for rule in metrics["rules"]] == ["GRADE-RANGE"]
+    assert metrics["rules"][0]["violations"] == 2
+    assert metrics["plan"]
+
+
+def test_rule_run_metrics_unknown_run_returns_404():
+    headers = _seed_district()
+
+    response = client.get(f"/rules/runs/{uuid4()}/metrics", headers=headers)
+
+    assert response.status_code == 404
+
+
+def test_peak_rss_is_the_growth_during_the_run(monkeypatch):
+    resource = run_metrics.resource
+    maxrss = {resource.RUSAGE_SELF: 800 * 1024, resource.RUSAGE_CHILDREN: 0}
+    monkeypatch.setattr(run_metrics.sys, "platform", "linux")
+    monkeypatch.setattr(resource, "getrusage", lambda who: SimpleNamespace(ru_maxrss=maxrss[who]))
+    serial = run_metrics.RunMetricsRecorder(rules=[])
+    parallel = run_metrics.RunMetricsRecorder(rules=[], include_children=True)
+
+    assert serial.as_dict()["peak_rss_mb"] == 0
+    maxrss[resource.RUSAGE_SELF] += 50 * 1024
+    maxrss[resource.RUSAGE_CHILDREN] = 200 * 1024
+
+    assert serial.as_dict()["peak_rss_mb"] == 50
+    assert parallel.as_dict()["peak_rss_mb"] == 250
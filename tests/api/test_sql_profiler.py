@@ -0,0 +1,101 @@
+import logging
+import re
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import ReadinessScore, School
+from apps.api.app.db.session import get_session
+from apps.api.app.main import create_app
+from apps.api.app.profiling import QueryProfilerMiddleware
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+app = create_app()
+app.add_middleware(QueryProfilerMiddleware, query_threshold=5)
+
+
+def _get_test_session():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+app.dependency_overrides[get_session] = _get_test_session
+client = TestClient(app)
+
+
+def _db_queries(response) -> int:
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["server-timing"])
+    assert match, response.headers["server-timing"]
+    return int(match.group(1))
+
+
+def _district_with_scores(schools: int) -> dict[str, str]:
+    district_id = UUID(
+        client.post("/districts", json={"name": "Profiled", "timezone": "America/Chicago"}).json()["id"]
+    )
+    with TestingSessionLocal() as session:
+        for index in range(schools):
+            school = School(district_id=district_id, name=f"School {index}")
+            session.add(school)
+            session.flush()
+            session.add(
+                ReadinessScore(district_id=district_id, school_id=school.id, category="Overall", score=90)
+            )
+        session.commit()
+    return {"X-District-ID": str(district_id)}
+
+
+def test_server_timing_reports_request_queries():
+    response = client.post("/districts", json={"name": "Timed", "timezone": "America/Chicago"})
+
+    assert response.status_code == 201
+    assert _db_queries(response) >= 1
+    assert "app;dur=" in response.headers["server-timing"]
+
+
+def test_readiness_query_count_does_not_grow_with_schools():
+    small = client.get("/readiness", headers=_district_with_scores(2))
+    large = client.get("/readiness", headers=_district_with_scores(12))
+
+    assert small.status_code == large.status_code == 200
+    assert len(large.json()["items"]) == 12
+    assert _db_queries(small) == _db_queries(large)
+
+
+def test_threshold_warning_lists_slowest_statements(caplog):
+    def n_plus_one(request):
+        with engine.connect() as connection:
+            for index in range(4):
+                connection.execute(text(f"SELECT {index}"))
+        return PlainTextResponse("ok")
+
+    profiled = QueryProfilerMiddleware(
+        Starlette(routes=[Route("/loop", n_plus_one)]), query_threshold=2, slow_statements=2
+    )
+
+    with caplog.at_level(logging.INFO, logger="apps.api.app.profiling"):
+        response = TestClient(profiled).get("/loop")
+
+    assert _db_queries(response) == 4
+    warning = next(record for record in caplog.records if record.levelno == logging.WARNING)
+    assert warning.sql_profile["queries"] == 4
+    assert [entry["statement"] for entry in warning.sql_profile["slowest"]][0].startswith("SELECT")
+    assert len(warning.sql_profile["slowest"]) == 2
@@ -0,0 +1,73 @@
+import json
+from datetime import date, datetime
+from uuid import uuid4
+
+from apps.api.app.schemas import RuleResultRead
+from packages.rules.rules.evidence import build_details, evidence_fields, upgrade_details
+
+LEGACY_DETAILS = {
+    "id": str(uuid4()),
+    "school_id": str(uuid4()),
+    "grade_level": 14,
+    "enrollment_status": "active",
+    "first_name": "Jordan",
+    "last_name": "Rivera",
+    "ell_status": False,
+    "idea_flag": True,
+}
+
+
+def test_evidence_defaults_to_tested_fields() -> None:
+    dsl = {
+        "type": "grade_range",
+        "min": 0,
+        "max": 12,
+        "where": {"type": "eq", "field": "enrollment_status", "value": "active"},
+    }
+
+    assert evidence_fields(dsl) == ("enrollment_status", "grade_level")
+    assert evidence_fields({**dsl, "evidence": ["grade_level", "sis_id"]}) == (
+        "grade_level",
+        "sis_id",
+    )
+
+
+def test_build_details_keeps_declared_fields_only() -> None:
+    record = {**LEGACY_DETAILS, "enrollment_start": date(2023, 8, 21)}
+
+    details = build_details(record, ("grade_level", "enrollment_start"))
+
+    assert details == {
+        "schema_version": 2,
+        "evidence": {"grade_level": 14, "enrollment_start": "2023-08-21"},
+    }
+    assert len(json.dumps(details)) < len(json.dumps(LEGACY_DETAILS)) / 2
+
+
+def test_legacy_details_are_upgraded_on_read() -> None:
+    upgraded = upgrade_details(LEGACY_DETAILS)
+
+    assert upgraded["schema_version"] == 2
+    assert set(upgraded["evidence"]) == {
+        "grade_level",
+        "enrollment_status",
+        "ell_status",
+        "idea_flag",
+    }
+    assert upgrade_details(upgraded) is upgraded
+
+    result = RuleResultRead(
+        id=uuid4(),
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        rule_run_id=uuid4(),
+        district_id=uuid4(),
+        school_id=None,
+        entity_type="Student",
+        entity_id=uuid4(),
+        severity="error",
+        status="open",
+        message="Grade level 14 outside configured range",
+        details=LEGACY_DETAILS,
+    )
+    assert "first_name" not in json.dumps(result.details)
@@ -0,0 +1,72 @@
+from datetime import date
+
+from packages.rules.rules.joins import HashJoin, evaluate_reference_rule
+from packages.rules.rules.models import RuleDefinition
+
+RESTRAINT_RULE = RuleDefinition(
+    code="RS-ENROLLED",
+    description="Restraint incidents must reference a student enrolled at that school on that date",
+    dsl={
+        "type": "reference",
+        "entity": "RestraintEvent",
+        "join": {
+            "entity": "Enrollment",
+            "left_on": ["student_id", "school_id"],
+            "right_on": ["student_id", "school_id"],
+        },
+        "match": {
+            "type": "within",
+            "field": "occurred_at",
+            "start": "Enrollment.start_date",
+            "end": "Enrollment.end_date",
+        },
+    },
+)
+
+
+def _collections() -> dict[str, list[dict]]:
+    enrollments = [
+        {"student_id": f"s{i}", "school_id": "north", "start_date": date(2024, 8, 1), "end_date": None}
+        for i in range(20)
+    ]
+    enrollments.append(
+        {"student_id": "s99", "school_id": "north", "start_date": date(2023, 8, 1), "end_date": date(2024, 1, 1)}
+    )
+    incidents = [
+        {"id": "ok", "student_id": "s1", "school_id": "north", "occurred_at": date(2024, 9, 3)},
+        {"id": "wrong-school", "student_id": "s2", "school_id": "south", "occurred_at": date(2024, 9, 3)},
+        {"id": "after-exit", "student_id": "s99", "school_id": "north", "occurred_at": date(2024, 3, 1)},
+        {"id": "no-student", "student_id": None, "school_id": "north", "occurred_at": date(2024, 9, 3)},
+        {"id": "before-entry", "student_id": "s3", "school_id": "north", "occurred_at": date(2024, 7, 1)},
+    ]
+    return {"Enrollment": enrollments, "RestraintEvent": incidents}
+
+
+def test_reference_rule_flags_incidents_without_matching_enrollment() -> None:
+    violations = evaluate_reference_rule(RESTRAINT_RULE, _collections())
+
+    assert sorted(row["id"] for row in violations) == [
+        "after-exit",
+        "before-entry",
+        "no-student",
+        "wrong-school",
+    ]
+
+
+def test_reference_rule_spills_partitions_when_build_side_exceeds_threshold(tmp_path) -> None:
+    in_memory = evaluate_reference_rule(RESTRAINT_RULE, _collections())
+    spilled = evaluate_reference_rule(
+        RESTRAINT_RULE, _collections(), spill_threshold=5, spill_dir=tmp_path
+    )
+
+    assert sorted(row["id"] for row in spilled) == sorted(row["id"] for row in in_memory)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_hash_join_reports_spill_state(tmp_path) -> None:
+    right = [{"k": i % 3, "v": i} for i in range(10)]
+    join = HashJoin(right, ["k"], spill_threshold=4, spill_dir=tmp_path, partitions=4)
+
+    assert join.spilled
+    matches = {row["k"]: len(found) for row, found in join.matches([{"k": 0}, {"k": 5}], ["k"])}
+    assert matches == {0: 4, 5: 0}
@@ -0,0 +1,82 @@
+import numpy as np
+from billiard.pool import Pool
+
+from packages.rules.rules.models import RuleDefinition
+from packages.rules.rules.parallel import ParallelPlan
+from packages.rules.rules.plan import PlanStats, RulePlan
+
+
+def _columns(rows: int) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(3)
+    return {
+        "id": np.array([f"s{index}" for index in range(rows)]),
+        "grade_level": rng.integers(-1, 15, size=rows).astype(np.int16),
+        "enrollment_status": np.array(["active", "withdrawn"])[rng.integers(0, 2, size=rows)],
+        "idea_flag": rng.random(rows) < 0.2,
+    }
+
+
+def _rules() -> list[RuleDefinition]:
+    active = {"type": "eq", "field": "enrollment_status", "value": "active"}
+    return [
+        RuleDefinition(
+            code="GRADE-RANGE",
+            description="Grade range",
+            dsl={"type": "grade_range", "min": 0, "max": 12, "where": active},
+        ),
+        RuleDefinition(
+            code="IDEA-ACTIVE",
+            description="IDEA students enrolled",
+            dsl={
+                "type": "any",
+                "of": [{"type": "flag", "field": "idea_flag", "value": False}, active],
+            },
+        ),
+        RuleDefinition(
+            code="PREDICATE",
+            description="Python predicate",
+            predicate=lambda record: record["grade_level"] != 7,
+        ),
+    ]
+
+
+def test_parallel_plan_matches_serial_evaluation() -> None:
+    columns = _columns(10_000)
+    plan = RulePlan(_rules())
+    serial_stats, parallel_stats = PlanStats(), PlanStats()
+
+    expected = plan.evaluate(columns, serial_stats)
+    with ParallelPlan(plan, workers=3, min_chunk_rows=1_000) as parallel:
+        actual = parallel.evaluate(columns, parallel_stats)
+
+    assert [indices.tolist() for indices in actual] == [indices.tolist() for indices in expected]
+    assert parallel_stats.nodes.keys() == serial_stats.nodes.keys()
+    assert all(node.evaluations == 3 for node in parallel_stats.nodes.values())
+    assert sum(node.rows for node in parallel_stats.nodes.values()) == sum(
+        node.rows for node in serial_stats.nodes.values()
+    )
+
+
+def test_small_batches_stay_in_process() -> None:
+    columns = _columns(100)
+    plan = RulePlan(_rules())
+
+    with ParallelPlan(plan, workers=2) as parallel:
+        actual = parallel.evaluate(columns)
+
+    assert [i.tolist() for i in actual] == [i.tolist() for i in plan.evaluate(columns)]
+
+
+def _evaluate_in_prefork_worker(rows: int) -> list[list[int]]:
+    plan = RulePlan(_rules()[:2])
+    with ParallelPlan(plan, workers=2, min_chunk_rows=100) as parallel:
+        return [indices.tolist() for indices in parallel.evaluate(_columns(rows))]
+
+
+def test_prefork_pool_workers_evaluate_in_process() -> None:
+    # Celery's prefork pool runs tasks in daemonic billiard processes.
+    with Pool(1) as pool:
+        actual = pool.apply(_evaluate_in_prefork_worker, (1_000,))
+
+    expected = RulePlan(_rules()[:2]).evaluate(_columns(1_000))
+    assert actual == [indices.tolist() for indices in expected]
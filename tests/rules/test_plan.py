@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from packages.rules.rules.dsl import DslError, compile_dsl, validate_dsl
+from packages.rules.rules.evaluator import evaluate_rule_columns
+from packages.rules.rules.models import RuleDefinition
+from packages.rules.rules.plan import PlanStats, RulePlan
+from packages.rules.rules.snapshot import string_column
+
+ACTIVE = {"type": "enrollment_status", "required": "active"}
+
+
+def _columns() -> dict[str, np.ndarray]:
+    return {
+        "grade_level": np.array([3, 14, 10, -1, 7], dtype=np.int16),
+        "enrollment_status": string_column(["active", "active", "withdrawn", "active", "active"]),
+        "idea_flag": np.array([True, False, True, False, True]),
+        "ell_status": np.array([False, False, True, True, False]),
+    }
+
+
+def _rules() -> list[RuleDefinition]:
+    return [
+        RuleDefinition(
+            code="GRADE",
+            description="Active students in grades 0-12",
+            dsl={"type": "grade_range", "min": 0, "max": 12, "where": ACTIVE},
+        ),
+        RuleDefinition(
+            code="IDEA",
+            description="Active students must have IDEA flag",
+            dsl={"type": "flag", "field": "idea_flag", "where": ACTIVE},
+        ),
+        RuleDefinition(
+            code="ELL-IDEA",
+            description="Active ELL students must have IDEA flag",
+            dsl={
+                "type": "flag",
+                "field": "idea_flag",
+                "where": {"type": "all", "of": [ACTIVE, {"type": "flag", "field": "ell_status"}]},
+            },
+        ),
+        RuleDefinition(
+            code="PREDICATE",
+            description="Python predicate only",
+            predicate=lambda record: record["grade_level"] != 7,
+        ),
+    ]
+
+
+def test_plan_deduplicates_shared_subexpressions() -> None:
+    plan = RulePlan(_rules())
+
+    equals_active = [label for label in plan.labels if "enrollment_status" in label]
+    assert len(equals_active) == 1
+    assert plan.shared_nodes >= 2
+    assert plan.columns() == {"grade_level", "enrollment_status", "idea_flag", "ell_status"}
+
+
+def test_plan_matches_individual_rule_evaluation_and_records_timings() -> None:
+    rules = _rules()
+    columns = _columns()
+    stats = PlanStats()
+
+    results = RulePlan(rules).evaluate(columns, stats)
+
+    expected = [evaluate_rule_columns(rule, columns) for rule in rules]
+    assert [r.tolist() for r in results] == [e.tolist() for e in expected]
+    assert [r.tolist() for r in results] == [[1, 3], [1, 3], [3], [4]]
+
+    node_stats = stats.as_dict()
+    assert len(node_stats) == len(RulePlan(rules).nodes)
+    assert all(node["evaluations"] == 1 and node["rows"] == 5 for node in node_stats)
+
+
+def test_validate_dsl_rejects_bad_shapes_and_operands() -> None:
+    dtypes = {"grade_level": np.dtype(np.int16), "enrollment_end": np.dtype("M8[D]")}
+    validate_dsl({"type": "range", "field": "grade_level", "min": 0}, dtypes)
+    validate_dsl({"type": "range", "field": "enrollment_end", "max": "2024-06-30"}, dtypes)
+
+    for dsl in (
+        {"type": "all", "of": "x"},
+        {"type": "not", "of": [{"type": "grade_range"}]},
+        {"type": "eq", "value": 1},
+        {"type": "in", "field": "grade_level", "values": 9},
+        {"type": "range", "field": "grade_level", "min": "abc"},
+        {"type": "range", "field": "enrollment_end", "max": "June"},
+        {"type": "reference", "entity": "RestraintEvent"},
+        {"type": "any", "of": [{"type": "grade_range"}, {"type": "lookup"}]},
+    ):
+        with pytest.raises(DslError):
+            validate_dsl(dsl, dtypes)
+
+
+def test_unknown_rule_types_do_not_compile_to_always_passing() -> None:
+    validate_dsl({})
+    assert compile_dsl({}).test({"grade_level": 14})
+    for dsl in ({"type": "reference"}, {"type": "not", "of": {"type": "lookup"}}):
+        with pytest.raises(DslError):
+            compile_dsl(dsl)
+
+
+def test_validate_dsl_checks_evidence_fields() -> None:
+    rule = {"type": "grade_range", "min": 0, "max": 12}
+    validate_dsl({**rule, "evidence": ["sis_id", "grade_level"]}, fields={"sis_id", "grade_level"})
+
+    for evidence in ("sis_id", [""], ["sis_id", 3]):
+        with pytest.raises(DslError, match="list of field names"):
+            validate_dsl({**rule, "evidence": evidence})
+    with pytest.raises(DslError, match="shoe_size"):
+        validate_dsl({**rule, "evidence": ["sis_id", "shoe_size"]}, fields={"sis_id"})
+    with pytest.raises(DslError, match="shoe_size"):
+        validate_dsl({**rule, "evidence": ["shoe_size"]}, {"grade_level": np.dtype(np.int16)})
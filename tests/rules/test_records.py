@@ -0,0 +1,49 @@
+import numpy as np
+
+from packages.rules.rules.evaluator import evaluate_rule, evaluate_rule_columns
+from packages.rules.rules.models import RuleDefinition
+from packages.rules.rules.records import RecordBatch, RecordView
+
+
+def _batch() -> RecordBatch:
+    return RecordBatch(
+        {
+            "id": np.array(["a", "b", "c"]),
+            "grade_level": np.array([3, 14, 9], dtype=np.int16),
+            "enrolled_on": np.array(["2023-08-20", "NaT", "2023-09-01"], dtype="datetime64[D]"),
+        }
+    )
+
+
+def test_record_view_reads_python_scalars_from_columns() -> None:
+    view = _batch().row(1)
+
+    assert isinstance(view, RecordView)
+    assert not hasattr(view, "__dict__")
+    assert view["grade_level"] == 14 and type(view["grade_level"]) is int
+    assert view.get("enrolled_on") is None
+    assert view.to_dict() == {"id": "b", "grade_level": 14, "enrolled_on": None}
+
+
+def test_evaluate_rule_returns_views_of_violating_rows() -> None:
+    dsl = {"type": "grade_range", "min": 0, "max": 12}
+    rule = RuleDefinition(
+        code="GRADE-RANGE",
+        description="Grade range",
+        predicate=lambda record: 0 <= record["grade_level"] <= 12,
+        dsl=dsl,
+    )
+    batch = _batch()
+
+    violations = evaluate_rule(rule, batch)
+
+    assert violations == [{"id": "b", "grade_level": 14, "enrolled_on": None}]
+    assert batch.take(evaluate_rule_columns(rule, batch.columns)).to_dicts() == violations
+
+
+def test_from_records_fills_missing_fields_with_none() -> None:
+    batch = RecordBatch.from_records([{"id": "a", "flag": True}, {"id": "b"}])
+
+    assert len(batch) == 2
+    assert batch.columns["id"].dtype.kind == "U"
+    assert batch.row(1).to_dict() == {"id": "b", "flag": None}
@@ -0,0 +1,70 @@
+import numpy as np
+
+from packages.rules.rules.dsl import compile_dsl
+from packages.rules.rules.evaluator import evaluate_rule, evaluate_rule_columns
+from packages.rules.rules.models import RuleDefinition, RuleSeverity
+from packages.rules.rules.snapshot import (
+    ColumnarSnapshot,
+    load_snapshot,
+    string_column,
+    write_snapshot,
+)
+
+
+def _columns() -> dict[str, np.ndarray]:
+    return {
+        "id": string_column(["a", "b", "c", "d"]),
+        "grade_level": np.array([3, 14, 10, -1], dtype=np.int16),
+        "enrollment_status": string_column(["active", "active", "withdrawn", "active"]),
+        "idea_flag": np.array([True, False, True, False]),
+    }
+
+
+def test_compiled_dsl_matches_on_rows_and_columns() -> None:
+    dsl = {
+        "type": "grade_range",
+        "min": 0,
+        "max": 12,
+        "where": {"type": "enrollment_status", "required": "active"},
+    }
+    expr = compile_dsl(dsl)
+    columns = _columns()
+    rows = [{name: values[i].item() for name, values in columns.items()} for i in range(4)]
+
+    assert [expr.test(row) for row in rows] == expr.mask(columns).tolist()
+    assert expr.mask(columns).tolist() == [True, False, True, False]
+    assert expr.columns() == {"grade_level", "enrollment_status"}
+
+
+def test_evaluate_rule_columns_reads_memory_mapped_snapshot(tmp_path) -> None:
+    snapshot = ColumnarSnapshot(entity="Student", key="abc123", columns=_columns())
+    directory = write_snapshot(tmp_path / "abc123", snapshot)
+
+    loaded = load_snapshot(directory)
+    assert isinstance(loaded.columns["grade_level"], np.memmap)
+    assert len(loaded) == 4
+
+    dsl = {"type": "grade_range", "min": 0, "max": 12}
+    rule = RuleDefinition(
+        code="GRADE-RANGE",
+        description="Grade range",
+        severity=RuleSeverity.error,
+        predicate=compile_dsl(dsl).test,
+        dsl=dsl,
+    )
+
+    indices = evaluate_rule_columns(rule, loaded.columns)
+
+    assert indices.tolist() == [1, 3]
+    rows = [loaded.row(i) for i in range(len(loaded))]
+    assert [row["id"] for row in evaluate_rule(rule, rows)] == ["b", "d"]
+
+
+def test_evaluate_rule_columns_falls_back_to_predicate() -> None:
+    rule = RuleDefinition(
+        code="IDEA",
+        description="IDEA flag required",
+        predicate=lambda record: record.get("idea_flag") is True,
+    )
+
+    assert evaluate_rule_columns(rule, _columns()).tolist() == [1, 3]
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import District, IngestBatch, Student
+from apps.api.app.services.change_detection import row_hash
+from apps.worker.worker import tasks as worker_tasks
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+@pytest.fixture
+def district_id(monkeypatch):
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    with TestingSessionLocal() as session:
+        district = District(name="Incremental District")
+        session.add(district)
+        session.commit()
+        return district.id
+
+
+def test_row_hash_ignores_key_order() -> None:
+    assert row_hash({"sis_id": "A", "grade_level": 3}) == row_hash({"grade_level": 3, "sis_id": "A"})
+    assert row_hash({"sis_id": "A", "grade_level": 3}) != row_hash({"sis_id": "A", "grade_level": 4})
+
+
+def test_unchanged_extract_is_skipped(district_id) -> None:
+    first = worker_tasks.sync_powerschool(str(district_id))
+    assert first["status"] == "success"
+    assert first["rows_ingested"] > 0
+
+    second = worker_tasks.sync_powerschool(str(district_id))
+    assert second == {**second, "status": "unchanged", "rows_ingested": 0}
+
+    with TestingSessionLocal() as session:
+        hashes = session.execute(
+            select(IngestBatch.source_hash).where(IngestBatch.district_id == district_id)
+        ).scalars().all()
+    assert len(hashes) == 2 and hashes[0] == hashes[1]
+
+
+def test_only_changed_rows_are_written(district_id) -> None:
+    total = worker_tasks.sync_powerschool(str(district_id))["rows_ingested"]
+    with TestingSessionLocal() as session:
+        # A new extract: forget the file hash, and make one stored row differ.
+        session.execute(update(IngestBatch).values(source_hash=None))
+        session.execute(
+            update(Student).where(Student.sis_id == "PS1001").values(source_row_hash="stale")
+        )
+        session.commit()
+
+    result = worker_tasks.sync_powerschool(str(district_id))
+
+    assert result["status"] == "success"
+    assert result["rows_ingested"] == 1
+    assert result["rows_unchanged"] == total - 1
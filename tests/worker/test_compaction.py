@@ -0,0 +1,162 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import (
+    District,
+    ExceptionRecord,
+    RuleResult,
+    RuleResultSummary,
+    RuleRun,
+    RuleRunStatusEnum,
+    RuleSeverityEnum,
+    RuleVersion,
+    School,
+)
+from apps.api.app.services.compaction import compact_rule_runs
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+def _create_run(session, district, rule_version, school, finished_at, violations, scope=None):
+    rule_run = RuleRun(
+        district_id=district.id,
+        status=RuleRunStatusEnum.success,
+        scope=scope,
+        started_at=finished_at - timedelta(minutes=5),
+        finished_at=finished_at,
+    )
+    session.add(rule_run)
+    session.flush()
+    results = []
+    for index in range(violations):
+        result = RuleResult(
+            rule_run_id=rule_run.id,
+            rule_version_id=rule_version.id,
+            district_id=district.id,
+            school_id=school.id,
+            entity_type="Student",
+            severity=RuleSeverityEnum.error if index % 2 == 0 else RuleSeverityEnum.warning,
+            message=f"Violation {index}",
+            details={"grade_level": 14},
+        )
+        session.add(result)
+        results.append(result)
+    session.flush()
+    return rule_run, results
+
+
+def test_compaction_summarizes_and_archives_superseded_runs(tmp_path) -> None:
+    session = TestingSessionLocal()
+    district = District(name="Compaction District")
+    session.add(district)
+    session.flush()
+    school = School(district_id=district.id, name="Archive High")
+    rule_version = RuleVersion(
+        district_id=district.id,
+        code="GRADE-RANGE",
+        title="Grade range",
+        applies_to="Student",
+        dsl={"type": "grade_range", "min": 0, "max": 12},
+    )
+    session.add_all([school, rule_version])
+    session.flush()
+
+    now = datetime.utcnow()
+    old_run, old_results = _create_run(session, district, rule_version, school, now - timedelta(days=200), 4)
+    latest_run, _ = _create_run(session, district, rule_version, school, now - timedelta(days=150), 2)
+    session.add(ExceptionRecord(district_id=district.id, rule_result_id=old_results[0].id))
+    session.commit()
+
+    stats = compact_rule_runs(
+        session,
+        older_than=now - timedelta(days=90),
+        archive_root=tmp_path,
+        district_id=district.id,
+    )
+
+    assert stats == {"runs": 1, "archived": 3, "retained": 1}
+
+    summaries = session.execute(
+        select(RuleResultSummary).where(RuleResultSummary.rule_run_id == old_run.id)
+    ).scalars().all()
+    assert {(s.rule_code, s.severity.value, s.result_count) for s in summaries} == {
+        ("GRADE-RANGE", "error", 2),
+        ("GRADE-RANGE", "warning", 2),
+    }
+
+    remaining = session.execute(
+        select(RuleResult.id).where(RuleResult.rule_run_id == old_run.id)
+    ).scalars().all()
+    assert remaining == [old_results[0].id]
+
+    session.refresh(old_run)
+    assert old_run.compacted_at is not None
+    with gzip.open(old_run.archive_uri, "rt", encoding="utf-8") as handle:
+        archived = [json.loads(line) for line in handle]
+    assert len(archived) == 3
+    assert all(row["rule_version_id"] == str(rule_version.id) for row in archived)
+
+    latest_count = session.execute(
+        select(RuleResult.id).where(RuleResult.rule_run_id == latest_run.id)
+    ).scalars().all()
+    assert len(latest_count) == 2
+    session.close()
+
+
+def test_scoped_run_does_not_supersede_the_full_run(tmp_path) -> None:
+    session = TestingSessionLocal()
+    district = District(name="Scoped Compaction District")
+    session.add(district)
+    session.flush()
+    school = School(district_id=district.id, name="Scoped High")
+    rule_version = RuleVersion(
+        district_id=district.id,
+        code="GRADE-RANGE",
+        title="Grade range",
+        applies_to="Student",
+        dsl={"type": "grade_range", "min": 0, "max": 12},
+    )
+    session.add_all([school, rule_version])
+    session.flush()
+
+    now = datetime.utcnow()
+    old_run, _ = _create_run(session, district, rule_version, school, now - timedelta(days=200), 2)
+    full_run, _ = _create_run(session, district, rule_version, school, now - timedelta(days=150), 3)
+    scoped_run, _ = _create_run(
+        session,
+        district,
+        rule_version,
+        school,
+        now - timedelta(days=120),
+        1,
+        scope={"school_ids": [str(school.id)]},
+    )
+    session.commit()
+
+    stats = compact_rule_runs(
+        session,
+        older_than=now - timedelta(days=90),
+        archive_root=tmp_path,
+        district_id=district.id,
+    )
+
+    assert stats == {"runs": 1, "archived": 2, "retained": 0}
+    for rule_run, results in [(old_run, 0), (full_run, 3), (scoped_run, 1)]:
+        remaining = session.execute(
+            select(RuleResult.id).where(RuleResult.rule_run_id == rule_run.id)
+        ).all()
+        assert len(remaining) == results
+    session.close()
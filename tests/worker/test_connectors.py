@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import Connector, ConnectorStatusEnum, District, Student, SyncJob
+from apps.worker.worker import tasks as worker_tasks
+from apps.worker.worker.connectors import (
+    ConnectorError,
+    PipelineLimits,
+    PowerSchoolConnector,
+    RetryPolicy,
+    TokenBucket,
+    fetch_powerschool_students,
+)
+from packages.shared.shared.config import get_settings
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+STUDENTS = [
+    {
+        "local_id": 5000 + index,
+        "name": {"first_name": "Stub", "last_name": f"Student{index}"},
+        "school_enrollment": {"grade_level": index % 13, "enroll_status": "A", "school_name": "Stub High"},
+    }
+    for index in range(23)
+]
+
+
+class StubPowerSchool(BaseHTTPRequestHandler):
+    """PowerSchool-shaped API; the first request for each page in ``throttle`` gets a 429."""
+
+    throttle: set[str] = set()
+    fail_all = False
+
+    def do_POST(self) -> None:
+        self._send(200, {"access_token": "stub-token"})
+
+    def do_GET(self) -> None:
+        if self.headers.get("Authorization") != "Bearer stub-token":
+            self._send(401, {})
+            return
+        url = urlparse(self.path)
+        if url.path.endswith("/count"):
+            self._send(200, {"resource": {"count": len(STUDENTS)}})
+            return
+        query = parse_qs(url.query)
+        page, size = int(query["page"][0]), int(query["pagesize"][0])
+        if self.fail_all or str(page) in self.throttle:
+            self.throttle.discard(str(page))
+            self._send(429, {}, {"Retry-After": "0"})
+            return
+        self._send(200, {"students": {"student": STUDENTS[(page - 1) * size : page * size]}})
+
+    def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubPowerSchool.throttle = {"2"}
+    StubPowerSchool.fail_all = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPowerSchool)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_token_bucket_limits_rate() -> None:
+    async def acquire_all() -> float:
+        bucket = TokenBucket(rate=50, capacity=1)
+        started = time.perf_counter()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.perf_counter() - started
+
+    assert asyncio.run(acquire_all()) >= 0.09
+
+
+def test_pipeline_fetches_pages_concurrently_with_retries(stub_url) -> None:
+    loaded: list[list[dict]] = []
+    limits = PipelineLimits(rate_per_second=200, concurrency=3, queue_size=2, load_batch_size=10)
+
+    async def run() -> dict:
+        async with httpx.AsyncClient(base_url=stub_url) as client:
+            connector = PowerSchoolConnector(
+                client, limits, page_size=5, client_id="id", client_secret="secret"
+            )
+            return await connector.run(loaded.append)
+
+    metrics = asyncio.run(run())
+
+    assert [len(batch) for batch in loaded] == [10, 10, 3]
+    assert {row["sis_id"] for batch in loaded for row in batch} == {
+        str(student["local_id"]) for student in STUDENTS
+    }
+    assert metrics["pages"] == 5
+    assert metrics["retries"] == 1
+    assert metrics["stages"]["load"]["items"] == 23
+
+
+def test_sync_uses_api_and_records_job_metrics(monkeypatch, stub_url) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    for name, value in {
+        "powerschool_base_url": stub_url,
+        "powerschool_client_id": "id",
+        "powerschool_page_size": 10,
+        "connector_rate_per_second": 500.0,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    with TestingSessionLocal() as session:
+        district = District(name="API District")
+        session.add(district)
+        session.commit()
+
+    result = worker_tasks.sync_powerschool(str(district.id))
+
+    assert result["rows_ingested"] == 23
+    with TestingSessionLocal() as session:
+        job = session.execute(select(SyncJob)).scalar_one()
+        assert job.metrics["pages"] == 3
+        assert job.metrics["stages"]["fetch"]["items"] == 23
+        assert session.execute(select(Connector.status)).scalar_one() == ConnectorStatusEnum.degraded
+        assert session.scalar(
+            select(func.count(Student.id)).where(Student.district_id == district.id)
+        ) == 23
+
+
+def test_load_runs_on_the_calling_thread(monkeypatch, stub_url) -> None:
+    settings = get_settings()
+    for name, value in {
+        "powerschool_base_url": stub_url,
+        "powerschool_client_id": "id",
+        "powerschool_page_size": 5,
+        "connector_rate_per_second": 500.0,
+        "connector_queue_size": 1,
+        "ingest_batch_size": 4,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    threads: set[int] = set()
+
+    def load(batch: list[dict]) -> None:
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+
+    metrics = fetch_powerschool_students(settings, load)
+
+    assert threads == {threading.get_ident()}
+    assert metrics["stages"]["load"]["items"] == 23
+    assert metrics["stages"]["load"]["busy_seconds"] > 0
+
+    def failing_load(batch: list[dict]) -> None:
+        raise RuntimeError("database down")
+
+    with pytest.raises(RuntimeError, match="database down"):
+        fetch_powerschool_students(settings, failing_load)
+
+
+def test_exhausted_retries_raise(stub_url) -> None:
+    StubPowerSchool.fail_all = True
+    limits = PipelineLimits(rate_per_second=500, retry=RetryPolicy(attempts=2, base_delay=0))
+
+    async def run() -> None:
+        async with httpx.AsyncClient(base_url=stub_url) as client:
+            await PowerSchoolConnector(client, limits, client_id="id").run(lambda batch: None)
+
+    with pytest.raises(ConnectorError, match="after 2 attempts"):
+        asyncio.run(run())
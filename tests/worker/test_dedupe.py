@@ -0,0 +1,121 @@
+from datetime import date
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import (
+    District,
+    MergeCandidateStatusEnum,
+    School,
+    Student,
+    StudentMergeCandidate,
+)
+from apps.api.app.services.dedupe import DedupeEngine, normalize_identifier, soundex
+from apps.worker.worker import tasks as worker_tasks
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+def _columns(rows: list[tuple]) -> dict[str, np.ndarray]:
+    sis_ids, state_ids, first, last, born = zip(*rows, strict=True)
+    return {
+        "id": np.array([str(uuid4()) for _ in rows]),
+        "sis_id": np.array(sis_ids),
+        "state_id": np.array([value or "" for value in state_ids]),
+        "first_name": np.array(first),
+        "last_name": np.array(last),
+        "birth_date": np.array(born, dtype="datetime64[D]"),
+    }
+
+
+def _pairs(result) -> dict[tuple[int, int], str]:
+    pairs = zip(result.left.tolist(), result.right.tolist(), strict=True)
+    return dict(zip(pairs, result.rules.tolist(), strict=True))
+
+
+def test_keys_are_normalized() -> None:
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("O'Brien") == soundex("OBrien")
+    assert normalize_identifier("00-123") == normalize_identifier("123") == "123"
+
+
+def test_engine_matches_ids_and_misspelled_names() -> None:
+    columns = _columns(
+        [
+            ("00123", None, "Maria", "Garcia", "2012-03-04"),
+            ("123", None, "Mary", "Smith", "2013-01-01"),  # same SIS id
+            ("S-9", "TX55", "Jonathan", "Nguyen", "2011-06-30"),
+            ("S-10", "TX55", "John", "Nguyen", None),  # same state id
+            ("S-20", None, "Katherine", "Johnson", "2012-03-04"),
+            ("S-21", None, "Katherine", "Jonson", "2012-04-03"),  # typo, day/month swapped
+            ("S-30", "TX1", "Ava", "Lee", "2014-02-02"),
+            ("S-31", "TX2", "Ava", "Lee", "2014-02-02"),  # different state ids: twins
+            ("S-40", None, "Noah", "Brown", "2010-10-10"),
+        ]
+    )
+
+    result = DedupeEngine(columns, min_score=0.85).run()
+
+    assert _pairs(result) == {(0, 1): "sis_id", (2, 3): "state_id", (4, 5): "name_dob"}
+    assert result.stats["candidate_pairs"] < result.stats["naive_pairs"]
+
+
+def test_oversized_blocks_are_skipped() -> None:
+    columns = _columns([(f"S-{index}", None, "Ana", "Smith", "2012-01-01") for index in range(6)])
+
+    result = DedupeEngine(columns, max_block_size=4).run()
+
+    assert len(result) == 0
+    assert result.stats["oversized_blocks"] >= 1
+
+
+def test_task_records_each_candidate_once(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    with TestingSessionLocal() as session:
+        district = District(name=f"District {uuid4()}")
+        session.add(district)
+        session.flush()
+        school = School(district_id=district.id, name="Elm Elementary")
+        session.add(school)
+        session.flush()
+        for sis_id, first, last in [("1", "Liam", "Miller"), ("2", "Liam", "Millar")]:
+            session.add(
+                Student(
+                    district_id=district.id,
+                    school_id=school.id,
+                    sis_id=sis_id,
+                    first_name=first,
+                    last_name=last,
+                    grade_level=4,
+                    enrollment_status="active",
+                    birth_date=date(2015, 9, 1),
+                )
+            )
+        session.commit()
+
+    assert worker_tasks.dedupe_students(str(district.id))["candidates_created"] == 1
+    assert worker_tasks.dedupe_students(str(district.id))["candidates_created"] == 0
+
+    with TestingSessionLocal() as session:
+        (candidate,) = session.execute(
+            select(StudentMergeCandidate).where(StudentMergeCandidate.district_id == district.id)
+        ).scalars()
+        assert candidate.match_rule == "name_dob"
+        assert candidate.status == MergeCandidateStatusEnum.pending
+        assert str(candidate.student_id) < str(candidate.duplicate_student_id)
+        assert {candidate.details["student"]["sis_id"], candidate.details["duplicate"]["sis_id"]} == {
+            "1",
+            "2",
+        }
@@ -0,0 +1,323 @@
+import time
+from uuid import uuid4
+
+import pytest
+import redis
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import (
+    Connector,
+    District,
+    RuleResult,
+    RuleRun,
+    RuleRunStatusEnum,
+    Student,
+    SyncJob,
+    SyncStatusEnum,
+)
+from apps.api.app.services import locks
+from apps.api.app.services.coalescing import duplicate_rule_run
+from apps.api.app.services.locks import (
+    CombinedLockBackend,
+    LeaseLost,
+    LocalLockBackend,
+    advisory_key,
+    district_lock_held,
+    try_district_lease,
+)
+from apps.worker.worker import tasks as worker_tasks
+from packages.shared.shared.config import get_settings
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+def _district(name: str) -> District:
+    with TestingSessionLocal() as session:
+        district = District(name=name)
+        session.add(district)
+        session.commit()
+        return district
+
+
+def test_lease_is_exclusive_until_released() -> None:
+    district_id = uuid4()
+    lease = try_district_lease(engine, "sync", district_id)
+
+    assert lease is not None
+    assert try_district_lease(engine, "sync", district_id) is None
+    assert district_lock_held(engine, "sync", district_id)
+    assert try_district_lease(engine, "rules", district_id) is not None
+
+    lease.release()
+    assert not district_lock_held(engine, "sync", district_id)
+    second = try_district_lease(engine, "sync", district_id)
+    assert second is not None
+    second.release()
+
+
+def test_lease_is_renewed_while_held() -> None:
+    district_id = uuid4()
+    lease = try_district_lease(engine, "sync", district_id, ttl=0.15)
+    time.sleep(0.4)
+
+    assert not lease.lost
+    assert try_district_lease(engine, "sync", district_id) is None
+    lease.release()
+
+
+def test_abandoned_lease_expires() -> None:
+    backend = LocalLockBackend()
+    assert backend.acquire("crdc:lock:sync:abandoned", "dead-worker", 0.05)
+    time.sleep(0.1)
+
+    assert backend.acquire("crdc:lock:sync:abandoned", "new-worker", 1.0)
+    assert not backend.extend("crdc:lock:sync:abandoned", "dead-worker", 1.0)
+
+
+class _FakeRedis(LocalLockBackend):
+    """A lock table of its own, standing in for the shared Redis server."""
+
+    _leases: dict[str, tuple[str, float]] = {}
+
+
+class _UnreachableRedis:
+    def acquire(self, key: str, token: str, ttl: float) -> bool:
+        raise redis.ConnectionError("connection refused")
+
+    held = acquire
+
+
+def test_auto_mode_database_lock_holds_when_one_worker_loses_redis(monkeypatch) -> None:
+    monkeypatch.setattr(locks, "_redis_retry_at", 0.0)
+    shared_redis = _FakeRedis()
+    with_redis = CombinedLockBackend(LocalLockBackend(), lambda: shared_redis)
+    without_redis = CombinedLockBackend(LocalLockBackend(), _UnreachableRedis)
+    key = f"crdc:lock:sync:{uuid4()}"
+
+    assert with_redis.acquire(key, "first", 1.0)
+    assert shared_redis.held(key)
+    assert not without_redis.acquire(key, "second", 1.0)
+
+    with_redis.release(key, "first")
+    assert not shared_redis.held(key)
+    assert without_redis.acquire(key, "second", 1.0)
+    assert without_redis.held(key)
+    without_redis.release(key, "second")
+
+
+def test_auto_mode_respects_an_unexpired_redis_lease(monkeypatch) -> None:
+    monkeypatch.setattr(locks, "_redis_retry_at", 0.0)
+    database = LocalLockBackend()
+    stale_redis = _FakeRedis()
+    key = f"crdc:lock:rules:{uuid4()}"
+    stale_redis.acquire(key, "dead-worker", 1.0)
+
+    assert not CombinedLockBackend(database, lambda: stale_redis).acquire(key, "new-worker", 1.0)
+    assert not database.held(key)
+
+
+def test_advisory_key_is_stable_and_signed_64_bit() -> None:
+    key = advisory_key("crdc:lock:sync:district")
+    assert key == advisory_key("crdc:lock:sync:district")
+    assert -(2**63) <= key < 2**63
+
+
+def test_duplicate_sync_is_coalesced_into_running_job(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    district = _district("Locked Sync District")
+    lease = try_district_lease(engine, "sync", district.id)
+    try:
+        result = worker_tasks.sync_powerschool(str(district.id))
+    finally:
+        lease.release()
+
+    assert result["status"] == "coalesced"
+    with TestingSessionLocal() as session:
+        assert session.execute(select(SyncJob)).first() is None
+
+    assert worker_tasks.sync_powerschool(str(district.id))["status"] == "success"
+
+
+def test_rule_run_is_deferred_while_district_is_locked(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(get_settings(), "district_lock_retry_seconds", 7)
+    deferred: list[tuple] = []
+    monkeypatch.setattr(
+        worker_tasks.process_rule_run,
+        "apply_async",
+        lambda args, countdown, **options: deferred.append((args, countdown)),
+    )
+    district = _district("Locked Rules District")
+    with TestingSessionLocal() as session:
+        rule_run = RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending)
+        session.add(rule_run)
+        session.commit()
+
+    lease = try_district_lease(engine, "rules", district.id)
+    try:
+        result = worker_tasks.process_rule_run(str(rule_run.id))
+    finally:
+        lease.release()
+
+    assert result["status"] == "deferred"
+    assert deferred == [((str(rule_run.id),), 7)]
+    with TestingSessionLocal() as session:
+        assert session.get(RuleRun, rule_run.id).status == RuleRunStatusEnum.pending
+
+
+def test_deferred_rule_run_keeps_its_queue_and_priority(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    deferred: list[dict] = []
+    monkeypatch.setattr(
+        worker_tasks.process_rule_run,
+        "apply_async",
+        lambda args, **options: deferred.append(options),
+    )
+    district = _district("Interactive Rules District")
+    with TestingSessionLocal() as session:
+        rule_run = RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending)
+        session.add(rule_run)
+        session.commit()
+
+    task = worker_tasks.process_rule_run
+    lease = try_district_lease(engine, "rules", district.id)
+    task.push_request(delivery_info={"exchange": "", "routing_key": "interactive", "priority": 0})
+    try:
+        result = task.run(str(rule_run.id))
+    finally:
+        task.pop_request()
+        lease.release()
+
+    assert result["status"] == "deferred"
+    assert deferred == [
+        {
+            "countdown": get_settings().district_lock_retry_seconds,
+            "queue": "interactive",
+            "priority": 0,
+        }
+    ]
+
+
+def test_deferred_duplicate_rule_runs_coalesce_into_the_first(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    deferred: list[tuple] = []
+    monkeypatch.setattr(
+        worker_tasks.process_rule_run,
+        "apply_async",
+        lambda args, **options: deferred.append(args),
+    )
+    district = _district("Coalesced Rules District")
+    with TestingSessionLocal() as session:
+        runs = [
+            RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending)
+            for _ in range(3)
+        ]
+        for run in runs:
+            session.add(run)
+            session.commit()
+        other_scope = RuleRun(
+            district_id=district.id,
+            status=RuleRunStatusEnum.pending,
+            scope={"school_ids": ["north"]},
+        )
+        session.add(other_scope)
+        session.commit()
+
+    lease = try_district_lease(engine, "rules", district.id)
+    try:
+        results = [
+            worker_tasks.process_rule_run(str(run.id)) for run in [*reversed(runs), other_scope]
+        ]
+    finally:
+        lease.release()
+
+    assert [result["status"] for result in results] == [
+        "coalesced",
+        "coalesced",
+        "deferred",
+        "deferred",
+    ]
+    assert deferred == [(str(runs[0].id),), (str(other_scope.id),)]
+    with TestingSessionLocal() as session:
+        for run in runs[1:]:
+            stored = session.get(RuleRun, run.id)
+            assert stored.status == RuleRunStatusEnum.success
+            assert stored.coalesced_into_id == runs[0].id
+        assert session.get(RuleRun, runs[0].id).status == RuleRunStatusEnum.pending
+
+
+def _losing_lease(monkeypatch) -> None:
+    def try_lease(bind, kind, district_id):
+        lease = try_district_lease(bind, kind, district_id)
+        lease.lost = True
+        return lease
+
+    monkeypatch.setattr(worker_tasks, "try_district_lease", try_lease)
+
+
+def test_rule_run_stops_writing_once_its_lease_is_lost(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    _losing_lease(monkeypatch)
+    district = _district("Lost Lease Rules District")
+    with TestingSessionLocal() as session:
+        rule_run = RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending)
+        session.add(rule_run)
+        session.commit()
+
+    with pytest.raises(LeaseLost):
+        worker_tasks.process_rule_run(str(rule_run.id))
+
+    with TestingSessionLocal() as session:
+        assert session.get(RuleRun, rule_run.id).status == RuleRunStatusEnum.failed
+        assert session.execute(
+            select(RuleResult).where(RuleResult.rule_run_id == rule_run.id)
+        ).first() is None
+    assert not district_lock_held(engine, "rules", district.id)
+
+
+def test_sync_stops_writing_once_its_lease_is_lost(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    _losing_lease(monkeypatch)
+    district = _district("Lost Lease Sync District")
+
+    with pytest.raises(LeaseLost):
+        worker_tasks.sync_powerschool(str(district.id))
+
+    with TestingSessionLocal() as session:
+        job = session.execute(
+            select(SyncJob).join(Connector).where(Connector.district_id == district.id)
+        ).scalar_one()
+        assert job.status == SyncStatusEnum.failed
+        assert session.execute(
+            select(Student).where(Student.district_id == district.id)
+        ).first() is None
+
+
+def test_duplicate_rule_run_matches_version_and_scope() -> None:
+    district = _district("Duplicate Runs District")
+    scope = {"school_ids": ["north"]}
+    with TestingSessionLocal() as session:
+        pending = RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending, scope=scope)
+        running = RuleRun(district_id=district.id, status=RuleRunStatusEnum.running)
+        session.add_all([pending, running])
+        session.commit()
+
+        assert duplicate_rule_run(session, district.id, None, scope).id == pending.id
+        assert duplicate_rule_run(session, district.id, None, {"school_ids": ["south"]}) is None
+        # A running run only absorbs triggers while its lease is held.
+        assert duplicate_rule_run(session, district.id, None, None) is None
+        lease = try_district_lease(engine, "rules", district.id)
+        try:
+            assert duplicate_rule_run(session, district.id, None, None).id == running.id
+        finally:
+            lease.release()
@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import District, Student, SyncJob
+from apps.api.app.services.json_stream import batched, iter_json_array, iter_json_records
+from apps.worker.worker import tasks as worker_tasks
+from packages.shared.shared.config import get_settings
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+RECORDS = [
+    {"sis_id": "S1", "grade_level": 12345, "name": "Zoë, [quoted] \"name\""},
+    {"sis_id": "S2", "nested": {"list": [1, 2.5, None, True]}, "grade_level": 7},
+    [],
+    "plain string",
+    -0.125,
+]
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 3, 7, 4096])
+def test_array_matches_json_load(chunk_chars) -> None:
+    text = json.dumps(RECORDS, indent=2, ensure_ascii=False)
+
+    assert list(iter_json_array(io.StringIO(text), chunk_chars=chunk_chars)) == RECORDS
+
+
+def test_empty_and_malformed_arrays() -> None:
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"a": 1} {"b": 2}]')))
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"a": 1},')))
+
+
+def test_records_detect_ndjson(tmp_path) -> None:
+    array_path = tmp_path / "extract.json"
+    array_path.write_text(json.dumps(RECORDS), encoding="utf-8")
+    ndjson_path = tmp_path / "extract.ndjson"
+    ndjson_path.write_text("\n".join(json.dumps(record) for record in RECORDS) + "\n\n")
+
+    assert list(iter_json_records(array_path, chunk_chars=5)) == RECORDS
+    assert list(iter_json_records(ndjson_path)) == RECORDS
+    assert [len(batch) for batch in batched(range(5), 2)] == [2, 2, 1]
+
+
+def test_sync_streams_extract_in_batches(monkeypatch, tmp_path) -> None:
+    extract = tmp_path / "students.ndjson"
+    extract.write_text(
+        "\n".join(
+            json.dumps({"sis_id": f"N{index}", "grade_level": index % 12, "school_name": "Stream"})
+            for index in range(25)
+        )
+    )
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(get_settings(), "powerschool_extract_path", str(extract))
+    monkeypatch.setattr(get_settings(), "ingest_batch_size", 4)
+    with TestingSessionLocal() as session:
+        district = District(name="Streaming District")
+        session.add(district)
+        session.commit()
+
+    result = worker_tasks.sync_powerschool(str(district.id))
+
+    assert result["rows_ingested"] == 25
+    with TestingSessionLocal() as session:
+        count = session.scalar(
+            select(func.count(Student.id)).where(Student.district_id == district.id)
+        )
+        job = session.execute(select(SyncJob)).scalar_one()
+    assert count == 25
+    assert job.metrics["stages"]["write"]["items"] == 7
+    assert set(job.metrics["queues"]) == {"read", "write"}
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import (
+    AuthMethodEnum,
+    Connector,
+    District,
+    SourceSystem,
+    SyncJob,
+    SyncStatusEnum,
+)
+from apps.api.app.services.locks import try_capacity_slot
+from apps.api.app.services.scheduling import (
+    due_nightly_syncs,
+    last_nightly_run,
+    next_nightly_run,
+)
+from apps.worker.worker import tasks as worker_tasks
+from packages.shared.shared.config import get_settings
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+def _district_with_connector(timezone: str) -> District:
+    with TestingSessionLocal() as session:
+        district = District(name=f"District {uuid4()}", timezone=timezone)
+        session.add(district)
+        session.flush()
+        source = SourceSystem(district_id=district.id, kind="powerschool", name="PowerSchool")
+        session.add(source)
+        session.flush()
+        session.add(
+            Connector(
+                district_id=district.id,
+                source_system_id=source.id,
+                auth_method=AuthMethodEnum.token,
+            )
+        )
+        session.commit()
+        return district
+
+
+def test_slots_follow_each_district_timezone(monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "nightly_sync_jitter_minutes", 0)
+    now = datetime(2024, 7, 1, 12, 0)
+
+    assert last_nightly_run(uuid4(), "America/New_York", now) == datetime(2024, 7, 1, 6, 0)
+    assert last_nightly_run(uuid4(), "America/Los_Angeles", now) == datetime(2024, 7, 1, 9, 0)
+    assert next_nightly_run(uuid4(), "America/Los_Angeles", now) == datetime(2024, 7, 2, 9, 0)
+    # Standard time in winter moves the UTC slot by an hour.
+    assert last_nightly_run(uuid4(), "America/New_York", datetime(2024, 1, 2, 12, 0)) == (
+        datetime(2024, 1, 2, 7, 0)
+    )
+
+
+def test_jitter_spreads_districts_across_the_window(monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "nightly_sync_jitter_minutes", 120)
+    now = datetime(2024, 7, 1, 12, 0)
+    district_ids = [uuid4() for _ in range(200)]
+
+    slots = [last_nightly_run(district_id, "America/Chicago", now) for district_id in district_ids]
+
+    assert all(datetime(2024, 7, 1, 7, 0) <= slot < datetime(2024, 7, 1, 9, 0) for slot in slots)
+    assert len({slot.replace(second=0) for slot in slots}) > 60
+    assert slots[0] == last_nightly_run(district_ids[0], "America/Chicago", now)
+
+
+def test_scheduler_queues_each_due_sync_once(monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(settings, "nightly_sync_local_time", "00:00")
+    monkeypatch.setattr(settings, "nightly_sync_jitter_minutes", 0)
+    queued: list[tuple] = []
+    monkeypatch.setattr(
+        worker_tasks.sync_powerschool,
+        "apply_async",
+        lambda args, kwargs: queued.append((args, kwargs)),
+    )
+    district = _district_with_connector("Pacific/Honolulu")
+
+    assert worker_tasks.schedule_nightly_syncs()["dispatched"] >= 1
+    assert worker_tasks.schedule_nightly_syncs()["dispatched"] == 0
+
+    (args, kwargs), = [entry for entry in queued if entry[0] == (str(district.id),)]
+    with TestingSessionLocal() as session:
+        job = session.get(SyncJob, UUID(kwargs["sync_job_id"]))
+        assert job.status == SyncStatusEnum.queued
+        slot = last_nightly_run(district.id, "Pacific/Honolulu", datetime.utcnow())
+        assert job.scheduled_at == slot
+
+    result = worker_tasks.sync_powerschool(*args, **kwargs)
+
+    assert result["sync_job_id"] == kwargs["sync_job_id"]
+    with TestingSessionLocal() as session:
+        assert session.get(SyncJob, job.id).status == SyncStatusEnum.success
+
+
+def test_synced_district_is_not_due_until_next_slot(monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "nightly_sync_jitter_minutes", 0)
+    district = _district_with_connector("America/Chicago")
+    slot = last_nightly_run(district.id, "America/Chicago", datetime.utcnow())
+    with TestingSessionLocal() as session:
+        connector = session.execute(
+            select(Connector).where(Connector.district_id == district.id)
+        ).scalar_one()
+        session.add(SyncJob(connector_id=connector.id, started_at=slot + timedelta(minutes=5)))
+        session.commit()
+
+        now = datetime.utcnow()
+        assert district.id not in {c.district_id for c, _ in due_nightly_syncs(session, now)}
+        later = next_nightly_run(district.id, "America/Chicago", now)
+        assert district.id in {c.district_id for c, _ in due_nightly_syncs(session, later)}
+
+
+def test_sync_is_deferred_when_every_slot_is_busy(monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(settings, "max_concurrent_jobs", 1)
+    deferred: list[tuple] = []
+    monkeypatch.setattr(
+        worker_tasks.sync_powerschool,
+        "apply_async",
+        lambda args, kwargs, countdown, **options: deferred.append((args, countdown)),
+    )
+    district = _district_with_connector("America/Chicago")
+
+    slot = try_capacity_slot(engine, 1)
+    try:
+        result = worker_tasks.sync_powerschool(str(district.id))
+    finally:
+        slot.release()
+
+    assert result["status"] == "deferred"
+    assert deferred == [((str(district.id),), settings.district_lock_retry_seconds)]
+    assert worker_tasks.sync_powerschool(str(district.id))["status"] == "success"
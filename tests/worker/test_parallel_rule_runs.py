@@ -0,0 +1,86 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import (
+    District,
+    RuleResult,
+    RuleRun,
+    RuleRunStatusEnum,
+    RuleVersion,
+    School,
+    Student,
+)
+from apps.worker.worker import tasks as worker_tasks
+from packages.shared.shared.config import get_settings
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+def test_default_fetch_batches_reach_the_process_pool(monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(settings, "rule_eval_workers", 2)
+    submitted: list[tuple] = []
+    submit = ProcessPoolExecutor.submit
+
+    def spy(pool, fn, *args, **kwargs):
+        submitted.append(args[2:])
+        return submit(pool, fn, *args, **kwargs)
+
+    monkeypatch.setattr(ProcessPoolExecutor, "submit", spy)
+    rows = settings.rule_fetch_batch_size // 2
+    with TestingSessionLocal() as session:
+        district = District(name="Parallel District")
+        session.add(district)
+        session.flush()
+        school = School(district_id=district.id, name="Parallel High")
+        session.add(school)
+        session.flush()
+        session.execute(
+            insert(Student),
+            [
+                {
+                    "district_id": district.id,
+                    "school_id": school.id,
+                    "sis_id": f"P{index}",
+                    "first_name": "Test",
+                    "last_name": f"P{index}",
+                    "grade_level": 14 if index % 10 == 0 else 5,
+                    "enrollment_status": "active",
+                }
+                for index in range(rows)
+            ],
+        )
+        session.add(
+            RuleVersion(
+                district_id=district.id,
+                code="GRADE-RANGE",
+                title="Grade range",
+                applies_to="Student",
+                category="Enrollment",
+                dsl={"type": "grade_range", "min": 0, "max": 12},
+            )
+        )
+        rule_run = RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending)
+        session.add(rule_run)
+        session.commit()
+
+    outcome = worker_tasks.process_rule_run(str(rule_run.id))
+
+    assert outcome["status"] == "success"
+    assert submitted == [(0, rows // 2), (rows // 2, rows)]
+    with TestingSessionLocal() as session:
+        assert session.execute(
+            select(func.count()).where(RuleResult.rule_run_id == rule_run.id)
+        ).scalar_one() == rows // 10
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from apps.worker.worker.pipeline import StagedPipeline
+
+
+def test_batches_flow_in_order_with_bounded_queues() -> None:
+    written: list[int] = []
+    threads: set[str] = set()
+
+    def slow_write(item: int) -> None:
+        threads.add(threading.current_thread().name)
+        time.sleep(0.002)
+        written.append(item)
+
+    metrics = StagedPipeline(range(50), lambda item: item * 2, slow_write, queue_size=3).run()
+
+    assert written == [item * 2 for item in range(50)]
+    assert threads == {threading.current_thread().name}
+    assert metrics["stages"]["write"]["items"] == 50
+    assert metrics["queues"]["write"]["max_depth"] <= 3
+    assert metrics["stages"]["transform"]["blocked_seconds"] > 0
+
+
+@pytest.mark.parametrize("failing_stage", ["read", "transform", "write"])
+def test_stage_errors_propagate(failing_stage) -> None:
+    def source():
+        for item in range(100):
+            if failing_stage == "read" and item == 10:
+                raise RuntimeError("read failed")
+            yield item
+
+    def transform(item: int) -> int:
+        if failing_stage == "transform" and item == 10:
+            raise RuntimeError("transform failed")
+        return item
+
+    def write(item: int) -> None:
+        if failing_stage == "write" and item == 10:
+            raise RuntimeError("write failed")
+
+    with pytest.raises(RuntimeError, match=f"{failing_stage} failed"):
+        StagedPipeline(source(), transform, write, queue_size=2).run()
@@ -0,0 +1,60 @@
+import pytest
+
+from apps.worker.worker import tasks as worker_tasks
+from apps.worker.worker.app import app
+from apps.worker.worker.queues import (
+    QUEUES,
+    celery_config,
+    interactive_options,
+    on_demand_options,
+    worker_argv,
+)
+from packages.shared.shared.config import get_settings
+
+
+def _route(task) -> dict:
+    return app.amqp.router.route({}, task.name, args=("id",), kwargs={}, task_type=task)
+
+
+def test_heavy_and_light_tasks_use_separate_queues() -> None:
+    assert _route(worker_tasks.sync_powerschool)["queue"].name == "ingest"
+    assert _route(worker_tasks.process_rule_run)["queue"].name == "rules"
+    assert _route(worker_tasks.export_district_snapshot)["queue"].name == "exports"
+    heartbeat = _route(worker_tasks.heartbeat)
+    assert heartbeat["queue"].name == "housekeeping"
+    assert heartbeat["priority"] == 0
+    assert {queue.name for queue in app.conf.task_queues} == set(QUEUES)
+
+
+def test_worker_settings_come_from_app_settings(monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "celery_prefetch_multiplier", 4)
+    monkeypatch.setattr(settings, "celery_acks_late", False)
+    monkeypatch.setattr(settings, "celery_task_priorities", {"compact_rule_results": 7})
+
+    config = celery_config(settings)
+
+    assert config["worker_prefetch_multiplier"] == 4
+    assert config["task_acks_late"] is False
+    assert config["task_routes"]["worker.tasks.compact_rule_results"]["priority"] == 7
+    assert "priority" not in config["task_routes"]["worker.tasks.heartbeat"]
+
+
+def test_api_triggered_work_jumps_ahead(monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "celery_interactive_priority", 1)
+
+    assert interactive_options() == {"queue": "interactive", "priority": 1}
+    assert on_demand_options("worker.tasks.sync_powerschool") == {"queue": "ingest", "priority": 1}
+
+
+def test_worker_argv_sums_queue_concurrency(monkeypatch) -> None:
+    monkeypatch.setattr(
+        get_settings(), "celery_queue_concurrency", {"interactive": 3, "housekeeping": 1}
+    )
+
+    argv = worker_argv(["interactive", "housekeeping"])
+
+    assert "--queues=interactive,housekeeping" in argv
+    assert "--concurrency=4" in argv
+    with pytest.raises(ValueError, match="default"):
+        worker_argv(["default"])
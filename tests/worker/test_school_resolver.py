@@ -0,0 +1,84 @@
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import District, School, Student
+from apps.api.app.services.schools import SchoolResolver, normalize_school_name
+from apps.worker.worker import tasks as worker_tasks
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+def _district_with_school(session, district_name: str, **school) -> tuple[District, School]:
+    district = District(name=district_name)
+    session.add(district)
+    session.flush()
+    existing = School(district_id=district.id, **school)
+    session.add(existing)
+    session.flush()
+    return district, existing
+
+
+def test_names_match_across_case_whitespace_and_aliases() -> None:
+    assert normalize_school_name("  Lincoln\tHIGH  school ") == "lincoln high school"
+    with TestingSessionLocal() as session:
+        district, lincoln = _district_with_school(
+            session, "Alias District", name="Lincoln High School", aliases=["LHS", "Lincoln HS"]
+        )
+        schools = SchoolResolver(session, district.id)
+
+        assert schools.school_id("LINCOLN  high school") == lincoln.id
+        assert schools.school_id("lhs") == lincoln.id
+        assert schools.school_id(" Lincoln hs") == lincoln.id
+
+
+def test_missing_schools_are_created_once_in_bulk() -> None:
+    with TestingSessionLocal() as session:
+        district, _ = _district_with_school(session, "Bulk District", name="Oak Elementary")
+        schools = SchoolResolver(session, district.id)
+
+        created = schools.prefetch(["Maple Middle", "maple  middle", "Oak Elementary", "Pine High"])
+
+        assert created == 2
+        names = session.execute(
+            select(School.name).where(School.district_id == district.id).order_by(School.name)
+        ).scalars().all()
+        assert names == ["Maple Middle", "Oak Elementary", "Pine High"]
+        assert schools.school_id("MAPLE MIDDLE") == schools.school_id("Maple Middle")
+
+
+def test_sync_loads_schools_once_per_batch(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    with TestingSessionLocal() as session:
+        district = District(name="Sync District")
+        session.add(district)
+        session.commit()
+
+    school_queries: list[str] = []
+
+    def count_school_queries(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and "FROM school" in statement:
+            school_queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_school_queries)
+    try:
+        result = worker_tasks.sync_powerschool(str(district.id))
+    finally:
+        event.remove(engine, "before_cursor_execute", count_school_queries)
+
+    assert result["status"] == "success"
+    assert 0 < len(school_queries) < result["rows_ingested"]
+    with TestingSessionLocal() as session:
+        students = session.execute(
+            select(Student).where(Student.district_id == district.id)
+        ).scalars().all()
+        assert len(students) == result["rows_ingested"]
+        assert all(student.school_id for student in students)
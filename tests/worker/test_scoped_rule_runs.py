@@ -0,0 +1,183 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import (
+    District,
+    RuleResult,
+    RuleRun,
+    RuleRunStatusEnum,
+    RuleVersion,
+    School,
+    Student,
+)
+from apps.worker.worker import tasks as worker_tasks
+from packages.rules.rules.dsl import DslError
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def _seed(session):
+    district = District(name="Scoped District")
+    session.add(district)
+    session.flush()
+    north = School(district_id=district.id, name="North")
+    south = School(district_id=district.id, name="South")
+    session.add_all([north, south])
+    session.flush()
+    for school, prefix in [(north, "N"), (south, "S")]:
+        for index, grade in enumerate([5, 14, 9, 15]):
+            session.add(
+                Student(
+                    district_id=district.id,
+                    school_id=school.id,
+                    sis_id=f"{prefix}{index}",
+                    first_name="Test",
+                    last_name=f"{prefix}{index}",
+                    grade_level=grade,
+                    enrollment_status="active" if index != 2 else "withdrawn",
+                )
+            )
+    session.add_all(
+        [
+            RuleVersion(
+                district_id=district.id,
+                code="GRADE-RANGE",
+                title="Grade range",
+                applies_to="Student",
+                category="Enrollment",
+                dsl={"type": "grade_range", "min": 0, "max": 12},
+            ),
+            RuleVersion(
+                district_id=district.id,
+                code="ENROLLMENT-STATUS",
+                title="Active enrollment",
+                applies_to="Student",
+                category="Status",
+                dsl={"type": "enrollment_status", "required": "active"},
+            ),
+        ]
+    )
+    session.commit()
+    return district, north, south
+
+
+def _run(session, district, scope):
+    rule_run = RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending, scope=scope)
+    session.add(rule_run)
+    session.commit()
+    outcome = worker_tasks.process_rule_run(str(rule_run.id))
+    results = session.execute(
+        select(RuleResult).where(RuleResult.rule_run_id == rule_run.id)
+    ).scalars().all()
+    return outcome, results
+
+
+def test_unscoped_run_covers_whole_district(session) -> None:
+    district, _, _ = _seed(session)
+
+    outcome, results = _run(session, district, None)
+
+    assert outcome["status"] == "success"
+    assert len(results) == 6
+
+
+def test_school_scope_limits_students(session) -> None:
+    district, north, _ = _seed(session)
+
+    _, results = _run(session, district, {"school_ids": [str(north.id)]})
+
+    assert len(results) == 3
+    assert {result.school_id for result in results} == {north.id}
+
+
+def test_category_and_grade_band_scope(session) -> None:
+    district, _, _ = _seed(session)
+
+    _, results = _run(
+        session,
+        district,
+        {"categories": ["Enrollment"], "grade_bands": [{"min": 13, "max": 14}]},
+    )
+
+    assert len(results) == 2
+    assert all(result.message.startswith("Grade level 14") for result in results)
+
+
+def test_run_with_an_unknown_rule_type_fails(session) -> None:
+    district, _, _ = _seed(session)
+    session.add(
+        RuleVersion(
+            district_id=district.id,
+            code="RESTRAINT-ENROLLED",
+            title="Restraint during enrollment",
+            applies_to="RestraintEvent",
+            category="Discipline",
+            dsl={"type": "reference", "entity": "RestraintEvent"},
+        )
+    )
+    session.commit()
+
+    with pytest.raises(DslError, match="RESTRAINT-ENROLLED"):
+        _run(session, district, None)
+
+    rule_run = session.execute(
+        select(RuleRun).where(RuleRun.district_id == district.id)
+    ).scalar_one()
+    session.refresh(rule_run)
+    assert rule_run.status == RuleRunStatusEnum.failed
+
+
+def test_rule_with_an_empty_dsl_passes_every_student(session) -> None:
+    district, _, _ = _seed(session)
+    session.add(
+        RuleVersion(
+            district_id=district.id,
+            code="LEGACY",
+            title="Legacy rule without a DSL",
+            applies_to="Student",
+            category="Enrollment",
+            dsl={},
+        )
+    )
+    session.commit()
+
+    outcome, results = _run(session, district, None)
+
+    assert outcome["status"] == "success"
+    assert len(results) == 6
+
+
+def test_run_with_unknown_evidence_fields_fails(session) -> None:
+    district, _, _ = _seed(session)
+    session.add(
+        RuleVersion(
+            district_id=district.id,
+            code="GRADE-EVIDENCE",
+            title="Grade range with evidence",
+            applies_to="Student",
+            category="Enrollment",
+            dsl={"type": "grade_range", "min": 0, "max": 12, "evidence": "sis_id"},
+        )
+    )
+    session.commit()
+
+    with pytest.raises(DslError, match="GRADE-EVIDENCE"):
+        _run(session, district, None)
@@ -0,0 +1,68 @@
+from datetime import datetime
+from uuid import uuid4
+
+from kombu.serialization import dumps, loads
+
+from apps.worker.worker import tasks as worker_tasks
+from apps.worker.worker.app import app
+from apps.worker.worker.serialization import SERIALIZER, cap_result, decode, encode
+
+
+def test_small_messages_stay_uncompressed() -> None:
+    district_id = uuid4()
+    data = encode([[district_id], {"at": datetime(2024, 5, 1, 2, 30)}], threshold=1024)
+
+    assert data[:1] == b"\x00"
+    assert decode(data) == [[str(district_id)], {"at": "2024-05-01T02:30:00"}]
+
+
+def test_large_messages_are_compressed() -> None:
+    payload = {"sis_ids": [f"S{index:06d}" for index in range(5000)]}
+    data = encode(payload, threshold=1024)
+
+    assert data[:1] == b"\x01"
+    assert len(data) < len(encode(payload, threshold=10**9)) / 2
+    assert decode(data) == payload
+
+
+def test_app_uses_msgpack_and_still_accepts_json() -> None:
+    content_type, encoding, data = dumps({"rule_run_id": "abc"}, serializer=SERIALIZER)
+
+    assert app.conf.task_serializer == SERIALIZER
+    assert "json" in app.conf.accept_content
+    assert loads(data, content_type, encoding) == {"rule_run_id": "abc"}
+
+
+def test_oversized_result_keeps_only_scalar_fields() -> None:
+    result = {"status": "success", "rows_ingested": 12, "rows": [str(uuid4()) for _ in range(500)]}
+
+    capped = cap_result("worker.tasks.example", result, SERIALIZER, max_bytes=1024)
+
+    assert capped["result_truncated"] is True
+    assert capped["result_bytes"] > 1024
+    assert capped["status"] == "success"
+    assert capped["rows_ingested"] == 12
+    assert "rows" not in capped
+    assert cap_result("worker.tasks.example", {"status": "ok"}, SERIALIZER, 1024) == {
+        "status": "ok"
+    }
+
+
+def test_worker_results_are_capped_but_direct_calls_are_not(monkeypatch) -> None:
+    monkeypatch.setitem(app.conf, "result_max_bytes", 256)
+
+    @app.task(name="tests.large_result")
+    def large_result() -> dict:
+        return {"status": "success", "payload": "x" * 4096}
+
+    assert large_result()["payload"] == "x" * 4096
+    assert large_result.apply().result == {
+        "status": "success",
+        "result_truncated": True,
+        "result_bytes": len(dumps(large_result(), serializer=SERIALIZER)[2]),
+    }
+
+
+def test_heartbeat_result_is_not_stored() -> None:
+    assert worker_tasks.heartbeat.ignore_result
+    assert not worker_tasks.process_rule_run.ignore_result
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import (
+    District,
+    RuleResult,
+    RuleRun,
+    RuleRunStatusEnum,
+    RuleVersion,
+    School,
+    Student,
+)
+from apps.api.app.services.student_columns import (
+    iter_student_column_batches,
+    student_projection,
+)
+from apps.worker.worker import tasks as worker_tasks
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def _seed(session, students: int):
+    district = District(name="Projection District")
+    session.add(district)
+    session.flush()
+    school = School(district_id=district.id, name="Central")
+    session.add(school)
+    session.flush()
+    session.add_all(
+        Student(
+            district_id=district.id,
+            school_id=school.id,
+            sis_id=f"P{index}",
+            first_name="Private",
+            last_name=f"Name{index}",
+            grade_level=13 if index % 2 else 10,
+        )
+        for index in range(students)
+    )
+    session.commit()
+    return district
+
+
+def test_projection_keeps_only_referenced_columns() -> None:
+    assert student_projection({"grade_level"}) == ["id", "school_id", "grade_level"]
+    assert "first_name" in student_projection(None)
+    with pytest.raises(ValueError):
+        student_projection({"shoe_size"})
+
+
+def test_batches_stream_projected_columns(session) -> None:
+    district = _seed(session, 5)
+
+    batches = list(
+        iter_student_column_batches(session, district.id, {"grade_level"}, batch_size=2)
+    )
+
+    assert [len(batch["id"]) for batch in batches] == [2, 2, 1]
+    assert set(batches[0]) == {"id", "school_id", "grade_level"}
+    assert not any(isinstance(obj, Student) for obj in session.identity_map.values())
+
+
+def test_rule_run_details_keep_only_evidence(session) -> None:
+    district = _seed(session, 4)
+    session.add(
+        RuleVersion(
+            district_id=district.id,
+            code="GRADE-RANGE",
+            title="Grade range",
+            applies_to="Student",
+            dsl={"type": "grade_range", "min": 0, "max": 12},
+        )
+    )
+    rule_run = RuleRun(district_id=district.id, status=RuleRunStatusEnum.pending)
+    session.add(rule_run)
+    session.commit()
+
+    outcome = worker_tasks.process_rule_run(str(rule_run.id))
+
+    assert outcome["rows_scanned"] == 4
+    results = session.execute(
+        select(RuleResult).where(RuleResult.rule_run_id == rule_run.id)
+    ).scalars().all()
+    assert len(results) == 2
+    assert all(
+        result.details == {"schema_version": 2, "evidence": {"grade_level": 13}}
+        for result in results
+    )
@@ -0,0 +1,50 @@
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app.db.base import Base
+from apps.api.app.db.models import RuleResult, RuleRun, RuleRunStatusEnum, School, Student
+from apps.api.app.services.synthetic import SyntheticSpec, generate_synthetic
+from apps.worker.worker import tasks as worker_tasks
+
+engine = create_engine(
+    "sqlite+pysqlite:///:memory:",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+Base.metadata.create_all(engine)
+
+
+def test_generator_creates_exact_violation_counts(monkeypatch) -> None:
+    monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
+    spec = SyntheticSpec(
+        districts=2,
+        schools_per_district=3,
+        students_per_school=200,
+        grade_violation_rate=0.05,
+        status_violation_rate=0.1,
+        chunk_size=150,
+    )
+    with TestingSessionLocal() as session:
+        districts = generate_synthetic(session, spec)
+
+        assert len(districts) == 2
+        assert session.scalar(select(func.count(School.id))) == 6
+        assert session.scalar(select(func.count(Student.id))) == 1200
+        first = districts[0]
+        assert (first.students, first.grade_violations, first.status_violations) == (600, 30, 60)
+
+        rule_run = RuleRun(district_id=first.district_id, status=RuleRunStatusEnum.pending)
+        session.add(rule_run)
+        session.commit()
+        run_id = rule_run.id
+
+    worker_tasks.process_rule_run(str(run_id))
+
+    with TestingSessionLocal() as session:
+        violations = session.scalar(
+            select(func.count(RuleResult.id)).where(RuleResult.rule_run_id == run_id)
+        )
+    assert violations == 90
@@ -0,0 +1,33 @@
+import time
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from apps.worker.worker import metrics
+
+
+def _value(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_task_signals_record_wait_duration_and_rows() -> None:
+    task = SimpleNamespace(
+        name="worker.tasks.sync_powerschool",
+        request=SimpleNamespace(published_at=time.time() - 2),
+    )
+    labels = {"task": task.name}
+    waits = _value("crdc_worker_task_queue_wait_seconds_count", **labels)
+    rows = _value("crdc_worker_task_rows_total", kind="ingested", **labels)
+
+    headers: dict = {}
+    metrics._stamp_publish_time(headers=headers)
+    metrics._task_started(task_id="t-1", task=task)
+    metrics._task_finished(
+        task_id="t-1", task=task, retval={"status": "success", "rows_ingested": 25}, state="SUCCESS"
+    )
+
+    assert metrics.PUBLISHED_AT_HEADER in headers
+    assert _value("crdc_worker_task_queue_wait_seconds_count", **labels) == waits + 1
+    assert _value("crdc_worker_task_queue_wait_seconds_sum", **labels) >= 2
+    assert _value("crdc_worker_task_duration_seconds_count", state="SUCCESS", **labels) >= 1
+    assert _value("crdc_worker_task_rows_total", kind="ingested", **labels) == rows + 25